@@ -0,0 +1,31 @@
+"""add_precompressed_post_html
+
+Revision ID: 5b2e8f1c9a47
+Revises: 34a11d4c7ed0
+Create Date: 2026-10-19 09:00:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8f1c9a47'
+down_revision: Union[str, None] = '34a11d4c7ed0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Store gzip and brotli encodings of content_html next to it
+    # (existing rows are filled by scripts/rerender_posts.py)
+    op.add_column('posts', sa.Column('content_html_gzip', sa.LargeBinary(), nullable=True))
+    op.add_column('posts', sa.Column('content_html_br', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    # Remove precompressed HTML columns
+    op.drop_column('posts', 'content_html_br')
+    op.drop_column('posts', 'content_html_gzip')
@@ -0,0 +1,31 @@
+"""add_post_outline
+
+Revision ID: c71d04e5ab32
+Revises: 5b2e8f1c9a47
+Create Date: 2026-10-19 09:30:41.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71d04e5ab32'
+down_revision: Union[str, None] = '5b2e8f1c9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Store the heading outline computed at render time
+    # (existing rows are filled by scripts/rerender_posts.py)
+    op.add_column('posts', sa.Column('toc', sa.JSON(), nullable=True))
+    op.add_column('posts', sa.Column('section_offsets', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    # Remove outline columns
+    op.drop_column('posts', 'section_offsets')
+    op.drop_column('posts', 'toc')
@@ -0,0 +1,36 @@
+"""add_post_fulltext_index
+
+Revision ID: e4a9b3f07d16
+Revises: c71d04e5ab32
+Create Date: 2026-10-19 10:00:12.530864
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9b3f07d16'
+down_revision: Union[str, None] = 'c71d04e5ab32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Full-text index for MATCH ... AGAINST search (MySQL only; other
+    # dialects keep searching with LIKE)
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index(
+            'ft_posts_title_content',
+            'posts',
+            ['title', 'content_markdown'],
+            mysql_prefix='FULLTEXT',
+        )
+
+
+def downgrade() -> None:
+    # Remove full-text index
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('ft_posts_title_content', table_name='posts')
@@ -0,0 +1,39 @@
+"""add_related_posts
+
+Revision ID: 9d3f6a2b7c15
+Revises: e4a9b3f07d16
+Create Date: 2026-10-19 11:00:41.208317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6a2b7c15'
+down_revision: Union[str, None] = 'e4a9b3f07d16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Precomputed related posts (filled by scripts/build_related_posts.py,
+    # then kept current on publish and edit)
+    op.create_table(
+        'related_posts',
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('related_post_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['related_post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('post_id', 'related_post_id'),
+    )
+    op.create_index('idx_related_posts_related', 'related_posts', ['related_post_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Remove related posts
+    op.drop_index('idx_related_posts_related', table_name='related_posts')
+    op.drop_table('related_posts')
@@ -0,0 +1,34 @@
+"""add_search_generation
+
+Revision ID: a3c5d7e9f102
+Revises: 9d3f6a2b7c15
+Create Date: 2026-10-19 12:00:17.533904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5d7e9f102'
+down_revision: Union[str, None] = '9d3f6a2b7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Count of post writes keying cached searches in every worker
+    search_generation = op.create_table(
+        'search_generation',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('generation', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.bulk_insert(search_generation, [{'id': 1, 'generation': 0}])
+
+
+def downgrade() -> None:
+    # Remove search generation
+    op.drop_table('search_generation')
@@ -0,0 +1,29 @@
+"""add_post_html_etag
+
+Revision ID: 6e1b4d8a2f53
+Revises: a3c5d7e9f102
+Create Date: 2026-10-19 13:00:07.251936
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1b4d8a2f53'
+down_revision: Union[str, None] = 'a3c5d7e9f102'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Store the ETag of content_html next to its encodings
+    # (existing rows are filled by scripts/rerender_posts.py)
+    op.add_column('posts', sa.Column('content_html_etag', sa.String(length=34), nullable=True))
+
+
+def downgrade() -> None:
+    # Remove the stored HTML ETag
+    op.drop_column('posts', 'content_html_etag')
\ No newline at end of file
@@ -0,0 +1,110 @@
+"""Benchmark LIKE search against MySQL FULLTEXT search at several table sizes.
+
+Usage: python scripts/benchmark_search.py [size ...]   (default: 1000 10000 50000)
+
+Synthetic published posts are inserted under a temporary author and removed
+afterwards. Run it against a scratch database, not production.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from faker import Faker
+from datetime import datetime
+from sqlalchemy import delete, insert
+from src.driver.database.connection import AsyncSessionLocal, engine
+from src.driver.database.models import UserModel, PostModel, PostStatusEnum
+from src.driver.database.repositories import SQLAlchemyPostRepository
+
+fake = Faker()
+Faker.seed(42)
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+QUERIES = ["python", "database performance", "+server -client", '"open source"']
+REPEATS = 5
+INSERT_BATCH = 1000
+BENCHMARK_USERNAME = "search-benchmark"
+
+
+def _fake_post(index: int, author_id: int) -> dict:
+    """Build one synthetic published post row."""
+    words = ["python", "database", "performance", "server", "client", "open", "source"]
+    content = "\n\n".join(fake.paragraph(nb_sentences=8) for _ in range(4))
+    content += " " + " ".join(fake.random_elements(words, length=3))
+    return {
+        "title": fake.sentence(nb_words=6).rstrip("."),
+        "slug": f"search-benchmark-{index}",
+        "content_markdown": content,
+        "content_html": content,
+        "status": PostStatusEnum.PUBLISHED,
+        "author_id": author_id,
+        "published_at": datetime.utcnow(),
+    }
+
+
+async def _time_search(search, query: str) -> float:
+    """Median wall time of a search in milliseconds."""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        await search(query, 10)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def benchmark_search(sizes: list[int]):
+    """Grow the posts table to each size and time both search paths."""
+    fulltext = engine.dialect.name == "mysql"
+    if not fulltext:
+        print(f"⚠️  Dialect is {engine.dialect.name}; only the LIKE path can be measured")
+    
+    async with AsyncSessionLocal() as session:
+        author = UserModel(
+            username=BENCHMARK_USERNAME,
+            email=f"{BENCHMARK_USERNAME}@example.com",
+            hashed_password="!",
+        )
+        session.add(author)
+        await session.commit()
+        author_id = author.id
+        
+        try:
+            inserted = 0
+            print(f"{'posts':>8}  {'query':<24} {'LIKE ms':>9} {'FULLTEXT ms':>12}")
+            for size in sorted(sizes):
+                while inserted < size:
+                    count = min(INSERT_BATCH, size - inserted)
+                    rows = [_fake_post(inserted + i, author_id) for i in range(count)]
+                    await session.execute(insert(PostModel), rows)
+                    # InnoDB only adds rows to the FULLTEXT index on commit
+                    await session.commit()
+                    inserted += count
+                
+                repo = SQLAlchemyPostRepository(session)
+                for query in QUERIES:
+                    like_ms = await _time_search(repo.search_like, query)
+                    if fulltext:
+                        fulltext_ms = f"{await _time_search(repo.search_fulltext, query):.1f}"
+                    else:
+                        fulltext_ms = "n/a"
+                    print(f"{size:>8}  {query:<24} {like_ms:>9.1f} {fulltext_ms:>12}")
+                session.expunge_all()
+        finally:
+            await session.rollback()
+            await session.execute(delete(PostModel).where(PostModel.author_id == author_id))
+            await session.execute(delete(UserModel).where(UserModel.id == author_id))
+            await session.commit()
+    
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print("⏱️  Benchmarking search...")
+    asyncio.run(benchmark_search(sizes))
@@ -0,0 +1,37 @@
+"""Compute the related posts of every published post.
+
+Publishing and editing keep the lists current afterwards; run this once
+after migrating, and again whenever the lists should reflect how term
+statistics have shifted across the whole blog.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.driver.database.connection import AsyncSessionLocal
+from src.driver.database.repositories import SQLAlchemyPostRepository
+from src.usecase.post_usecase import LoadSearchIndexUseCase, RebuildRelatedPostsUseCase
+
+
+async def build_related_posts():
+    """Load the search index and store every post's most similar posts."""
+    async with AsyncSessionLocal() as session:
+        post_repo = SQLAlchemyPostRepository(session)
+        await LoadSearchIndexUseCase(post_repo).execute()
+        try:
+            count = await RebuildRelatedPostsUseCase(post_repo).execute()
+        except ValueError as e:
+            print(f"❌ {e} (is SEARCH_BACKEND set to index?)")
+            sys.exit(1)
+        await session.commit()
+    
+    print(f"✅ Stored related posts for {count} posts")
+
+
+if __name__ == "__main__":
+    print("🔗 Building related posts...")
+    asyncio.run(build_related_posts())
@@ -0,0 +1,39 @@
+"""Rebuild the shared search index segment from the database.
+
+Also compacts the delta log: run it periodically (e.g. nightly) when
+SEARCH_INDEX_PATH is set. Running workers pick up the new segment on their
+next search.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.driver.database.connection import AsyncSessionLocal
+from src.driver.database.repositories import SQLAlchemyPostRepository
+from src.service.search_index_service import search_index_service
+from src.usecase.post_usecase import RebuildSearchIndexUseCase
+
+
+async def build_search_index():
+    """Index every published post and save the segment."""
+    if not search_index_service.path:
+        print("❌ SEARCH_INDEX_PATH is not set")
+        sys.exit(1)
+    
+    async with AsyncSessionLocal() as session:
+        use_case = RebuildSearchIndexUseCase(SQLAlchemyPostRepository(session))
+        count = await use_case.execute()
+    
+    search_index_service.save()
+    size = os.path.getsize(search_index_service.path)
+    print(f"✅ Indexed {count} posts into {search_index_service.path} ({size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    print("🔎 Building search index...")
+    asyncio.run(build_search_index())
@@ -0,0 +1,38 @@
+"""Recommend a bcrypt cost factor for this host.
+
+Usage: python scripts/calibrate_bcrypt.py [TARGET_MS]
+
+Measures how long one hash takes at increasing cost factors and prints the
+highest one within the target (250 ms by default). Set BCRYPT_ROUNDS to it;
+existing passwords are rehashed at the new cost as their users log in.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.service.auth_service import BCRYPT_ROUNDS, calibrate_rounds
+
+DEFAULT_TARGET_MS = 250.0
+
+
+def calibrate_bcrypt(target_ms: float):
+    """Measure hashing times and print the recommended cost factor."""
+    recommended, measurements = calibrate_rounds(target_ms)
+    
+    print(f"{'rounds':>6}  {'ms':>9}")
+    for rounds, elapsed in measurements:
+        marker = "  <- recommended" if rounds == recommended else ""
+        print(f"{rounds:>6}  {elapsed:>9.1f}{marker}")
+    
+    print(f"\n✅ BCRYPT_ROUNDS={recommended} (currently {BCRYPT_ROUNDS})")
+    if recommended != BCRYPT_ROUNDS:
+        print("   Passwords are rehashed at the new cost as users log in.")
+
+
+if __name__ == "__main__":
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TARGET_MS
+    print(f"⏱️  Calibrating bcrypt for {target_ms:.0f} ms per hash...")
+    calibrate_bcrypt(target_ms)
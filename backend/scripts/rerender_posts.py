@@ -0,0 +1,37 @@
+"""Re-render all posts and refresh their precompressed HTML.
+
+The search index is updated from the new HTML through its shared delta log
+(SEARCH_INDEX_PATH), which running workers replay; indexes kept only in
+memory pick it up when the workers restart.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.driver.database.connection import AsyncSessionLocal, commit
+from src.driver.database.repositories import SQLAlchemyPostRepository
+from src.usecase.post_usecase import LoadSearchIndexUseCase, RerenderPostsUseCase
+
+
+async def rerender_posts():
+    """Re-render every post in the database."""
+    async with AsyncSessionLocal() as session:
+        try:
+            post_repo = SQLAlchemyPostRepository(session)
+            await LoadSearchIndexUseCase(post_repo).execute()
+            count = await RerenderPostsUseCase(post_repo).execute()
+            await commit(session)
+            print(f"✅ Re-rendered {count} posts")
+        except Exception as e:
+            await session.rollback()
+            print(f"❌ Error re-rendering posts: {e}")
+            raise
+
+
+if __name__ == "__main__":
+    print("🔄 Re-rendering posts...")
+    asyncio.run(rerender_posts())
@@ -11,6 +11,7 @@ from faker import Faker
 from datetime import datetime, timedelta
 from src.driver.database.connection import AsyncSessionLocal
 from src.driver.database.models import UserModel, PostModel, CategoryModel, PostStatusEnum
+from src.service.compression_service import compression_service
 from src.service.markdown_service import markdown_service
 from src.service.auth_service import auth_service
 
@@ -97,6 +98,7 @@ async def seed_data():
 """
                 
                 html_content = markdown_service.render(markdown_content)
+                compressed_html = compression_service.compress(html_content.encode('utf-8'))
                 excerpt = markdown_service.generate_excerpt(markdown_content)
                 
                 # First 8 posts are published, last 2 are drafts
@@ -117,6 +119,9 @@ async def seed_data():
                     slug=slug,
                     content_markdown=markdown_content,
                     content_html=html_content,
+                    content_html_gzip=compressed_html.variants['gzip'],
+                    content_html_br=compressed_html.variants.get('br'),
+                    content_html_etag=compressed_html.etag,
                     excerpt=excerpt,
                     status=status,
                     author_id=author.id,
@@ -0,0 +1,43 @@
+"""Shared FastAPI dependencies."""
+
+from fastapi import Cookie, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from src.domain.repositories import UserRepository
+from src.driver.database.connection import get_db
+from src.driver.database.repositories import CachedUserRepository, SQLAlchemyUserRepository
+from src.service.session_service import SESSION_COOKIE_NAME, SessionClaims, session_service
+from src.service.user_cache_service import user_cache_service
+
+
+async def get_optional_session(
+    session_token: Optional[str] = Cookie(None, alias=SESSION_COOKIE_NAME),
+) -> Optional[SessionClaims]:
+    """Dependency to get the verified session, or None for anonymous requests."""
+    return session_service.verify(session_token)
+
+
+async def get_current_session(
+    session_token: Optional[str] = Cookie(None, alias=SESSION_COOKIE_NAME),
+) -> SessionClaims:
+    """Dependency to get the verified session of an authenticated request."""
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    claims = session_service.verify(session_token)
+    if claims is None:
+        raise HTTPException(status_code=401, detail="Invalid session")
+    return claims
+
+
+async def get_current_user_id(session: SessionClaims = Depends(get_current_session)) -> int:
+    """Dependency to get current user ID from session."""
+    return session.user_id
+
+
+def get_user_repository(db: AsyncSession = Depends(get_db)) -> UserRepository:
+    """Dependency to get the user repository, behind the user cache when it is enabled."""
+    repository = SQLAlchemyUserRepository(db)
+    if not user_cache_service.enabled:
+        return repository
+    return CachedUserRepository(repository, user_cache_service)
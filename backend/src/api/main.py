@@ -1,13 +1,30 @@
 """FastAPI application initialization and configuration."""
 
+import asyncio
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import os
 from dotenv import load_dotenv
 
+from src.api.middleware import RateLimitMiddleware
+from src.service.auth_service import auth_service
+from src.service.highlight_cache_service import highlight_cache_service
+from src.service.markdown_service import markdown_service
+from src.service.rate_limit_service import rate_limit_service
+from src.service.reaction_summary_service import REACTION_RECONCILE_SECONDS, reaction_summary_service
+from src.service.search_cache_service import search_cache_service
+from src.service.search_index_service import search_index_service
+from src.service.related_posts_service import related_posts_service
+from src.service.session_service import session_service
+from src.service.suggest_service import suggest_service
+from src.service.user_cache_service import user_cache_service
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Create FastAPI app
 app = FastAPI(
     title="Microblog API",
@@ -17,6 +34,11 @@ app = FastAPI(
     redoc_url="/api/redoc" if os.getenv("ENVIRONMENT") == "development" else None,
 )
 
+# Rate limit expensive and write endpoints per client (added first so CORS
+# headers still reach clients that are refused)
+if rate_limit_service.rules:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limit_service)
+
 # Configure CORS
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
 app.add_middleware(
@@ -55,8 +77,84 @@ async def health_check():
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """In-process cache and worker statistics for monitoring."""
+    return {
+        "markdown_block_cache": markdown_service.block_cache.stats(),
+        "markdown_revision_cache": markdown_service.revision_cache.stats(),
+        "highlight_cache": highlight_cache_service.stats(),
+        "search_index": search_index_service.stats(),
+        "search_cache": search_cache_service.stats(),
+        "suggest": suggest_service.stats(),
+        "related_posts": related_posts_service.stats(),
+        "password_hashing": auth_service.stats(),
+        "sessions": session_service.stats(),
+        "user_cache": user_cache_service.stats(),
+        "rate_limit": rate_limit_service.stats(),
+        "reaction_summaries": reaction_summary_service.stats(),
+    }
+
+
 # Import and include routers
-from src.api.routers import auth, posts, categories, comments, reactions, search, about
+from src.api.routers import auth, posts, categories, comments, reactions, search, about, markdown
+from src.driver.database.connection import AsyncSessionLocal
+from src.driver.database.repositories import (
+    SQLAlchemyUserRepository,
+    SQLAlchemyPostRepository,
+    SQLAlchemyReactionRepository,
+)
+from src.usecase.post_usecase import LoadSearchIndexUseCase
+from src.usecase.reaction_usecase import ReconcileReactionSummariesUseCase
+
+# Background tasks started with the app, cancelled on shutdown
+_background_tasks: list = []
+
+
+async def reconcile_reaction_summaries():
+    """Periodically correct cached reaction counts that other workers have changed."""
+    while True:
+        await asyncio.sleep(REACTION_RECONCILE_SECONDS)
+        try:
+            async with AsyncSessionLocal() as session:
+                corrected = await ReconcileReactionSummariesUseCase(
+                    SQLAlchemyReactionRepository(session)
+                ).execute()
+            if corrected:
+                logger.info("Corrected cached reaction counts of %d posts", corrected)
+        except Exception:
+            logger.warning("Could not reconcile cached reaction counts", exc_info=True)
+
+
+@app.on_event("startup")
+async def warm_caches():
+    """Pre-render static pages so the first requests are served from memory, and start background tasks."""
+    try:
+        async with AsyncSessionLocal() as session:
+            await about.refresh_about_page(SQLAlchemyUserRepository(session))
+    except Exception:
+        # The database may not be reachable yet; pages are built on first request
+        logger.warning("Could not pre-render the about page at startup", exc_info=True)
+    
+    try:
+        async with AsyncSessionLocal() as session:
+            count = await LoadSearchIndexUseCase(SQLAlchemyPostRepository(session)).execute()
+            logger.info("Search index loaded with %d posts", count)
+    except Exception:
+        # Search falls back to the database until the index is built
+        logger.warning("Could not build the search index at startup", exc_info=True)
+    
+    _background_tasks.append(asyncio.create_task(reconcile_reaction_summaries()))
+
+
+@app.on_event("shutdown")
+async def persist_caches():
+    """Stop background tasks and persist caches configured to survive restarts."""
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+    highlight_cache_service.save()
+
 
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(posts.router, prefix="/api/posts", tags=["Posts"])
@@ -65,3 +163,4 @@ app.include_router(comments.router, prefix="/api/comments", tags=["Comments"])
 app.include_router(reactions.router, prefix="/api/reactions", tags=["Reactions"])
 app.include_router(search.router, prefix="/api/search", tags=["Search"])
 app.include_router(about.router, prefix="/api/about", tags=["About"])
+app.include_router(markdown.router, prefix="/api/markdown", tags=["Markdown"])
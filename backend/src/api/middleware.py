@@ -0,0 +1,50 @@
+"""ASGI middleware."""
+
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.service.rate_limit_service import RateLimitService
+from src.service.session_service import SESSION_COOKIE_NAME, session_service
+
+
+class RateLimitMiddleware:
+    """
+    Refuse requests over their route's rate limit with 429 and Retry-After.
+    
+    Clients are keyed by IP, or by session user id for "user" rules. Behind a
+    reverse proxy, run uvicorn with --proxy-headers so the IP is the client's.
+    """
+    
+    def __init__(self, app: ASGIApp, limiter: RateLimitService):
+        self.app = app
+        self.limiter = limiter
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        rule_index = self.limiter.match(scope["method"], scope["path"])
+        if rule_index is None:
+            await self.app(scope, receive, send)
+            return
+        
+        connection = HTTPConnection(scope)
+        client = connection.client.host if connection.client else "unknown"
+        if self.limiter.rules[rule_index].key == "user":
+            session = session_service.verify(connection.cookies.get(SESSION_COOKIE_NAME))
+            if session is not None:
+                client = session.user_id
+        
+        wait = self.limiter.acquire(rule_index, client)
+        if wait:
+            response = JSONResponse(
+                {"detail": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": self.limiter.retry_after(wait)},
+            )
+            await response(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
@@ -0,0 +1,41 @@
+"""Helpers for building HTTP responses from precomputed bodies."""
+
+from fastapi import Request, Response
+
+from src.service.compression_service import PrecompressedBody, compression_service
+
+
+def precompressed_response(
+    request: Request,
+    body: PrecompressedBody,
+    media_type: str,
+    cache_control: str,
+) -> Response:
+    """
+    Serve a precompressed body in the client's preferred encoding.
+    
+    Each encoding is a representation of its own, so its strong ETag is the
+    body's ETag suffixed with the encoding. Returns 304 Not Modified when the
+    client already holds the representation it would be sent.
+    """
+    encoding = compression_service.negotiate(
+        request.headers.get("accept-encoding"), body.variants
+    )
+    etag = body.etag if encoding == "identity" else f'{body.etag[:-1]}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match uses the weak comparison
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    
+    return Response(content=body.variants[encoding], media_type=media_type, headers=headers)
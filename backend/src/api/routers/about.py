@@ -1,15 +1,21 @@
 """About router."""
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Request
 
+from src.api.responses import precompressed_response
 from src.api.schemas import AboutResponse, UserResponse
-from src.driver.database.connection import get_db
-from src.driver.database.repositories import SQLAlchemyUserRepository
+from src.api.dependencies import get_user_repository
+from src.domain.repositories import UserRepository
+from src.service.about_service import about_service, ABOUT_AUTHOR_ID
+from src.service.compression_service import PrecompressedBody
 from src.service.markdown_service import markdown_service
+from src.service.user_cache_service import user_cache_service
 
 router = APIRouter()
 
+# Browsers may reuse the about page briefly, then revalidate with the ETag
+ABOUT_CACHE_CONTROL = "public, max-age=300"
+
 # Static about content (can be stored in database or config)
 ABOUT_MARKDOWN = """
 # About This Blog
@@ -39,31 +45,49 @@ Feel free to reach out through the comment section on any post!
 """
 
 
-@router.get("", response_model=AboutResponse)
-async def get_about(
-    db: AsyncSession = Depends(get_db),
-):
-    """Get about page content."""
-    # Get the first user (blog author)
-    user_repo = SQLAlchemyUserRepository(db)
-    author = await user_repo.get_by_id(1)  # Assuming first user is the author
+async def refresh_about_page(user_repo: UserRepository) -> PrecompressedBody:
+    """Render and serialize the about page, kept until the author's updated_at changes."""
+    author = await user_repo.get_by_id(ABOUT_AUTHOR_ID)
     
     if not author:
-        # Return default if no author found
-        return AboutResponse(
-            title="About This Blog",
-            content_html=markdown_service.render(ABOUT_MARKDOWN),
-            author=UserResponse(
-                id=0,
-                username="admin",
-                email="admin@example.com",
-                full_name="Blog Administrator",
-                created_at="2024-01-01T00:00:00",
-            ),
+        # Use a default author if none is found
+        author_response = UserResponse(
+            id=0,
+            username="admin",
+            email="admin@example.com",
+            full_name="Blog Administrator",
+            created_at="2024-01-01T00:00:00",
         )
+    else:
+        author_response = UserResponse.model_validate(author)
     
-    return AboutResponse(
+    about = AboutResponse(
         title="About This Blog",
         content_html=markdown_service.render(ABOUT_MARKDOWN),
-        author=UserResponse.model_validate(author),
+        author=author_response,
+    )
+    return about_service.store(
+        about.model_dump_json().encode("utf-8"),
+        author.updated_at if author else None,
+    )
+
+
+@router.get("", response_model=AboutResponse)
+async def get_about(
+    request: Request,
+    user_repo: UserRepository = Depends(get_user_repository),
+):
+    """Get about page content."""
+    # Another worker may have changed the author, so check the version
+    body = about_service.body_for(await user_repo.get_updated_at(ABOUT_AUTHOR_ID))
+    if body is None:
+        # This worker's cached author may predate the change
+        user_cache_service.invalidate(ABOUT_AUTHOR_ID)
+        body = await refresh_about_page(user_repo)
+    
+    return precompressed_response(
+        request,
+        body,
+        media_type="application/json",
+        cache_control=ABOUT_CACHE_CONTROL,
     )
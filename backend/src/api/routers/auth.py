@@ -2,25 +2,30 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Response, Cookie
 from fastapi.security import HTTPBearer
-from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from src.api.schemas import UserCreate, UserResponse, LoginRequest, LoginResponse
-from src.driver.database.connection import get_db
-from src.driver.database.repositories import SQLAlchemyUserRepository
-from src.usecase.auth_usecase import RegisterUserUseCase, LoginUserUseCase
+from src.api.schemas import UserCreate, UserUpdate, UserResponse, LoginRequest, LoginResponse
+from src.api.dependencies import get_current_user_id, get_user_repository
+from src.domain.repositories import UserRepository
+from src.service.auth_service import PasswordHashingBusyError
+from src.service.session_service import SESSION_COOKIE_NAME, session_service
+from src.usecase.auth_usecase import RegisterUserUseCase, LoginUserUseCase, UpdateProfileUseCase
 
 router = APIRouter()
 security = HTTPBearer()
 
 
+def _busy(error: PasswordHashingBusyError) -> HTTPException:
+    """Answer a saturated password hashing pool with 503, asking the client to retry shortly."""
+    return HTTPException(status_code=503, detail=str(error), headers={"Retry-After": "1"})
+
+
 @router.post("/register", response_model=UserResponse, status_code=201)
 async def register(
     user_data: UserCreate,
-    db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Register a new user."""
-    user_repo = SQLAlchemyUserRepository(db)
     use_case = RegisterUserUseCase(user_repo)
     
     try:
@@ -34,16 +39,17 @@ async def register(
         return UserResponse.model_validate(user)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except PasswordHashingBusyError as e:
+        raise _busy(e)
 
 
 @router.post("/login", response_model=LoginResponse)
 async def login(
     credentials: LoginRequest,
     response: Response,
-    db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Login a user and set session cookie."""
-    user_repo = SQLAlchemyUserRepository(db)
     use_case = LoginUserUseCase(user_repo)
     
     try:
@@ -52,14 +58,14 @@ async def login(
             password=credentials.password,
         )
         
-        # Set HTTP-only cookie for session (simplified - should use proper JWT or session)
+        # Set HTTP-only cookie holding the signed session token
         response.set_cookie(
-            key="session_user_id",
-            value=str(user.id),
+            key=SESSION_COOKIE_NAME,
+            value=session_service.issue(user.id, user.username),
             httponly=True,
             secure=False,  # Set to True in production with HTTPS
             samesite="lax",
-            max_age=86400,  # 24 hours
+            max_age=session_service.ttl_seconds,
         )
         
         return LoginResponse(
@@ -68,32 +74,47 @@ async def login(
         )
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
+    except PasswordHashingBusyError as e:
+        raise _busy(e)
 
 
 @router.post("/logout")
-async def logout(response: Response):
-    """Logout a user by clearing the session cookie."""
-    response.delete_cookie("session_user_id")
+async def logout(
+    response: Response,
+    session_token: Optional[str] = Cookie(None, alias=SESSION_COOKIE_NAME),
+):
+    """Logout a user by revoking the session token and clearing the cookie."""
+    session_service.revoke(session_token)
+    response.delete_cookie(SESSION_COOKIE_NAME)
     return {"message": "Logout successful"}
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    session_user_id: Optional[str] = Cookie(None),
-    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Get current authenticated user."""
-    if not session_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+    user = await user_repo.get_by_id(user_id)
+    
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+    
+    return UserResponse.model_validate(user)
+
+
+@router.patch("/me", response_model=UserResponse)
+async def update_current_user(
+    profile: UserUpdate,
+    user_id: int = Depends(get_current_user_id),
+    user_repo: UserRepository = Depends(get_user_repository),
+):
+    """Update the current user's full name and bio."""
+    use_case = UpdateProfileUseCase(user_repo)
     
     try:
-        user_id = int(session_user_id)
-        user_repo = SQLAlchemyUserRepository(db)
-        user = await user_repo.get_by_id(user_id)
-        
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        return UserResponse.model_validate(user)
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid session")
+        user = await use_case.execute(user_id, full_name=profile.full_name, bio=profile.bio)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    
+    return UserResponse.model_validate(user)
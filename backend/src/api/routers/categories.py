@@ -1,10 +1,11 @@
 """Categories router."""
 
-from fastapi import APIRouter, Depends, HTTPException, Cookie
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List
 
 from src.api.schemas import CategoryResponse, CategoryCreate
+from src.api.dependencies import get_current_user_id
 from src.driver.database.connection import get_db
 from src.driver.database.repositories import SQLAlchemyCategoryRepository
 from src.domain.entities import Category
@@ -12,16 +13,6 @@ from src.domain.entities import Category
 router = APIRouter()
 
 
-async def get_current_user_id(session_user_id: Optional[str] = Cookie(None)) -> int:
-    """Get current user ID from session cookie."""
-    if not session_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        return int(session_user_id)
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid session")
-
-
 @router.post("", response_model=CategoryResponse, status_code=201)
 async def create_category(
     category_data: CategoryCreate,
@@ -1,36 +1,28 @@
 """Comments router."""
 
-from fastapi import APIRouter, Depends, HTTPException, Cookie
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List
 
 from src.api.schemas import CommentCreate, CommentResponse
+from src.api.dependencies import get_current_user_id, get_user_repository
 from src.driver.database.connection import get_db
-from src.driver.database.repositories import SQLAlchemyCommentRepository, SQLAlchemyUserRepository
+from src.driver.database.repositories import SQLAlchemyCommentRepository
+from src.domain.repositories import UserRepository
 from src.domain.entities import Comment
 
 router = APIRouter()
 
 
-async def get_current_user_id(session_user_id: Optional[str] = Cookie(None)) -> int:
-    """Get current user ID from session cookie."""
-    if not session_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        return int(session_user_id)
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid session")
-
-
 @router.post("", response_model=CommentResponse, status_code=201)
 async def create_comment(
     comment_data: CommentCreate,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Create a new comment."""
     comment_repo = SQLAlchemyCommentRepository(db)
-    user_repo = SQLAlchemyUserRepository(db)
     
     # Get user info
     user = await user_repo.get_by_id(user_id)
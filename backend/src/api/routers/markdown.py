@@ -0,0 +1,44 @@
+"""Markdown router for editor previews."""
+
+from typing import Optional
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+
+from src.api.schemas import MarkdownPreviewRequest, MarkdownPreviewResponse
+from src.api.dependencies import get_current_user_id
+from src.service.markdown_service import markdown_service
+
+router = APIRouter()
+
+# Previews longer than this (characters) are rendered off the event loop
+PREVIEW_THREADPOOL_CHARS = 20000
+
+
+def _render_preview(content_markdown: str, base_revision: Optional[str]) -> MarkdownPreviewResponse:
+    """Render a preview, reusing blocks of the base revision."""
+    content_html, revision = markdown_service.render_revision(
+        content_markdown,
+        base_revision=base_revision,
+    )
+    
+    return MarkdownPreviewResponse(
+        content_html=content_html,
+        excerpt=markdown_service.excerpt_from_html(content_html),
+        revision=revision,
+    )
+
+
+@router.post("/preview", response_model=MarkdownPreviewResponse)
+async def preview_markdown(
+    preview_data: MarkdownPreviewRequest,
+    user_id: int = Depends(get_current_user_id),
+):
+    """Render Markdown for the editor preview without saving anything."""
+    if len(preview_data.content_markdown) > PREVIEW_THREADPOOL_CHARS:
+        return await run_in_threadpool(
+            _render_preview,
+            preview_data.content_markdown,
+            preview_data.base_revision,
+        )
+    
+    return _render_preview(preview_data.content_markdown, preview_data.base_revision)
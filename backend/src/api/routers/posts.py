@@ -1,11 +1,21 @@
 """Posts router for CRUD operations."""
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Cookie, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Dict, Optional, List
 
-from src.api.schemas import PostCreate, PostUpdate, PostResponse, PostListResponse
+from src.api.schemas import (
+    AuthorSummary,
+    PostCreate,
+    PostUpdate,
+    PostResponse,
+    PostListResponse,
+    PostSectionResponse,
+    RelatedPostResponse,
+)
+from src.api.dependencies import get_current_user_id, get_optional_session, get_user_repository
+from src.api.responses import precompressed_response
 from src.driver.database.connection import get_db
 from src.driver.database.repositories import SQLAlchemyPostRepository, SQLAlchemyCategoryRepository
 from src.usecase.post_usecase import (
@@ -14,21 +24,40 @@ from src.usecase.post_usecase import (
     PublishPostUseCase,
     GetPostsUseCase,
     DeletePostUseCase,
+    GetRelatedPostsUseCase,
+    GetPostAuthorsUseCase,
 )
-from src.domain.entities import PostStatus
+from src.domain.entities import Post, PostStatus, User
+from src.domain.repositories import UserRepository
+from src.service.session_service import SessionClaims
+from src.service.related_posts_service import RELATED_POSTS_LIMIT
 from src.service.view_counter_service import view_counter_service
+from src.service.compression_service import PrecompressedBody, compression_service
 
 router = APIRouter()
 
+# Edits change the HTML at any time, so clients revalidate it by ETag
+POST_HTML_CACHE_CONTROL = "public, no-cache"
 
-async def get_current_user_id(session_user_id: Optional[str] = Cookie(None)) -> int:
-    """Dependency to get current user ID from session."""
-    if not session_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    try:
-        return int(session_user_id)
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid session")
+
+def _to_response(post: Post, authors: Dict[int, User]) -> PostResponse:
+    """Build a post response embedding its author's summary."""
+    response = PostResponse.model_validate(post)
+    author = authors.get(post.author_id)
+    if author is not None:
+        response.author = AuthorSummary.model_validate(author)
+    return response
+
+
+async def _post_responses(posts: List[Post], user_repo: UserRepository) -> List[PostResponse]:
+    """Build responses for a page of posts, loading their authors in one lookup."""
+    authors = await GetPostAuthorsUseCase(user_repo).execute(posts)
+    return [_to_response(post, authors) for post in posts]
+
+
+async def _post_response(post: Post, user_repo: UserRepository) -> PostResponse:
+    """Build the response for a single post with its author's summary."""
+    return (await _post_responses([post], user_repo))[0]
 
 
 @router.post("", response_model=PostResponse, status_code=201)
@@ -36,6 +65,7 @@ async def create_post(
     post_data: PostCreate,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Create a new post (draft)."""
     post_repo = SQLAlchemyPostRepository(db)
@@ -51,7 +81,7 @@ async def create_post(
             excerpt=post_data.excerpt,
             category_ids=post_data.category_ids,
         )
-        return PostResponse.model_validate(post)
+        return await _post_response(post, user_repo)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -64,8 +94,9 @@ async def get_posts(
     limit: int = 10,
     offset: int = 0,
     sort_by: str = "newest",
-    session_user_id: Optional[str] = Cookie(None),
+    session: Optional[SessionClaims] = Depends(get_optional_session),
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Get all posts with optional filters."""
     post_repo = SQLAlchemyPostRepository(db)
@@ -73,14 +104,10 @@ async def get_posts(
     
     # Security check: only allow filtering by author_id for own drafts
     if status == 'draft':
-        if not session_user_id:
+        if session is None:
             raise HTTPException(status_code=401, detail="Authentication required")
-        try:
-            current_user_id = int(session_user_id)
-        except ValueError:
-            raise HTTPException(status_code=401, detail="Invalid session")
         # Force author_id to current user for draft queries
-        author_id = current_user_id
+        author_id = session.user_id
     
     post_status = PostStatus(status) if status else None
     posts = await use_case.execute(
@@ -92,13 +119,96 @@ async def get_posts(
         sort_by=sort_by,
     )
     
-    return [PostResponse.model_validate(post) for post in posts]
+    return await _post_responses(posts, user_repo)
+
+
+@router.get("/{slug}/html", response_class=Response)
+async def get_post_html(
+    slug: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a post's rendered HTML, sent in a stored encoding the client accepts."""
+    post_repo = SQLAlchemyPostRepository(db)
+    stored = await post_repo.get_html_by_slug(slug)
+    
+    if not stored:
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    variants, etag = stored
+    # Posts rendered before ETags were stored are hashed until re-rendered
+    body = PrecompressedBody(variants, etag or compression_service.etag(variants["identity"]))
+    return precompressed_response(
+        request,
+        body,
+        media_type="text/html; charset=utf-8",
+        cache_control=POST_HTML_CACHE_CONTROL,
+    )
+
+
+@router.get("/{slug}/related", response_model=List[RelatedPostResponse])
+async def get_related_posts(
+    slug: str,
+    limit: int = Query(RELATED_POSTS_LIMIT, ge=1, le=RELATED_POSTS_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the posts most similar to a post, as precomputed on publish and edit."""
+    post_repo = SQLAlchemyPostRepository(db)
+    use_case = GetRelatedPostsUseCase(post_repo)
+    
+    try:
+        related = await use_case.execute(slug, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return [
+        RelatedPostResponse(
+            id=post.id,
+            title=post.title,
+            slug=post.slug,
+            excerpt=post.excerpt,
+            author_id=post.author_id,
+            published_at=post.published_at,
+            categories=post.categories,
+            score=score,
+        )
+        for post, score in related
+    ]
+
+
+@router.get("/{slug}/sections/{index}", response_model=PostSectionResponse)
+async def get_post_section(
+    slug: str,
+    index: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get one section of a post, split at its top-level headings."""
+    post_repo = SQLAlchemyPostRepository(db)
+    sections = await post_repo.get_sections_by_slug(slug)
+    
+    if not sections:
+        raise HTTPException(status_code=404, detail="Post not found")
+    
+    content_html, toc, section_offsets = sections
+    if index < 0 or index >= len(section_offsets):
+        raise HTTPException(status_code=404, detail="Section not found")
+    
+    # Slice at the offsets stored at render time
+    end = section_offsets[index + 1] if index + 1 < len(section_offsets) else len(content_html)
+    
+    return PostSectionResponse(
+        index=index,
+        total=len(section_offsets),
+        content_html=content_html[section_offsets[index]:end],
+        toc=toc,
+    )
 
 
 @router.get("/id/{post_id}", response_model=PostResponse)
 async def get_post_by_id(
     post_id: int,
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Get a post by ID (for editing)."""
     post_repo = SQLAlchemyPostRepository(db)
@@ -107,13 +217,14 @@ async def get_post_by_id(
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    return PostResponse.model_validate(post)
+    return await _post_response(post, user_repo)
 
 
 @router.get("/{slug}", response_model=PostResponse)
 async def get_post(
     slug: str,
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Get a post by slug and increment view count."""
     post_repo = SQLAlchemyPostRepository(db)
@@ -126,7 +237,7 @@ async def get_post(
     post.view_count += 1
     await post_repo.update(post)
     
-    return PostResponse.model_validate(post)
+    return await _post_response(post, user_repo)
 
 
 @router.put("/{post_id}", response_model=PostResponse)
@@ -136,6 +247,7 @@ async def update_post(
     post_data: PostUpdate,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Update a post (supports both PUT and PATCH)."""
     post_repo = SQLAlchemyPostRepository(db)
@@ -156,7 +268,7 @@ async def update_post(
             content_markdown=post_data.content_markdown,
             excerpt=post_data.excerpt,
         )
-        return PostResponse.model_validate(updated_post)
+        return await _post_response(updated_post, user_repo)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -166,6 +278,7 @@ async def publish_post(
     post_id: int,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
     """Publish a draft post."""
     post_repo = SQLAlchemyPostRepository(db)
@@ -181,7 +294,7 @@ async def publish_post(
     
     try:
         published_post = await use_case.execute(post_id=post_id)
-        return PostResponse.model_validate(published_post)
+        return await _post_response(published_post, user_repo)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
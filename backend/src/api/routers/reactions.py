@@ -1,57 +1,87 @@
 """Reactions router."""
 
-from fastapi import APIRouter, Depends, HTTPException, Cookie
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Dict, List, Optional
 
-from src.api.schemas import ReactionCreate, ReactionResponse, ReactionSummary
+from src.api.schemas import ReactionCreate, ReactionSummary, ReactionToggleResponse
+from src.api.dependencies import get_current_user_id
 from src.driver.database.connection import get_db
 from src.driver.database.repositories import SQLAlchemyReactionRepository
-from src.domain.entities import Reaction, ReactionType
+from src.domain.entities import ReactionType
+from src.usecase.reaction_usecase import (
+    GetReactionSummariesUseCase,
+    GetReactionSummaryUseCase,
+    GetUserReactionsUseCase,
+    ToggleReactionUseCase,
+)
 
 router = APIRouter()
 
+# Most posts whose summaries can be requested at once
+MAX_BATCH_POSTS = 100
 
-async def get_current_user_id(session_user_id: Optional[str] = Cookie(None)) -> int:
-    """Dependency to get current user ID from session."""
-    if not session_user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated")
+
+def _summary(counts: Dict[ReactionType, int]) -> ReactionSummary:
+    """Build a reaction summary from counts by type."""
+    return ReactionSummary(
+        like=counts.get(ReactionType.LIKE, 0),
+        love=counts.get(ReactionType.LOVE, 0),
+        haha=counts.get(ReactionType.HAHA, 0),
+        wow=counts.get(ReactionType.WOW, 0),
+        sad=counts.get(ReactionType.SAD, 0),
+        angry=counts.get(ReactionType.ANGRY, 0),
+        total=sum(counts.values()),
+    )
+
+
+def _parse_post_ids(post_ids: str) -> List[int]:
+    """
+    Parse a comma-separated list of post IDs.
+    
+    Raises:
+        ValueError: If an ID is not an integer or there are too many
+    """
     try:
-        return int(session_user_id)
+        ids = [int(part) for part in post_ids.split(",") if part.strip()]
     except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid session")
+        raise ValueError("Post IDs must be comma-separated integers")
+    if len(ids) > MAX_BATCH_POSTS:
+        raise ValueError(f"At most {MAX_BATCH_POSTS} post IDs can be requested at once")
+    return ids
 
 
-@router.post("", response_model=ReactionResponse, status_code=201)
+@router.post("", response_model=ReactionToggleResponse)
 async def toggle_reaction(
     reaction_data: ReactionCreate,
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    """Toggle a reaction on a post."""
-    reaction_repo = SQLAlchemyReactionRepository(db)
+    """
+    Toggle a reaction on a post.
     
-    # Check if user already reacted to this post
-    existing_reaction = await reaction_repo.get_user_reaction(user_id, reaction_data.post_id)
+    Reacting again with the same type removes the reaction; another type
+    replaces it. Returns the user's reaction afterwards and the post's new
+    reaction counts.
+    """
+    reaction_repo = SQLAlchemyReactionRepository(db)
+    use_case = ToggleReactionUseCase(reaction_repo)
     
-    if existing_reaction:
-        # If same type, remove reaction
-        if existing_reaction.type == reaction_data.type:
-            await reaction_repo.delete(existing_reaction.id)
-            raise HTTPException(status_code=204, detail="Reaction removed")
-        else:
-            # If different type, delete old and create new
-            await reaction_repo.delete(existing_reaction.id)
+    try:
+        reaction, counts = await use_case.execute(
+            user_id,
+            reaction_data.post_id,
+            ReactionType(reaction_data.type.value),
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=404, detail="Post not found")
     
-    # Create new reaction
-    reaction = Reaction(
-        type=reaction_data.type,
-        user_id=user_id,
+    return ReactionToggleResponse(
         post_id=reaction_data.post_id,
+        reaction=reaction,
+        summary=_summary(counts),
     )
-    
-    created_reaction = await reaction_repo.create(reaction)
-    return ReactionResponse.model_validate(created_reaction)
 
 
 @router.get("/post/{post_id}/summary", response_model=ReactionSummary)
@@ -59,18 +89,39 @@ async def get_post_reactions_summary(
     post_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    """Get reaction counts for a post."""
+    """Get reaction counts for a post, served from memory after the first request."""
     reaction_repo = SQLAlchemyReactionRepository(db)
-    counts = await reaction_repo.count_by_type(post_id)
+    counts = await GetReactionSummaryUseCase(reaction_repo).execute(post_id)
+    return _summary(counts)
+
+
+@router.get("/summary", response_model=Dict[int, ReactionSummary])
+async def get_reaction_summaries(
+    post_ids: str = Query(..., description="Comma-separated post IDs, e.g. 1,2,3"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get reaction counts for several posts, keyed by post ID."""
+    try:
+        ids = _parse_post_ids(post_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    total = sum(counts.values())
+    reaction_repo = SQLAlchemyReactionRepository(db)
+    counts = await GetReactionSummariesUseCase(reaction_repo).execute(ids)
+    return {post_id: _summary(post_counts) for post_id, post_counts in counts.items()}
+
+
+@router.get("/mine", response_model=Dict[int, Optional[ReactionType]])
+async def get_my_reactions(
+    post_ids: str = Query(..., description="Comma-separated post IDs, e.g. 1,2,3"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get the current user's reaction to several posts, keyed by post ID (null if none)."""
+    try:
+        ids = _parse_post_ids(post_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return ReactionSummary(
-        like=counts.get(ReactionType.LIKE, 0),
-        love=counts.get(ReactionType.LOVE, 0),
-        haha=counts.get(ReactionType.HAHA, 0),
-        wow=counts.get(ReactionType.WOW, 0),
-        sad=counts.get(ReactionType.SAD, 0),
-        angry=counts.get(ReactionType.ANGRY, 0),
-        total=total,
-    )
+    reaction_repo = SQLAlchemyReactionRepository(db)
+    return await GetUserReactionsUseCase(reaction_repo).execute(user_id, ids)
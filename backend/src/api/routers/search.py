@@ -1,13 +1,26 @@
 """Search router."""
 
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
-from src.api.schemas import PostResponse, SearchResponse
+from src.api.schemas import (
+    AuthorFacet,
+    AuthorSummary,
+    CategoryFacet,
+    SearchFacets,
+    SearchHitResponse,
+    SearchResponse,
+    SuggestResponse,
+)
+from src.api.dependencies import get_user_repository
+from src.domain.entities import SearchFilters
+from src.domain.repositories import UserRepository
 from src.driver.database.connection import get_db
 from src.driver.database.repositories import SQLAlchemyPostRepository
-from src.usecase.post_usecase import SearchPostsUseCase
+from src.service.suggest_service import MAX_SUGGESTIONS, suggest_service
+from src.usecase.post_usecase import GetPostAuthorsUseCase, SearchPostsUseCase, sync_search_indexes
 
 router = APIRouter()
 
@@ -16,16 +29,70 @@ router = APIRouter()
 async def search_posts(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    category_id: Optional[int] = Query(None, description="Only posts in this category"),
+    author_id: Optional[int] = Query(None, description="Only posts by this author"),
+    published_from: Optional[datetime] = Query(None, description="Only posts published at or after"),
+    published_to: Optional[datetime] = Query(None, description="Only posts published at or before"),
     db: AsyncSession = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repository),
 ):
-    """Search posts by title or content."""
+    """Search posts by title or content, with match counts per category and author."""
     post_repo = SQLAlchemyPostRepository(db)
     use_case = SearchPostsUseCase(post_repo)
     
-    posts = await use_case.execute(query=q, limit=limit)
+    filters = SearchFilters(
+        category_id=category_id,
+        author_id=author_id,
+        published_from=_naive_utc(published_from),
+        published_to=_naive_utc(published_to),
+    )
+    results = await use_case.execute(query=q, limit=limit, offset=offset, filters=filters)
+    authors = await GetPostAuthorsUseCase(user_repo).execute(results.hits)
+    
+    hits = []
+    for hit in results.hits:
+        response = SearchHitResponse.model_validate(hit)
+        if hit.author_id in authors:
+            response.author = AuthorSummary.model_validate(authors[hit.author_id])
+        hits.append(response)
     
     return SearchResponse(
-        posts=[PostResponse.model_validate(post) for post in posts],
+        posts=hits,
         query=q,
-        total=len(posts),
+        total=results.total,
+        limit=limit,
+        offset=offset,
+        suggestion=results.suggestion,
+        corrected=results.corrected,
+        facets=SearchFacets(
+            categories=[
+                CategoryFacet(id=category.id, name=category.name, slug=category.slug, count=count)
+                for category, count in results.category_facets
+            ],
+            authors=[
+                AuthorFacet(author_id=author_id, count=count)
+                for author_id, count in results.author_facets
+            ],
+        ),
+    )
+
+
+@router.get("/suggest", response_model=SuggestResponse)
+async def suggest(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Typed prefix"),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS),
+):
+    """Suggest popular title terms and category names starting with a prefix."""
+    sync_search_indexes()
+    return SuggestResponse(
+        prefix=prefix,
+        suggestions=suggest_service.suggest(prefix, limit),
     )
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert a datetime to naive UTC, as stored in the database."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
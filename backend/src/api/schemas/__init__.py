@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field, EmailStr, field_validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
+from src.service.markdown_service import MARKDOWN_MAX_CHARS
 
 
 class PostStatus(str, Enum):
@@ -36,6 +37,12 @@ class UserCreate(UserBase):
     bio: Optional[str] = None
 
 
+class UserUpdate(BaseModel):
+    """Schema for updating the current user's profile."""
+    full_name: Optional[str] = Field(None, max_length=100)
+    bio: Optional[str] = None
+
+
 class UserResponse(UserBase):
     """Schema for user response."""
     id: int
@@ -47,6 +54,18 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class AuthorSummary(BaseModel):
+    """Schema for the author shown alongside a post."""
+    id: int
+    username: str
+    full_name: Optional[str] = None
+    # No uploads yet: clients draw an initials avatar while this is None
+    avatar_url: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
 # Auth Schemas
 class LoginRequest(BaseModel):
     """Schema for login request."""
@@ -92,6 +111,7 @@ class PostBase(BaseModel):
 
 class PostCreate(PostBase):
     """Schema for creating a post."""
+    content_markdown: str = Field(..., min_length=1, max_length=MARKDOWN_MAX_CHARS)
     excerpt: Optional[str] = Field(None, max_length=500)
     category_ids: Optional[List[int]] = []
 
@@ -99,18 +119,27 @@ class PostCreate(PostBase):
 class PostUpdate(BaseModel):
     """Schema for updating a post."""
     title: Optional[str] = Field(None, min_length=1, max_length=200)
-    content_markdown: Optional[str] = Field(None, min_length=1)
+    content_markdown: Optional[str] = Field(None, min_length=1, max_length=MARKDOWN_MAX_CHARS)
     excerpt: Optional[str] = Field(None, max_length=500)
     category_ids: Optional[List[int]] = None
 
 
+class TocEntry(BaseModel):
+    """Schema for a table of contents entry."""
+    level: int
+    title: str
+    section: int
+
+
 class PostResponse(PostBase):
     """Schema for post response."""
     id: int
     content_html: str
+    toc: Optional[List[TocEntry]] = None
     excerpt: Optional[str] = None
     status: PostStatus
     author_id: int
+    author: Optional[AuthorSummary] = None
     view_count: int = 0
     comment_count: int = 0
     reaction_count: int = 0
@@ -124,6 +153,26 @@ class PostResponse(PostBase):
         from_attributes = True
 
 
+class RelatedPostResponse(BaseModel):
+    """Schema for a related post (a post summary with its similarity)."""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    author_id: int
+    published_at: Optional[datetime] = None
+    categories: List[CategoryResponse] = []
+    score: float
+
+
+class PostSectionResponse(BaseModel):
+    """Schema for one heading-delimited section of a post."""
+    index: int
+    total: int
+    content_html: str
+    toc: List[TocEntry] = []
+
+
 class PostListResponse(BaseModel):
     """Schema for paginated post list."""
     posts: List[PostResponse]
@@ -190,12 +239,87 @@ class ReactionSummary(BaseModel):
     total: int = 0
 
 
+class ReactionToggleResponse(BaseModel):
+    """Schema for the outcome of toggling a reaction."""
+    post_id: int
+    reaction: Optional[ReactionType] = None
+    summary: ReactionSummary
+
+
 # Search Schema
+class SearchHitResponse(BaseModel):
+    """Schema for one search result (a post summary without its body)."""
+    id: int
+    title: str
+    slug: str
+    excerpt: Optional[str] = None
+    snippet: str
+    author_id: int
+    author: Optional[AuthorSummary] = None
+    published_at: Optional[datetime] = None
+    categories: List[CategoryResponse] = []
+    
+    class Config:
+        from_attributes = True
+
+
+class CategoryFacet(BaseModel):
+    """Schema for the number of search matches in a category."""
+    id: int
+    name: str
+    slug: str
+    count: int
+
+
+class AuthorFacet(BaseModel):
+    """Schema for the number of search matches by an author."""
+    author_id: int
+    count: int
+
+
+class SearchFacets(BaseModel):
+    """Schema for search match counts per category and per author."""
+    categories: List[CategoryFacet] = []
+    authors: List[AuthorFacet] = []
+
+
 class SearchResponse(BaseModel):
     """Schema for search results."""
-    posts: List[PostResponse]
+    posts: List[SearchHitResponse]
     query: str
     total: int
+    limit: int
+    offset: int
+    suggestion: Optional[str] = None
+    corrected: bool = False
+    facets: SearchFacets = SearchFacets()
+
+
+class Suggestion(BaseModel):
+    """Schema for one search suggestion."""
+    text: str
+    type: str
+    popularity: int
+
+
+class SuggestResponse(BaseModel):
+    """Schema for search suggestions."""
+    prefix: str
+    suggestions: List[Suggestion]
+
+
+# Markdown Preview Schemas
+class MarkdownPreviewRequest(BaseModel):
+    """Schema for an editor preview request."""
+    content_markdown: str = Field(..., max_length=MARKDOWN_MAX_CHARS)
+    base_revision: Optional[str] = Field(None, max_length=64)
+
+
+class MarkdownPreviewResponse(BaseModel):
+    """Schema for an editor preview response."""
+    content_html: str
+    excerpt: str
+    revision: str
 
 
 # About Schema
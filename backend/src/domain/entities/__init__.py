@@ -1,7 +1,7 @@
 """Domain entities for the microblog application."""
 
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from enum import Enum
 
 
@@ -65,12 +65,24 @@ class Post:
         categories: Optional[List['Category']] = None,
         comments: Optional[List['Comment']] = None,
         reactions: Optional[List['Reaction']] = None,
+        content_html_gzip: Optional[bytes] = None,
+        content_html_br: Optional[bytes] = None,
+        content_html_etag: Optional[str] = None,
+        toc: Optional[List[dict]] = None,
+        section_offsets: Optional[List[int]] = None,
     ):
         self.id = id
         self.title = title
         self.slug = slug
         self.content_markdown = content_markdown
         self.content_html = content_html
+        # Precompressed content_html and its ETag; None unless freshly rendered
+        self.content_html_gzip = content_html_gzip
+        self.content_html_br = content_html_br
+        self.content_html_etag = content_html_etag
+        # Table of contents and character offsets of sections in content_html
+        self.toc = toc
+        self.section_offsets = section_offsets
         self.excerpt = excerpt
         self.status = status
         self.author_id = author_id
@@ -158,3 +170,78 @@ class Reaction:
         self.user_id = user_id
         self.post_id = post_id
         self.created_at = created_at or datetime.utcnow()
+
+
+class SearchHit:
+    """Search result entity: a post summary with a highlighted snippet."""
+    
+    def __init__(
+        self,
+        id: Optional[int] = None,
+        title: str = "",
+        slug: str = "",
+        excerpt: Optional[str] = None,
+        snippet: str = "",
+        author_id: Optional[int] = None,
+        published_at: Optional[datetime] = None,
+        categories: Optional[List['Category']] = None,
+        score: float = 0.0,
+    ):
+        self.id = id
+        self.title = title
+        self.slug = slug
+        self.excerpt = excerpt
+        # HTML-escaped text with matched terms wrapped in <mark>
+        self.snippet = snippet
+        self.author_id = author_id
+        self.published_at = published_at
+        self.categories = categories or []
+        self.score = score
+
+
+class SearchFilters:
+    """Restrictions on which published posts a search may match."""
+    
+    def __init__(
+        self,
+        category_id: Optional[int] = None,
+        author_id: Optional[int] = None,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None,
+    ):
+        self.category_id = category_id
+        self.author_id = author_id
+        # Inclusive publication date range
+        self.published_from = published_from
+        self.published_to = published_to
+    
+    def is_empty(self) -> bool:
+        """Check whether no filter is set."""
+        return self.key() == (None, None, None, None)
+    
+    def key(self) -> tuple:
+        """Hashable form of the filters, for cache keys."""
+        return (self.category_id, self.author_id, self.published_from, self.published_to)
+
+
+class SearchResults:
+    """Search results entity: one page of hits plus facts about the whole match set."""
+    
+    def __init__(
+        self,
+        hits: Optional[List[SearchHit]] = None,
+        total: int = 0,
+        suggestion: Optional[str] = None,
+        corrected: bool = False,
+        category_facets: Optional[List[Tuple['Category', int]]] = None,
+        author_facets: Optional[List[Tuple[int, int]]] = None,
+    ):
+        self.hits = hits or []
+        self.total = total
+        # Spelling-corrected query, if any term was not recognised
+        self.suggestion = suggestion
+        # True when nothing matched as typed and the hits are for the suggestion
+        self.corrected = corrected
+        # (category, matching posts) and (author_id, matching posts), most matches first
+        self.category_facets = category_facets or []
+        self.author_facets = author_facets or []
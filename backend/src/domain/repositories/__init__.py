@@ -1,9 +1,18 @@
 """Repository interfaces defining data access contracts."""
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Any, Callable, Dict, Optional, List, Tuple
 from datetime import datetime
-from src.domain.entities import User, Post, Category, Comment, Reaction, PostStatus, ReactionType
+from src.domain.entities import (
+    User,
+    Post,
+    Category,
+    Comment,
+    Reaction,
+    PostStatus,
+    ReactionType,
+    SearchFilters,
+)
 
 
 class UserRepository(ABC):
@@ -19,6 +28,16 @@ class UserRepository(ABC):
         """Get user by ID."""
         pass
     
+    @abstractmethod
+    async def get_updated_at(self, user_id: int) -> Optional[datetime]:
+        """Get when a user's profile last changed, without loading the user."""
+        pass
+    
+    @abstractmethod
+    async def get_by_ids(self, user_ids: List[int]) -> Dict[int, User]:
+        """Get users by ID, keyed by ID (unknown IDs are left out)."""
+        pass
+    
     @abstractmethod
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
@@ -33,6 +52,16 @@ class UserRepository(ABC):
     async def update(self, user: User) -> User:
         """Update user."""
         pass
+    
+    @abstractmethod
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        """Replace a user's password hash."""
+        pass
+    
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Run a callback (sync or async) once the current transaction commits; never if it rolls back."""
+        pass
 
 
 class PostRepository(ABC):
@@ -75,8 +104,79 @@ class PostRepository(ABC):
         pass
     
     @abstractmethod
-    async def search(self, query: str, limit: int = 10) -> List[Post]:
-        """Search posts by title or content."""
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[Post]:
+        """Search published posts by title or content."""
+        pass
+    
+    @abstractmethod
+    async def count_search(self, query: str, filters: Optional[SearchFilters] = None) -> int:
+        """Count posts matching a search."""
+        pass
+    
+    @abstractmethod
+    async def search_facets(
+        self,
+        query: str,
+        filters: Optional[SearchFilters] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Tuple[Category, int]], List[Tuple[int, int]]]:
+        """Count posts matching a search per category and per author, most matches first."""
+        pass
+    
+    @abstractmethod
+    async def get_published_after(self, after_id: int, limit: int = 500) -> List[Post]:
+        """Get published posts with ID greater than after_id, in ID order, without comments or reactions."""
+        pass
+    
+    @abstractmethod
+    async def get_related(self, slug: str, limit: int = 5) -> Optional[List[Tuple[Post, float]]]:
+        """Get the stored related posts of a post, most similar first (None if the post does not exist)."""
+        pass
+    
+    @abstractmethod
+    async def get_related_lists(self, post_ids: List[int]) -> Dict[int, List[Tuple[int, float]]]:
+        """Get the stored related post lists of posts as {post_id: [(related_post_id, score)]}."""
+        pass
+    
+    @abstractmethod
+    async def get_referrer_ids(self, post_id: int) -> List[int]:
+        """Get the IDs of posts whose related post list includes a post."""
+        pass
+    
+    @abstractmethod
+    async def set_related(self, post_id: int, related: List[Tuple[int, float]]) -> None:
+        """Replace a post's related post list."""
+        pass
+    
+    @abstractmethod
+    async def get_sections_by_slug(self, slug: str) -> Optional[Tuple[str, List[dict], List[int]]]:
+        """Get a post's rendered HTML with its table of contents and section offsets."""
+        pass
+    
+    @abstractmethod
+    async def get_html_by_slug(self, slug: str) -> Optional[Tuple[Dict[str, bytes], Optional[str]]]:
+        """Get a post's rendered HTML in every stored encoding, keyed by encoding name, and its stored ETag."""
+        pass
+    
+    @abstractmethod
+    async def get_search_generation(self) -> int:
+        """Get the committed count of post writes, shared by all workers."""
+        pass
+    
+    @abstractmethod
+    async def bump_search_generation(self) -> None:
+        """Count a post write in the current transaction."""
+        pass
+    
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Run a callback (sync or async) once the current transaction commits; never if it rolls back."""
         pass
 
 
@@ -146,12 +246,32 @@ class ReactionRepository(ABC):
         """Get a user's reaction to a post."""
         pass
     
+    @abstractmethod
+    async def get_user_reaction_types(self, user_id: int, post_ids: List[int]) -> Dict[int, ReactionType]:
+        """Get a user's reaction types for several posts in one query, keyed by post ID."""
+        pass
+    
     @abstractmethod
     async def delete(self, reaction_id: int) -> bool:
         """Delete reaction."""
         pass
     
+    @abstractmethod
+    async def toggle(self, user_id: int, post_id: int, reaction_type: ReactionType) -> Optional[ReactionType]:
+        """Remove a user's reaction if it has this type, else set it; return the type afterwards."""
+        pass
+    
     @abstractmethod
     async def count_by_type(self, post_id: int) -> dict[ReactionType, int]:
         """Count reactions by type for a post."""
         pass
+    
+    @abstractmethod
+    async def count_by_type_for_posts(self, post_ids: List[int]) -> Dict[int, Dict[ReactionType, int]]:
+        """Count reactions by type for several posts in one query, keyed by post ID."""
+        pass
+    
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Run a callback (sync or async) once the current transaction commits; never if it rolls back."""
+        pass
@@ -1,8 +1,11 @@
 """Database connection and session management for async SQLAlchemy."""
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
+import inspect
 import os
+from typing import Any, Callable
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -31,12 +34,48 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
+# Session.info key of the callbacks waiting for the transaction to commit
+_AFTER_COMMIT = "after_commit"
+
+
+def register_after_commit(session: AsyncSession, callback: Callable[[], Any]) -> None:
+    """
+    Run a callback once the session's current transaction is committed by commit().
+    
+    Callbacks run in registration order; coroutines they return are awaited.
+    They are dropped if the transaction rolls back.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    """Drop the callbacks of a transaction that rolled back."""
+    session.info.pop(_AFTER_COMMIT, None)
+
+
+async def commit(session: AsyncSession) -> None:
+    """
+    Commit the session, then run its after-commit callbacks.
+    
+    Database work done by the callbacks is committed in a further
+    transaction, whose own callbacks run in turn.
+    """
+    await session.commit()
+    while session.info.get(_AFTER_COMMIT):
+        for callback in session.info.pop(_AFTER_COMMIT):
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        await session.commit()
+
+
 async def get_db() -> AsyncSession:
     """Dependency for FastAPI to get database session."""
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            await commit(session)
         except Exception:
             await session.rollback()
             raise
@@ -1,7 +1,7 @@
 """SQLAlchemy models for database tables."""
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Table, Enum as SQLEnum, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, ForeignKey, Table, Enum as SQLEnum, Index, LargeBinary, JSON, Float
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from src.driver.database.connection import Base
 import enum
@@ -62,6 +62,13 @@ class PostModel(Base):
     slug = Column(String(250), unique=True, nullable=False, index=True)
     content_markdown = Column(Text, nullable=False)
     content_html = Column(Text, nullable=False)
+    # Precompressed content_html and its ETag, loaded only by the raw HTML endpoint
+    content_html_gzip = deferred(Column(LargeBinary, nullable=True))
+    content_html_br = deferred(Column(LargeBinary, nullable=True))
+    content_html_etag = deferred(Column(String(34), nullable=True))
+    # Heading outline of content_html: TOC entries and section start offsets
+    toc = Column(JSON, nullable=True)
+    section_offsets = Column(JSON, nullable=True)
     excerpt = Column(String(500), nullable=True)
     status = Column(SQLEnum(PostStatusEnum), default=PostStatusEnum.DRAFT, nullable=False, index=True)
     author_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
@@ -80,9 +87,34 @@ class PostModel(Base):
     __table_args__ = (
         Index('idx_posts_status_published', 'status', 'published_at'),
         Index('idx_posts_author_status', 'author_id', 'status'),
+        # Full-text search index (MySQL only; other dialects search with LIKE)
+        Index('ft_posts_title_content', 'title', 'content_markdown', mysql_prefix='FULLTEXT').ddl_if(dialect='mysql'),
     )
 
 
+class RelatedPostModel(Base):
+    """Precomputed related post table model (a post's most similar posts)."""
+    __tablename__ = 'related_posts'
+    
+    post_id = Column(Integer, ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    related_post_id = Column(Integer, ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    # Cosine similarity of the posts' TF-IDF vectors
+    score = Column(Float, nullable=False)
+    
+    __table_args__ = (
+        # Finds the lists a post appears in when it changes
+        Index('idx_related_posts_related', 'related_post_id'),
+    )
+
+
+class SearchGenerationModel(Base):
+    """Single-row counter of post writes, keying cached searches in every worker."""
+    __tablename__ = 'search_generation'
+    
+    id = Column(Integer, primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+
+
 class CategoryModel(Base):
     """Category table model."""
     __tablename__ = 'categories'
@@ -1,7 +1,12 @@
 """SQLAlchemy implementations of repository interfaces."""
 
-from typing import Optional, List
-from sqlalchemy import select, func, or_, delete
+import re
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, List, Tuple
+from sqlalchemy import select, func, or_, delete, update, insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert, match
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -12,16 +17,33 @@ from src.domain.repositories import (
     CommentRepository,
     ReactionRepository,
 )
-from src.domain.entities import User, Post, Category, Comment, Reaction, PostStatus, ReactionType
+from src.domain.entities import (
+    User,
+    Post,
+    Category,
+    Comment,
+    Reaction,
+    PostStatus,
+    ReactionType,
+    SearchFilters,
+)
+from src.driver.database.connection import register_after_commit
 from src.driver.database.models import (
     UserModel,
     PostModel,
     CategoryModel,
     CommentModel,
     ReactionModel,
+    RelatedPostModel,
+    SearchGenerationModel,
     PostStatusEnum,
     ReactionTypeEnum,
+    post_categories,
 )
+from src.service.user_cache_service import UserCacheService
+
+# Queries using MySQL boolean full-text operators are run in boolean mode
+_BOOLEAN_QUERY_RE = re.compile(r'(^|\s)[+\-~<>(]|["*)]')
 
 
 class SQLAlchemyUserRepository(UserRepository):
@@ -52,6 +74,22 @@ class SQLAlchemyUserRepository(UserRepository):
         db_user = result.scalar_one_or_none()
         return self._to_entity(db_user) if db_user else None
     
+    async def get_updated_at(self, user_id: int) -> Optional[datetime]:
+        """Get when a user's profile last changed, without loading the user."""
+        result = await self.session.execute(
+            select(UserModel.updated_at).where(UserModel.id == user_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_by_ids(self, user_ids: List[int]) -> Dict[int, User]:
+        """Get users by ID in one query, keyed by ID."""
+        if not user_ids:
+            return {}
+        result = await self.session.execute(
+            select(UserModel).where(UserModel.id.in_(set(user_ids)))
+        )
+        return {db_user.id: self._to_entity(db_user) for db_user in result.scalars()}
+    
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         result = await self.session.execute(
@@ -82,6 +120,18 @@ class SQLAlchemyUserRepository(UserRepository):
         await self.session.refresh(db_user)
         return self._to_entity(db_user)
     
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        """Replace a user's password hash."""
+        await self.session.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(hashed_password=hashed_password)
+        )
+    
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Run a callback once the session's transaction commits."""
+        register_after_commit(self.session, callback)
+    
     @staticmethod
     def _to_entity(model: UserModel) -> User:
         """Convert SQLAlchemy model to domain entity."""
@@ -97,12 +147,89 @@ class SQLAlchemyUserRepository(UserRepository):
         )
 
 
+class CachedUserRepository(UserRepository):
+    """Read-through cache of users by ID in front of another UserRepository."""
+    
+    def __init__(self, repository: UserRepository, cache: UserCacheService):
+        self.repository = repository
+        self.cache = cache
+    
+    async def create(self, user: User) -> User:
+        """Create a new user."""
+        return await self.repository.create(user)
+    
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """Get user by ID, from the cache when possible."""
+        user = self.cache.get(user_id)
+        if user is not None:
+            return user
+        version = self.cache.version
+        user = await self.repository.get_by_id(user_id)
+        if user is not None:
+            self.cache.set(user, version)
+        return user
+    
+    async def get_by_ids(self, user_ids: List[int]) -> Dict[int, User]:
+        """Get users by ID, querying only those not in the cache."""
+        users = {}
+        missing = []
+        for user_id in set(user_ids):
+            user = self.cache.get(user_id)
+            if user is not None:
+                users[user_id] = user
+            else:
+                missing.append(user_id)
+        if missing:
+            version = self.cache.version
+            loaded = await self.repository.get_by_ids(missing)
+            for user in loaded.values():
+                self.cache.set(user, version)
+            users.update(loaded)
+        return users
+    
+    async def get_updated_at(self, user_id: int) -> Optional[datetime]:
+        """Get when a user's profile last changed (not cached: it detects other workers' changes)."""
+        return await self.repository.get_updated_at(user_id)
+    
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """Get user by username (not cached: login needs the current password hash)."""
+        return await self.repository.get_by_username(username)
+    
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        return await self.repository.get_by_email(email)
+    
+    async def update(self, user: User) -> User:
+        """Update user and drop its cached copy."""
+        updated = await self.repository.update(user)
+        self._invalidate(updated.id)
+        return updated
+    
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        """Replace a user's password hash and drop its cached copy."""
+        await self.repository.update_password(user_id, hashed_password)
+        self._invalidate(user_id)
+    
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Run a callback once the underlying repository's transaction commits."""
+        self.repository.after_commit(callback)
+    
+    def _invalidate(self, user_id: int) -> None:
+        """Drop a written user now, and again once the write commits (it may be re-read before)."""
+        self.cache.invalidate(user_id)
+        self.repository.after_commit(lambda: self.cache.invalidate(user_id))
+
+
 class SQLAlchemyPostRepository(PostRepository):
     """SQLAlchemy implementation of PostRepository."""
     
     def __init__(self, session: AsyncSession):
         self.session = session
     
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Run a callback once the session's transaction commits."""
+        register_after_commit(self.session, callback)
+    
     async def create(self, post: Post) -> Post:
         """Create a new post."""
         db_post = PostModel(
@@ -110,6 +237,11 @@ class SQLAlchemyPostRepository(PostRepository):
             slug=post.slug,
             content_markdown=post.content_markdown,
             content_html=post.content_html,
+            content_html_gzip=post.content_html_gzip,
+            content_html_br=post.content_html_br,
+            content_html_etag=post.content_html_etag,
+            toc=post.toc,
+            section_offsets=post.section_offsets,
             excerpt=post.excerpt,
             status=PostStatusEnum(post.status.value),
             author_id=post.author_id,
@@ -188,6 +320,13 @@ class SQLAlchemyPostRepository(PostRepository):
         db_post.title = post.title
         db_post.content_markdown = post.content_markdown
         db_post.content_html = post.content_html
+        if post.content_html_gzip is not None:
+            # Only freshly rendered posts carry their compressed HTML
+            db_post.content_html_gzip = post.content_html_gzip
+            db_post.content_html_br = post.content_html_br
+            db_post.content_html_etag = post.content_html_etag
+        db_post.toc = post.toc
+        db_post.section_offsets = post.section_offsets
         db_post.excerpt = post.excerpt
         db_post.status = PostStatusEnum(post.status.value)
         db_post.view_count = post.view_count
@@ -204,25 +343,304 @@ class SQLAlchemyPostRepository(PostRepository):
         )
         return result.rowcount > 0
     
-    async def search(self, query: str, limit: int = 10) -> List[Post]:
-        """Search posts by title or content."""
-        search_pattern = f"%{query}%"
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[Post]:
+        """Search published posts by title or content."""
+        if self.session.get_bind().dialect.name == "mysql":
+            return await self.search_fulltext(query, limit, offset, filters)
+        return await self.search_like(query, limit, offset, filters)
+    
+    async def count_search(self, query: str, filters: Optional[SearchFilters] = None) -> int:
+        """Count posts matching a search."""
+        result = await self.session.execute(
+            select(func.count(PostModel.id)).where(
+                *self._search_conditions(self._text_condition(query), filters)
+            )
+        )
+        return result.scalar_one()
+    
+    async def search_facets(
+        self,
+        query: str,
+        filters: Optional[SearchFilters] = None,
+        limit: int = 20,
+    ) -> Tuple[List[Tuple[Category, int]], List[Tuple[int, int]]]:
+        """Count posts matching a search per category and per author, most matches first."""
+        conditions = self._search_conditions(self._text_condition(query), filters)
+        matching = select(PostModel.id).where(*conditions)
+        
+        category_count = func.count(post_categories.c.post_id)
+        category_result = await self.session.execute(
+            select(CategoryModel, category_count)
+            .join(post_categories, post_categories.c.category_id == CategoryModel.id)
+            .where(post_categories.c.post_id.in_(matching))
+            .group_by(CategoryModel.id)
+            .order_by(category_count.desc(), CategoryModel.id)
+            .limit(limit)
+        )
+        author_count = func.count(PostModel.id)
+        author_result = await self.session.execute(
+            select(PostModel.author_id, author_count)
+            .where(*conditions)
+            .group_by(PostModel.author_id)
+            .order_by(author_count.desc(), PostModel.author_id)
+            .limit(limit)
+        )
+        
+        category_facets = [
+            (
+                Category(id=db_category.id, name=db_category.name, slug=db_category.slug),
+                count,
+            )
+            for db_category, count in category_result.all()
+        ]
+        return category_facets, [(author_id, count) for author_id, count in author_result.all()]
+    
+    async def search_fulltext(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[Post]:
+        """Search posts with the MySQL FULLTEXT index, most relevant first."""
+        relevance = self._fulltext_relevance(query)
         result = await self.session.execute(
             select(PostModel)
             .options(selectinload(PostModel.categories))
-            .where(
-                or_(
-                    PostModel.title.like(search_pattern),
-                    PostModel.content_markdown.like(search_pattern),
-                )
-            )
-            .where(PostModel.status == PostStatusEnum.PUBLISHED)
+            .where(*self._search_conditions(relevance, filters))
+            .order_by(relevance.desc(), PostModel.created_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        db_posts = result.scalars().all()
+        return [await self._to_entity(db_post) for db_post in db_posts]
+    
+    async def search_like(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[Post]:
+        """Search posts by substring match on title or content, newest first."""
+        result = await self.session.execute(
+            select(PostModel)
+            .options(selectinload(PostModel.categories))
+            .where(*self._search_conditions(self._like_condition(query), filters))
             .order_by(PostModel.created_at.desc())
             .limit(limit)
+            .offset(offset)
         )
         db_posts = result.scalars().all()
         return [await self._to_entity(db_post) for db_post in db_posts]
     
+    def _text_condition(self, query: str):
+        """Condition matching a query the way search() does on this dialect."""
+        if self.session.get_bind().dialect.name == "mysql":
+            return self._fulltext_relevance(query)
+        return self._like_condition(query)
+    
+    @staticmethod
+    def _search_conditions(text_condition, filters: Optional[SearchFilters]) -> list:
+        """WHERE conditions selecting the published posts that match a text condition and filters."""
+        conditions = [text_condition, PostModel.status == PostStatusEnum.PUBLISHED]
+        
+        if filters is not None:
+            if filters.category_id is not None:
+                conditions.append(PostModel.categories.any(CategoryModel.id == filters.category_id))
+            if filters.author_id is not None:
+                conditions.append(PostModel.author_id == filters.author_id)
+            if filters.published_from is not None:
+                conditions.append(PostModel.published_at >= filters.published_from)
+            if filters.published_to is not None:
+                conditions.append(PostModel.published_at <= filters.published_to)
+        return conditions
+    
+    @staticmethod
+    def _fulltext_relevance(query: str):
+        """
+        MATCH ... AGAINST expression for a query.
+        
+        Queries containing boolean operators (+word, -word, "phrase", prefix*)
+        run in boolean mode, all others in natural language mode.
+        """
+        relevance = match(PostModel.title, PostModel.content_markdown, against=query)
+        if _BOOLEAN_QUERY_RE.search(query):
+            return relevance.in_boolean_mode()
+        return relevance.in_natural_language_mode()
+    
+    @staticmethod
+    def _like_condition(query: str):
+        """Substring condition on title or content for a query."""
+        search_pattern = f"%{query}%"
+        return or_(
+            PostModel.title.like(search_pattern),
+            PostModel.content_markdown.like(search_pattern),
+        )
+    
+    async def get_published_after(self, after_id: int, limit: int = 500) -> List[Post]:
+        """Get published posts with ID greater than after_id, in ID order, without comments or reactions."""
+        result = await self.session.execute(
+            select(PostModel)
+            .options(selectinload(PostModel.categories))
+            .where(PostModel.status == PostStatusEnum.PUBLISHED)
+            .where(PostModel.id > after_id)
+            .order_by(PostModel.id.asc())
+            .limit(limit)
+        )
+        return [self._to_summary_entity(db_post) for db_post in result.scalars().all()]
+    
+    async def get_related(self, slug: str, limit: int = 5) -> Optional[List[Tuple[Post, float]]]:
+        """Get the stored related posts of a post, most similar first (None if the post does not exist)."""
+        result = await self.session.execute(select(PostModel.id).where(PostModel.slug == slug))
+        post_id = result.scalar_one_or_none()
+        if post_id is None:
+            return None
+        
+        result = await self.session.execute(
+            select(PostModel, RelatedPostModel.score)
+            .join(RelatedPostModel, RelatedPostModel.related_post_id == PostModel.id)
+            .options(selectinload(PostModel.categories))
+            .where(RelatedPostModel.post_id == post_id)
+            .where(PostModel.status == PostStatusEnum.PUBLISHED)
+            .order_by(RelatedPostModel.score.desc(), PostModel.id)
+            .limit(limit)
+        )
+        return [(self._to_summary_entity(db_post), score) for db_post, score in result.all()]
+    
+    async def get_related_lists(self, post_ids: List[int]) -> Dict[int, List[Tuple[int, float]]]:
+        """Get the stored related post lists of posts as {post_id: [(related_post_id, score)]}."""
+        if not post_ids:
+            return {}
+        
+        result = await self.session.execute(
+            select(RelatedPostModel.post_id, RelatedPostModel.related_post_id, RelatedPostModel.score)
+            .where(RelatedPostModel.post_id.in_(post_ids))
+            .order_by(RelatedPostModel.post_id, RelatedPostModel.score.desc())
+        )
+        lists: Dict[int, List[Tuple[int, float]]] = {}
+        for post_id, related_post_id, score in result.all():
+            lists.setdefault(post_id, []).append((related_post_id, score))
+        return lists
+    
+    async def get_referrer_ids(self, post_id: int) -> List[int]:
+        """Get the IDs of posts whose related post list includes a post."""
+        result = await self.session.execute(
+            select(RelatedPostModel.post_id).where(RelatedPostModel.related_post_id == post_id)
+        )
+        return list(result.scalars().all())
+    
+    async def set_related(self, post_id: int, related: List[Tuple[int, float]]) -> None:
+        """Replace a post's related post list."""
+        await self.session.execute(delete(RelatedPostModel).where(RelatedPostModel.post_id == post_id))
+        self.session.add_all(
+            RelatedPostModel(post_id=post_id, related_post_id=related_post_id, score=score)
+            for related_post_id, score in related
+        )
+        await self.session.flush()
+    
+    async def get_search_generation(self) -> int:
+        """Get the committed count of post writes, shared by all workers."""
+        result = await self.session.execute(
+            select(SearchGenerationModel.generation).where(SearchGenerationModel.id == 1)
+        )
+        return result.scalar_one_or_none() or 0
+    
+    async def bump_search_generation(self) -> None:
+        """
+        Count a post write in the current transaction.
+        
+        Other workers see the new generation together with the write, once
+        the transaction commits.
+        """
+        result = await self.session.execute(
+            update(SearchGenerationModel)
+            .where(SearchGenerationModel.id == 1)
+            .values(generation=SearchGenerationModel.generation + 1)
+        )
+        if result.rowcount == 0:
+            # Schemas created without the migration start without the row
+            self.session.add(SearchGenerationModel(id=1, generation=1))
+            await self.session.flush()
+    
+    async def get_sections_by_slug(self, slug: str) -> Optional[Tuple[str, List[dict], List[int]]]:
+        """Get a post's rendered HTML with its table of contents and section offsets."""
+        result = await self.session.execute(
+            select(PostModel.content_html, PostModel.toc, PostModel.section_offsets)
+            .where(PostModel.slug == slug)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        
+        content_html, toc, section_offsets = row
+        # Posts rendered before outlines were stored form a single section
+        return content_html, toc or [], section_offsets or [0]
+    
+    async def get_html_by_slug(self, slug: str) -> Optional[Tuple[Dict[str, bytes], Optional[str]]]:
+        """
+        Get a post's rendered HTML in every stored encoding, with one query.
+        
+        Returns:
+            Tuple of (bodies keyed by encoding name ("identity", "gzip", "br"),
+            stored ETag); posts rendered before an encoding or the ETag was
+            stored lack it
+        """
+        result = await self.session.execute(
+            select(
+                PostModel.content_html,
+                PostModel.content_html_gzip,
+                PostModel.content_html_br,
+                PostModel.content_html_etag,
+            )
+            .where(PostModel.slug == slug)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        
+        content_html, content_html_gzip, content_html_br, content_html_etag = row
+        variants = {"identity": content_html.encode('utf-8')}
+        if content_html_gzip is not None:
+            variants["gzip"] = content_html_gzip
+        if content_html_br is not None:
+            variants["br"] = content_html_br
+        return variants, content_html_etag
+    
+    @staticmethod
+    def _to_summary_entity(model: PostModel) -> Post:
+        """Convert a model with only its categories loaded to a domain entity."""
+        return Post(
+            id=model.id,
+            title=model.title,
+            slug=model.slug,
+            content_markdown=model.content_markdown,
+            content_html=model.content_html,
+            excerpt=model.excerpt,
+            status=PostStatus(model.status.value),
+            author_id=model.author_id,
+            view_count=model.view_count,
+            published_at=model.published_at,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            categories=[
+                Category(
+                    id=cat.id,
+                    name=cat.name,
+                    slug=cat.slug,
+                    description=cat.description,
+                    created_at=cat.created_at,
+                )
+                for cat in model.categories
+            ],
+        )
+    
     async def _to_entity(self, model: PostModel) -> Post:
         """Convert SQLAlchemy model to domain entity."""
         # Load relationships if not already loaded
@@ -234,6 +652,8 @@ class SQLAlchemyPostRepository(PostRepository):
             slug=model.slug,
             content_markdown=model.content_markdown,
             content_html=model.content_html,
+            toc=model.toc,
+            section_offsets=model.section_offsets,
             excerpt=model.excerpt,
             status=PostStatus(model.status.value),
             author_id=model.author_id,
@@ -403,6 +823,10 @@ class SQLAlchemyReactionRepository(ReactionRepository):
     def __init__(self, session: AsyncSession):
         self.session = session
     
+    def after_commit(self, callback: Callable[[], Any]) -> None:
+        """Run a callback once the session's transaction commits."""
+        register_after_commit(self.session, callback)
+    
     async def create(self, reaction: Reaction) -> Reaction:
         """Create a new reaction."""
         db_reaction = ReactionModel(
@@ -433,6 +857,24 @@ class SQLAlchemyReactionRepository(ReactionRepository):
         db_reaction = result.scalar_one_or_none()
         return self._to_entity(db_reaction) if db_reaction else None
     
+    async def get_user_reaction_types(self, user_id: int, post_ids: List[int]) -> Dict[int, ReactionType]:
+        """
+        Get a user's reaction types for several posts with one query.
+        
+        The lookup is covered by the unique (user_id, post_id) index.
+        
+        Returns:
+            Reaction type by post ID, for the posts the user reacted to
+        """
+        if not post_ids:
+            return {}
+        result = await self.session.execute(
+            select(ReactionModel.post_id, ReactionModel.type)
+            .where(ReactionModel.user_id == user_id)
+            .where(ReactionModel.post_id.in_(post_ids))
+        )
+        return {post_id: ReactionType(db_type.value) for post_id, db_type in result}
+    
     async def delete(self, reaction_id: int) -> bool:
         """Delete reaction."""
         result = await self.session.execute(
@@ -440,6 +882,58 @@ class SQLAlchemyReactionRepository(ReactionRepository):
         )
         return result.rowcount > 0
     
+    async def toggle(self, user_id: int, post_id: int, reaction_type: ReactionType) -> Optional[ReactionType]:
+        """
+        Toggle a user's reaction to a post without reading it first.
+        
+        A reaction of the same type is deleted; otherwise the reaction is
+        inserted, or switched to the new type, by an upsert on the unique
+        (user_id, post_id) index. Both statements are atomic, so concurrent
+        toggles never collide on the index, and no other row is locked.
+        
+        Returns:
+            The user's reaction type afterwards, or None if it was removed
+        """
+        db_type = ReactionTypeEnum(reaction_type.value)
+        removed = await self.session.execute(
+            delete(ReactionModel)
+            .where(ReactionModel.user_id == user_id)
+            .where(ReactionModel.post_id == post_id)
+            .where(ReactionModel.type == db_type)
+        )
+        if removed.rowcount:
+            return None
+        
+        values = {"type": db_type, "user_id": user_id, "post_id": post_id, "created_at": datetime.utcnow()}
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "mysql":
+            statement = mysql_insert(ReactionModel).values(**values)
+            statement = statement.on_duplicate_key_update(
+                type=statement.inserted.type,
+                created_at=statement.inserted.created_at,
+            )
+        elif dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+            statement = dialect_insert(ReactionModel).values(**values)
+            statement = statement.on_conflict_do_update(
+                index_elements=[ReactionModel.user_id, ReactionModel.post_id],
+                set_={"type": statement.excluded.type, "created_at": statement.excluded.created_at},
+            )
+        else:
+            # No upsert: switch an existing reaction, or insert the first one
+            updated = await self.session.execute(
+                update(ReactionModel)
+                .where(ReactionModel.user_id == user_id)
+                .where(ReactionModel.post_id == post_id)
+                .values(type=db_type, created_at=values["created_at"])
+            )
+            if updated.rowcount:
+                return reaction_type
+            statement = insert(ReactionModel).values(**values)
+        
+        await self.session.execute(statement)
+        return reaction_type
+    
     async def count_by_type(self, post_id: int) -> dict[ReactionType, int]:
         """Count reactions by type for a post."""
         result = await self.session.execute(
@@ -454,6 +948,23 @@ class SQLAlchemyReactionRepository(ReactionRepository):
         
         return counts
     
+    async def count_by_type_for_posts(self, post_ids: List[int]) -> Dict[int, Dict[ReactionType, int]]:
+        """Count reactions by type for several posts with one grouped query."""
+        counts = {
+            post_id: {reaction_type: 0 for reaction_type in ReactionType}
+            for post_id in post_ids
+        }
+        if not counts:
+            return counts
+        result = await self.session.execute(
+            select(ReactionModel.post_id, ReactionModel.type, func.count(ReactionModel.id))
+            .where(ReactionModel.post_id.in_(list(counts)))
+            .group_by(ReactionModel.post_id, ReactionModel.type)
+        )
+        for post_id, db_type, count in result:
+            counts[post_id][ReactionType(db_type.value)] = count
+        return counts
+    
     @staticmethod
     def _to_entity(model: ReactionModel) -> Reaction:
         """Convert SQLAlchemy model to domain entity."""
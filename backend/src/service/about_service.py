@@ -0,0 +1,60 @@
+"""About page service holding the pre-rendered about payload."""
+
+from datetime import datetime
+from typing import Optional
+
+from src.service.compression_service import PrecompressedBody, compression_service
+
+# The blog author shown on the about page
+ABOUT_AUTHOR_ID = 1
+
+
+class AboutPageService:
+    """
+    Service keeping the serialized about page until the author's profile changes.
+    
+    Each worker holds its own payload, versioned by the author's updated_at.
+    invalidate_author() only reaches the worker that made the change, so
+    readers compare the version with the database and every other worker
+    rebuilds on its next request.
+    """
+    
+    def __init__(self):
+        """Initialize with no payload; it is built at startup or on first request."""
+        self._body: Optional[PrecompressedBody] = None
+        self._version: Optional[datetime] = None
+    
+    @property
+    def body(self) -> Optional[PrecompressedBody]:
+        """Get the current precompressed payload, if built."""
+        return self._body
+    
+    def body_for(self, version: Optional[datetime]) -> Optional[PrecompressedBody]:
+        """Get the payload if it was built from the author's profile as of version."""
+        if self._body is None or self._version != version:
+            return None
+        return self._body
+    
+    def store(self, payload: bytes, version: Optional[datetime] = None) -> PrecompressedBody:
+        """
+        Store a freshly serialized about payload.
+        
+        Args:
+            payload: JSON-encoded about response
+            version: The author's updated_at the payload was built from
+            
+        Returns:
+            The payload with its compressed variants and ETag
+        """
+        self._body = compression_service.compress(payload)
+        self._version = version
+        return self._body
+    
+    def invalidate_author(self, user_id: int) -> None:
+        """Drop the payload if the given user is the about page author."""
+        if user_id == ABOUT_AUTHOR_ID:
+            self._body = None
+
+
+# Singleton instance
+about_service = AboutPageService()
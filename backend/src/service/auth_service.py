@@ -1,18 +1,74 @@
-"""Authentication service for password hashing and verification."""
+"""Authentication service for password hashing and verification.
 
+bcrypt is slow on purpose (about 250 ms at cost 12) and releases the GIL, so
+request handlers run it on a small thread pool instead of the event loop.
+The pool admits a bounded number of jobs: once it is full, or a job waits
+too long for a thread, callers get PasswordHashingBusyError and can answer
+503 straight away instead of queueing behind a burst of logins.
+"""
+
+import asyncio
 import bcrypt
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, TypeVar
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # BCrypt cost factor from environment
 BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# Threads hashing passwords concurrently
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hashes queued or running at once before new ones are turned away
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", str(BCRYPT_WORKERS * 8)))
+# Longest a hash may wait for a thread before it is abandoned
+BCRYPT_QUEUE_TIMEOUT_SECONDS = float(os.getenv("BCRYPT_QUEUE_TIMEOUT_SECONDS", "2.0"))
+# Cost factors bcrypt accepts
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 31
+
+T = TypeVar("T")
+
+
+class PasswordHashingBusyError(Exception):
+    """Raised when the password hashing pool is saturated."""
 
 
 class AuthService:
     """Service for authentication operations."""
     
+    def __init__(
+        self,
+        workers: int = BCRYPT_WORKERS,
+        max_pending: int = BCRYPT_MAX_PENDING,
+        queue_timeout: float = BCRYPT_QUEUE_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the service; pool threads start on first use.
+        
+        Args:
+            workers: Threads hashing passwords concurrently
+            max_pending: Hashes queued or running at once before new ones are rejected
+            queue_timeout: Seconds a hash may wait for a thread
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._hash_time_total = 0.0
+        self._hash_time_max = 0.0
+    
     @staticmethod
     def hash_password(password: str) -> str:
         """
@@ -44,6 +100,154 @@ class AuthService:
         password_bytes = password.encode('utf-8')
         hashed_bytes = hashed_password.encode('utf-8')
         return bcrypt.checkpw(password_bytes, hashed_bytes)
+    
+    @staticmethod
+    def hash_rounds(hashed_password: str) -> Optional[int]:
+        """
+        Read the cost factor of a bcrypt hash.
+        
+        Args:
+            hashed_password: Hash in modular crypt format, e.g. "$2b$12$..."
+            
+        Returns:
+            The cost factor, or None if the hash is not a bcrypt hash
+        """
+        parts = hashed_password.split("$")
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+    
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """Whether a hash was made with a cost other than BCRYPT_ROUNDS."""
+        return AuthService.hash_rounds(hashed_password) != BCRYPT_ROUNDS
+    
+    async def hash_password_async(self, password: str) -> str:
+        """
+        Hash a password on the bcrypt pool.
+        
+        Raises:
+            PasswordHashingBusyError: If the pool is saturated
+        """
+        return await self._run(self.hash_password, password)
+    
+    async def verify_password_async(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password on the bcrypt pool.
+        
+        Raises:
+            PasswordHashingBusyError: If the pool is saturated
+        """
+        return await self._run(self.verify_password, password, hashed_password)
+    
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        """Run a bcrypt call on the pool, subject to the pending limit and queue timeout."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusyError("Too many password checks in progress")
+            self._pending += 1
+        
+        submitted = time.perf_counter()
+        
+        def timed() -> T:
+            start = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self._record(start - submitted, time.perf_counter() - start)
+        
+        future = self._executor.submit(timed)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not future.cancel():
+                # Already hashing: finishing costs less than asking the client to retry
+                return await asyncio.wrap_future(future)
+            with self._lock:
+                self.timed_out += 1
+            raise PasswordHashingBusyError("Timed out waiting for a password check")
+    
+    def _release(self, _future) -> None:
+        """Free a pending slot once a job finished or was cancelled."""
+        with self._lock:
+            self._pending -= 1
+    
+    def _record(self, queue_wait: float, hash_time: float) -> None:
+        """Record the timings of a finished job."""
+        with self._lock:
+            self.completed += 1
+            self._queue_wait_total += queue_wait
+            self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+            self._hash_time_total += hash_time
+            self._hash_time_max = max(self._hash_time_max, hash_time)
+    
+    def stats(self) -> dict:
+        """Get bcrypt pool statistics (for monitoring)."""
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": self.workers,
+                "rounds": BCRYPT_ROUNDS,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "queue_wait_ms_avg": round(self._queue_wait_total / completed * 1000, 2),
+                "queue_wait_ms_max": round(self._queue_wait_max * 1000, 2),
+                "hash_ms_avg": round(self._hash_time_total / completed * 1000, 2),
+                "hash_ms_max": round(self._hash_time_max * 1000, 2),
+            }
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    """
+    Measure how long hashing one password takes on this host.
+    
+    Args:
+        rounds: bcrypt cost factor
+        samples: Hashes timed; the median is reported
+        
+    Returns:
+        Median hashing time in milliseconds
+    """
+    timings = []
+    for _ in range(samples):
+        salt = bcrypt.gensalt(rounds=rounds)
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration password", salt)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def calibrate_rounds(target_ms: float, samples: int = 3) -> Tuple[int, List[Tuple[int, float]]]:
+    """
+    Find the highest cost factor whose hashing time stays within a target.
+    
+    Each extra round doubles the work, so costs are measured upwards from the
+    minimum until one exceeds the target; the whole run takes about twice the
+    target per sample.
+    
+    Args:
+        target_ms: Longest acceptable time to hash or verify one password
+        samples: Hashes timed per cost factor
+        
+    Returns:
+        Recommended cost factor (at least BCRYPT_MIN_ROUNDS) and the
+        (rounds, milliseconds) measurements taken
+    """
+    measurements = []
+    recommended = BCRYPT_MIN_ROUNDS
+    for rounds in range(BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS + 1):
+        elapsed = measure_hash_ms(rounds, samples)
+        measurements.append((rounds, elapsed))
+        if elapsed > target_ms:
+            break
+        recommended = rounds
+    return recommended, measurements
 
 
 # Singleton instance
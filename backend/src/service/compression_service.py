@@ -0,0 +1,109 @@
+"""Compression service for precompressed response bodies."""
+
+import gzip
+import hashlib
+from typing import Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is an optional speedup
+    brotli = None
+
+# Compression levels: bodies are compressed once and served many times
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Preferred encodings, best first
+ENCODING_PREFERENCE = ["br", "gzip", "identity"]
+
+
+class PrecompressedBody:
+    """A response body stored in every supported content encoding."""
+    
+    def __init__(self, variants: Dict[str, bytes], etag: str):
+        self.variants = variants
+        self.etag = etag
+
+
+class CompressionService:
+    """Service for compressing bodies once and negotiating encodings."""
+    
+    @staticmethod
+    def compress(data: bytes) -> PrecompressedBody:
+        """
+        Compress data with every available encoding.
+        
+        Args:
+            data: Uncompressed body
+            
+        Returns:
+            PrecompressedBody with identity, gzip and (if available) br variants
+        """
+        variants = {
+            "identity": data,
+            "gzip": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0),
+        }
+        if brotli is not None:
+            variants["br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+        
+        return PrecompressedBody(variants, CompressionService.etag(data))
+    
+    @staticmethod
+    def etag(data: bytes) -> str:
+        """Compute the ETag of an uncompressed body."""
+        return '"%s"' % hashlib.sha256(data).hexdigest()[:32]
+    
+    @staticmethod
+    def acceptable_encodings(accept_encoding: Optional[str]) -> List[str]:
+        """
+        List encodings allowed by an Accept-Encoding header, best first.
+        
+        Args:
+            accept_encoding: Raw Accept-Encoding header value
+            
+        Returns:
+            Encoding names in preference order, always ending with "identity"
+        """
+        if not accept_encoding:
+            return ["identity"]
+        
+        accepted = {}
+        for item in accept_encoding.split(","):
+            name, _, params = item.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+        
+        wildcard = accepted.get("*", 0.0)
+        encodings = [
+            encoding
+            for encoding in ENCODING_PREFERENCE
+            if encoding != "identity" and accepted.get(encoding, wildcard) > 0
+        ]
+        encodings.append("identity")
+        return encodings
+    
+    def negotiate(self, accept_encoding: Optional[str], available: Dict[str, bytes]) -> str:
+        """
+        Pick the best available encoding allowed by an Accept-Encoding header.
+        
+        Args:
+            accept_encoding: Raw Accept-Encoding header value
+            available: Encoded bodies keyed by encoding name
+            
+        Returns:
+            Encoding name ("identity" if nothing better is acceptable)
+        """
+        for encoding in self.acceptable_encodings(accept_encoding):
+            if encoding in available:
+                return encoding
+        return "identity"
+
+
+# Singleton instance
+compression_service = CompressionService()
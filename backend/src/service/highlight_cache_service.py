@@ -0,0 +1,113 @@
+"""Shared cache of Pygments-highlighted code blocks."""
+
+import hashlib
+import json
+import logging
+import os
+from typing import Optional
+
+import pygments
+from dotenv import load_dotenv
+
+from src.service.lru_cache import LRUCache
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Cache bounds and optional persistence file from environment
+HIGHLIGHT_CACHE_SIZE = int(os.getenv("HIGHLIGHT_CACHE_SIZE", "2048"))
+HIGHLIGHT_CACHE_MAX_BYTES = int(os.getenv("HIGHLIGHT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+HIGHLIGHT_CACHE_FILE = os.getenv("HIGHLIGHT_CACHE_FILE") or None
+
+# Bumped when the persisted file layout changes
+_FILE_VERSION = 1
+
+
+class HighlightCacheService:
+    """Service caching highlighted code HTML by (language, code hash, options)."""
+    
+    def __init__(
+        self,
+        max_entries: int = HIGHLIGHT_CACHE_SIZE,
+        max_bytes: int = HIGHLIGHT_CACHE_MAX_BYTES,
+        path: Optional[str] = HIGHLIGHT_CACHE_FILE,
+    ):
+        """Initialize the cache and load persisted entries if a file is configured."""
+        self.cache = LRUCache(max_entries=max_entries, max_weight=max_bytes)
+        self.path = path
+        if self.path:
+            self.load()
+    
+    def highlight(self, code: str, lexer, formatter) -> str:
+        """
+        Drop-in replacement for pygments.highlight() backed by the cache.
+        
+        Args:
+            code: Source code to highlight
+            lexer: Pygments lexer instance
+            formatter: Pygments formatter instance
+            
+        Returns:
+            Highlighted HTML
+        """
+        key = self._key(code, lexer, formatter)
+        html = self.cache.get(key)
+        if html is None:
+            html = pygments.highlight(code, lexer, formatter)
+            self.cache.set(key, html)
+        return html
+    
+    def load(self) -> int:
+        """
+        Load entries from the persistence file.
+        
+        Returns:
+            Number of entries loaded
+        """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable highlight cache file %s", self.path, exc_info=True)
+            return 0
+        
+        if data.get("version") != _FILE_VERSION:
+            return 0
+        for key, html in data.get("entries", []):
+            self.cache.set(key, html)
+        return len(self.cache)
+    
+    def save(self) -> None:
+        """Write entries to the persistence file (oldest first, so LRU order survives)."""
+        if not self.path:
+            return
+        data = {"version": _FILE_VERSION, "entries": self.cache.items()}
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(data, cache_file)
+        os.replace(temp_path, self.path)
+    
+    def stats(self) -> dict:
+        """Get cache statistics (for monitoring)."""
+        return {**self.cache.stats(), "persist_path": self.path}
+    
+    @staticmethod
+    def _key(code: str, lexer, formatter) -> str:
+        """Build the cache key from language, code hash and Pygments options."""
+        language = lexer.aliases[0] if lexer.aliases else lexer.name
+        options = repr((
+            pygments.__version__,
+            type(formatter).__name__,
+            sorted(lexer.options.items()),
+            sorted(formatter.options.items()),
+        ))
+        code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        options_hash = hashlib.sha256(options.encode("utf-8")).hexdigest()[:16]
+        return f"{language}:{code_hash}:{options_hash}"
+
+
+# Singleton instance
+highlight_cache_service = HighlightCacheService()
@@ -0,0 +1,139 @@
+"""Bounded in-process LRU cache with optional TTL and hit/miss statistics."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and, optionally, total weight."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            ttl_seconds: Entry lifetime in seconds (None keeps entries until evicted)
+            max_weight: Maximum summed weight of all values (None disables the bound)
+            weigher: Function returning the weight of a value (defaults to len())
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_weight = max_weight
+        self._weigher = weigher or len
+        # {key: (value, weight, expires_at)}
+        self._entries: OrderedDict[Hashable, tuple] = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default on a miss."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value for key without counting a lookup or refreshing its recency."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            value, _, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting least recently used entries if needed."""
+        weight = self._weigher(value) if self.max_weight is not None else 0
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+
+        expires_at = (
+            time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, weight, expires_at)
+            self._weight += weight
+
+            while len(self._entries) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove key from the cache. Returns True if it was present."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self) -> None:
+        """Remove all entries (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+
+    def items(self) -> list:
+        """Return a snapshot of (key, value) pairs, oldest first."""
+        with self._lock:
+            return [(key, entry[0]) for key, entry in self._entries.items()]
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Get cache statistics (for monitoring)."""
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+        if self.max_weight is not None:
+            stats["weight"] = self._weight
+            stats["max_weight"] = self.max_weight
+        return stats
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry. Caller must hold the lock."""
+        _, weight, _ = self._entries.pop(key)
+        self._weight -= weight
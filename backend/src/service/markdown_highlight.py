@@ -0,0 +1,174 @@
+"""Markdown extensions that highlight code through the shared highlight cache.
+
+Python-Markdown's CodeHilite calls pygments.highlight() directly, and both
+the indented code tree processor and the fenced code preprocessor construct
+CodeHilite themselves. The classes below mirror those (markdown==3.5.1) with
+CachedCodeHilite in their place, so every highlighted block goes through
+highlight_cache_service without patching the library. The markdown pin in
+requirements.txt and a source-hash test keep the copies in step with upstream.
+"""
+
+from markdown.extensions.attr_list import AttrListExtension, get_attrs
+from markdown.extensions.codehilite import (
+    CodeHilite,
+    CodeHiliteExtension,
+    HiliteTreeprocessor,
+    parse_hl_lines,
+)
+from markdown.extensions.fenced_code import FencedBlockPreprocessor, FencedCodeExtension
+from markdown.serializers import _escape_attrib_html
+from pygments.formatters import get_formatter_by_name
+from pygments.lexers import get_lexer_by_name, guess_lexer
+from pygments.util import ClassNotFound
+
+from src.service.highlight_cache_service import highlight_cache_service
+
+
+class CachedCodeHilite(CodeHilite):
+    """CodeHilite that highlights through the shared highlight cache."""
+    
+    def hilite(self, shebang=True) -> str:
+        """Highlight the code, reusing cached HTML for identical snippets."""
+        if not self.use_pygments:
+            return super().hilite(shebang)
+        
+        self.src = self.src.strip('\n')
+        
+        if self.lang is None and shebang:
+            self._parseHeader()
+        
+        try:
+            lexer = get_lexer_by_name(self.lang, **self.options)
+        except ValueError:
+            try:
+                if self.guess_lang:
+                    lexer = guess_lexer(self.src, **self.options)
+                else:
+                    lexer = get_lexer_by_name('text', **self.options)
+            except ValueError:
+                lexer = get_lexer_by_name('text', **self.options)
+        if not self.lang:
+            # Use the guessed lexer's language instead
+            self.lang = lexer.aliases[0]
+        lang_str = f'{self.lang_prefix}{self.lang}'
+        if isinstance(self.pygments_formatter, str):
+            try:
+                formatter = get_formatter_by_name(self.pygments_formatter, **self.options)
+            except ClassNotFound:
+                formatter = get_formatter_by_name('html', **self.options)
+        else:
+            formatter = self.pygments_formatter(lang_str=lang_str, **self.options)
+        return highlight_cache_service.highlight(self.src, lexer, formatter)
+
+
+class CachedHiliteTreeprocessor(HiliteTreeprocessor):
+    """Highlight indented code blocks with CachedCodeHilite."""
+    
+    def run(self, root):
+        """Find code blocks and store their highlighted HTML in the stash."""
+        for block in root.iter('pre'):
+            if len(block) == 1 and block[0].tag == 'code':
+                local_config = self.config.copy()
+                code = CachedCodeHilite(
+                    self.code_unescape(block[0].text),
+                    tab_length=self.md.tab_length,
+                    style=local_config.pop('pygments_style', 'default'),
+                    **local_config
+                )
+                placeholder = self.md.htmlStash.store(code.hilite())
+                # Replace the block with a paragraph holding the placeholder
+                block.clear()
+                block.tag = 'p'
+                block.text = placeholder
+
+
+class CachedCodeHiliteExtension(CodeHiliteExtension):
+    """CodeHilite extension backed by the shared highlight cache."""
+    
+    def extendMarkdown(self, md):
+        """Register the cached tree processor under CodeHilite's name."""
+        hiliter = CachedHiliteTreeprocessor(md)
+        hiliter.config = self.getConfigs()
+        md.treeprocessors.register(hiliter, 'hilite', 30)
+        
+        md.registerExtension(self)
+
+
+class CachedFencedBlockPreprocessor(FencedBlockPreprocessor):
+    """Highlight fenced code blocks with CachedCodeHilite."""
+    
+    def run(self, lines):
+        """Find fenced code blocks and store their HTML in the stash."""
+        if not self.checked_for_deps:
+            for ext in self.md.registeredExtensions:
+                if isinstance(ext, CodeHiliteExtension):
+                    self.codehilite_conf = ext.getConfigs()
+                if isinstance(ext, AttrListExtension):
+                    self.use_attr_list = True
+            
+            self.checked_for_deps = True
+        
+        text = "\n".join(lines)
+        while True:
+            m = self.FENCED_BLOCK_RE.search(text)
+            if not m:
+                break
+            
+            lang, id, classes, config = None, '', [], {}
+            if m.group('attrs'):
+                id, classes, config = self.handle_attrs(get_attrs(m.group('attrs')))
+                if len(classes):
+                    lang = classes.pop(0)
+            else:
+                if m.group('lang'):
+                    lang = m.group('lang')
+                if m.group('hl_lines'):
+                    config['hl_lines'] = parse_hl_lines(m.group('hl_lines'))
+            
+            if self.codehilite_conf and self.codehilite_conf['use_pygments'] and config.get('use_pygments', True):
+                local_config = self.codehilite_conf.copy()
+                local_config.update(config)
+                # Pygments may suffix the last class, so cssclass goes last
+                if classes:
+                    local_config['css_class'] = '{} {}'.format(
+                        ' '.join(classes),
+                        local_config['css_class']
+                    )
+                highliter = CachedCodeHilite(
+                    m.group('code'),
+                    lang=lang,
+                    style=local_config.pop('pygments_style', 'default'),
+                    **local_config
+                )
+                code = highliter.hilite(shebang=False)
+            else:
+                id_attr = lang_attr = class_attr = kv_pairs = ''
+                if lang:
+                    prefix = self.config.get('lang_prefix', 'language-')
+                    lang_attr = f' class="{prefix}{_escape_attrib_html(lang)}"'
+                if classes:
+                    class_attr = f' class="{_escape_attrib_html(" ".join(classes))}"'
+                if id:
+                    id_attr = f' id="{_escape_attrib_html(id)}"'
+                if self.use_attr_list and config and not config.get('use_pygments', False):
+                    kv_pairs = ''.join(
+                        f' {k}="{_escape_attrib_html(v)}"' for k, v in config.items() if k != 'use_pygments'
+                    )
+                code = self._escape(m.group('code'))
+                code = f'<pre{id_attr}{class_attr}><code{lang_attr}{kv_pairs}>{code}</code></pre>'
+            
+            placeholder = self.md.htmlStash.store(code)
+            text = f'{text[:m.start()]}\n{placeholder}\n{text[m.end():]}'
+        return text.split("\n")
+
+
+class CachedFencedCodeExtension(FencedCodeExtension):
+    """Fenced code extension backed by the shared highlight cache."""
+    
+    def extendMarkdown(self, md):
+        """Register the cached preprocessor under fenced_code's name."""
+        md.registerExtension(self)
+        
+        md.preprocessors.register(
+            CachedFencedBlockPreprocessor(md, self.getConfigs()), 'fenced_code_block', 25
+        )
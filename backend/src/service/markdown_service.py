@@ -1,12 +1,20 @@
 """Markdown rendering service with XSS protection."""
 
 import markdown
-from markdown.extensions.codehilite import CodeHiliteExtension
-from markdown.extensions.fenced_code import FencedCodeExtension
 from markdown.extensions.tables import TableExtension
 from markdown.extensions.nl2br import Nl2BrExtension
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
 import bleach
-from typing import List
+import hashlib
+import os
+import re
+import threading
+from html import unescape
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+from src.service.markdown_highlight import CachedCodeHiliteExtension, CachedFencedCodeExtension
+from src.service.lru_cache import LRUCache
 
 # Allowed HTML tags after markdown rendering
 ALLOWED_TAGS = [
@@ -28,20 +36,107 @@ ALLOWED_ATTRIBUTES = {
 # Allowed URL protocols
 ALLOWED_PROTOCOLS = ['http', 'https', 'mailto']
 
+# Number of rendered blocks kept for incremental re-rendering
+BLOCK_CACHE_SIZE = int(os.getenv("MARKDOWN_BLOCK_CACHE_SIZE", "4096"))
+
+# Number of preview revisions whose blocks are kept for the next preview
+REVISION_CACHE_SIZE = int(os.getenv("MARKDOWN_REVISION_CACHE_SIZE", "256"))
+
+# Largest Markdown document accepted when saving or previewing a post (characters)
+MARKDOWN_MAX_CHARS = int(os.getenv("MARKDOWN_MAX_CHARS", "200000"))
+
+# Constructs whose meaning depends on the whole document (reference links,
+# footnotes, abbreviations, definition lists that merge with earlier ones) or
+# that may span blank lines (raw HTML blocks). Documents containing them are
+# always rendered in one pass.
+_DOCUMENT_SCOPED_RE = re.compile(r'^[ \t]*(\[[^\]\n]+\]:|\*\[|:[ \t])', re.MULTILINE)
+_RAW_HTML_RE = re.compile(r'<[A-Za-z/!?]')
+
+# Lines that cannot continue the previous top-level block after a blank line
+_HEADING_RE = re.compile(r'^#')
+_ORDERED_LIST_RE = re.compile(r'^\d+[.)]')
+_UNSAFE_BLOCK_START_CHARS = set('-*+>:|=_~`<{\\')
+
+# Paragraph appended to each block so the exact separator after the block's
+# last element is kept when the block is rendered on its own
+_BLOCK_SENTINEL = 'mdblocksentinel7f3a9c'
+_BLOCK_SENTINEL_HTML = '\n<p>%s</p>' % _BLOCK_SENTINEL
+
+# Allowed tag placed before non-leading blocks while sanitizing them
+_CONTEXT_PREFIX = '<br>'
+
+
+# Headings listed in the table of contents, and headings that start a section
+TOC_MAX_LEVEL = 3
+SECTION_MAX_LEVEL = 2
+
+_HEADING_TAGS = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+_VOID_TAGS = {'br', 'hr', 'img', 'wbr', 'input', 'meta', 'link', 'source', 'area', 'col'}
+
+
+class _OutlineParser(HTMLParser):
+    """Collect top-level headings and their character offsets in rendered HTML."""
+    
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=True)
+        self.headings: List[Tuple[int, int, str]] = []  # (offset, level, title)
+        self._line_starts = [0]
+        for match in re.finditer('\n', html):
+            self._line_starts.append(match.end())
+        self._depth = 0
+        self._heading: Optional[list] = None
+    
+    def handle_starttag(self, tag, attrs):
+        if self._depth == 0 and tag in _HEADING_TAGS:
+            line, column = self.getpos()
+            self._heading = [self._line_starts[line - 1] + column, _HEADING_TAGS[tag], '']
+        if tag not in _VOID_TAGS:
+            self._depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag in _VOID_TAGS:
+            return
+        self._depth = max(self._depth - 1, 0)
+        if self._depth == 0 and self._heading is not None:
+            offset, level, title = self._heading
+            self.headings.append((offset, level, ' '.join(title.split())))
+            self._heading = None
+    
+    def handle_data(self, data):
+        if self._heading is not None:
+            self._heading[2] += data
+
 
 class MarkdownService:
     """Service for rendering Markdown to HTML with XSS protection."""
     
     def __init__(self):
-        """Initialize Markdown processor with extensions."""
-        self.md = markdown.Markdown(
+        """Initialize the caches; Markdown processors are created per thread on first use."""
+        self._local = threading.local()
+        # Sanitized top-level blocks: {(sha256(block), leading): (html, trailing)}
+        self.block_cache = LRUCache(max_entries=BLOCK_CACHE_SIZE)
+        # Blocks of recent preview revisions: {revision: {block key: (html, trailing)}}
+        self.revision_cache = LRUCache(max_entries=REVISION_CACHE_SIZE)
+    
+    @property
+    def md(self) -> markdown.Markdown:
+        """Get this thread's Markdown processor (a processor is not thread-safe)."""
+        md = getattr(self._local, 'md', None)
+        if md is None:
+            md = self._local.md = self._create_markdown()
+        return md
+    
+    @staticmethod
+    def _create_markdown() -> markdown.Markdown:
+        """Create a Markdown processor with extensions."""
+        return markdown.Markdown(
             extensions=[
                 'extra',
                 'nl2br',
                 'sane_lists',
                 'pymdownx.emoji',
-                FencedCodeExtension(),
-                CodeHiliteExtension(css_class='highlight'),
+                CachedFencedCodeExtension(),
+                CachedCodeHiliteExtension(css_class='highlight'),
                 TableExtension(),
             ],
             extension_configs={
@@ -55,7 +150,90 @@ class MarkdownService:
     
     def render(self, markdown_text: str) -> str:
         """
-        Render Markdown to sanitized HTML.
+        Render Markdown to sanitized HTML, reusing cached top-level blocks.
+        
+        The document is split at top-level block boundaries (headings,
+        fenced code, paragraphs); only blocks not seen before are rendered
+        and sanitized. The output is identical to render_full().
+        
+        Args:
+            markdown_text: Raw Markdown text
+            
+        Returns:
+            Sanitized HTML string
+        """
+        html, _ = self._render_incremental(markdown_text)
+        return html
+    
+    def render_revision(
+        self,
+        markdown_text: str,
+        base_revision: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """
+        Render Markdown for an editor preview, tracking revisions.
+        
+        Blocks of the base revision are reused even if they have since been
+        evicted from the shared block cache.
+        
+        Args:
+            markdown_text: Raw Markdown text
+            base_revision: Revision returned by a previous call, if any
+            
+        Returns:
+            Tuple of (sanitized HTML, revision hash of this text)
+        """
+        revision = hashlib.sha256(markdown_text.encode('utf-8')).hexdigest()[:32]
+        pinned = self.revision_cache.get(base_revision) if base_revision else None
+        
+        html, used_blocks = self._render_incremental(markdown_text, pinned)
+        if used_blocks is not None:
+            self.revision_cache.set(revision, used_blocks)
+        return html, revision
+    
+    def _render_incremental(
+        self,
+        markdown_text: str,
+        pinned: Optional[dict] = None,
+    ) -> Tuple[str, Optional[dict]]:
+        """
+        Render block by block, preferring pinned blocks over the shared cache.
+        
+        Returns:
+            Tuple of (sanitized HTML, rendered blocks by cache key), with None
+            instead of blocks if the document was rendered whole
+        """
+        blocks = self.split_blocks(markdown_text)
+        if blocks is None:
+            return self.render_full(markdown_text), None
+        
+        used_blocks = {}
+        parts = []
+        trailing = ''
+        for block in blocks:
+            key = (hashlib.sha256(block.encode('utf-8')).hexdigest(), not parts)
+            rendered = pinned.get(key) if pinned else None
+            if rendered is None:
+                rendered = self._render_block(block, key)
+            if rendered is None:
+                return self.render_full(markdown_text), None
+            used_blocks[key] = rendered
+            
+            block_html, block_trailing = rendered
+            if not block_html and not block_trailing:
+                continue
+            # Top-level elements are separated by a newline after any
+            # whitespace the previous block ended with
+            if parts:
+                parts.append(trailing + '\n')
+            parts.append(block_html)
+            trailing = block_trailing
+        
+        return ''.join(parts), used_blocks
+    
+    def render_full(self, markdown_text: str) -> str:
+        """
+        Render a whole Markdown document to sanitized HTML in one pass.
         
         Args:
             markdown_text: Raw Markdown text
@@ -66,19 +244,189 @@ class MarkdownService:
         # Convert Markdown to HTML
         html = self.md.convert(markdown_text)
         
-        # Sanitize HTML to prevent XSS
-        clean_html = bleach.clean(
+        # Reset Markdown processor for next use
+        self.md.reset()
+        
+        return self._sanitize(html)
+    
+    def split_blocks(self, markdown_text: str) -> Optional[List[str]]:
+        """
+        Split Markdown into independently renderable top-level blocks.
+        
+        A new block starts only after a blank line, outside fenced code, at a
+        heading, a fenced code block or a plain paragraph line. Lines that may
+        continue an earlier construct (list items, quotes, indented content,
+        definitions, tables) stay with the previous block.
+        
+        Args:
+            markdown_text: Raw Markdown text
+            
+        Returns:
+            List of Markdown blocks, or None if the document must be rendered whole
+        """
+        text = self._normalize(markdown_text)
+        if not text.strip():
+            # Markdown renders a blank document as nothing, whatever its indentation
+            return []
+        if _DOCUMENT_SCOPED_RE.search(text):
+            return None
+        
+        # Character spans of fenced code, found exactly as the fenced_code
+        # preprocessor finds them
+        fence_spans = [
+            (match.start(), match.end())
+            for match in FencedBlockPreprocessor.FENCED_BLOCK_RE.finditer(text)
+        ]
+        
+        blocks = []
+        current: List[str] = []
+        position = 0
+        span_index = 0
+        previous_blank = False
+        for line in text.split('\n'):
+            line_start = position
+            position += len(line) + 1
+            
+            while span_index < len(fence_spans) and fence_spans[span_index][1] <= line_start:
+                span_index += 1
+            in_fence = (
+                span_index < len(fence_spans)
+                and fence_spans[span_index][0] <= line_start
+            )
+            fence_opens = in_fence and fence_spans[span_index][0] == line_start
+            
+            if in_fence and not fence_opens:
+                current.append(line)
+                previous_blank = False
+                continue
+            
+            if not line:
+                current.append(line)
+                previous_blank = True
+                continue
+            
+            if previous_blank and current and (fence_opens or self._starts_block(line)):
+                blocks.append('\n'.join(current).rstrip('\n'))
+                current = []
+            current.append(line)
+            previous_blank = False
+        
+        if current:
+            blocks.append('\n'.join(current).rstrip('\n'))
+        # Blank lines only separate blocks; dropping them keeps cache keys
+        # stable when neighbouring blocks are added or removed
+        blocks = [block for block in blocks if block]
+        
+        for block in blocks:
+            if _RAW_HTML_RE.search(self._strip_fences(block)):
+                return None
+        
+        return blocks
+    
+    def _render_block(self, block: str, key: Tuple[str, bool]) -> Optional[Tuple[str, str]]:
+        """
+        Render and sanitize one top-level block, using the block cache.
+        
+        Args:
+            block: Markdown of a single top-level block
+            key: Tuple of (block hash, whether it is the first block with output)
+        
+        Returns:
+            Tuple of (sanitized HTML, trailing whitespace of the raw HTML),
+            or None if the block cannot be rendered on its own
+        """
+        cached = self.block_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        html = self.md.convert(block + '\n\n' + _BLOCK_SENTINEL)
+        self.md.reset()
+        
+        # The sentinel must come back as its own trailing paragraph
+        if html.endswith(_BLOCK_SENTINEL_HTML):
+            html = html[:-len(_BLOCK_SENTINEL_HTML)]
+        elif html == _BLOCK_SENTINEL_HTML.lstrip('\n'):
+            html = ''
+        else:
+            return None
+        
+        # Whitespace after the last element only separates it from the next
+        # block; a full render strips it from the end of the document
+        core = html.rstrip()
+        if key[1]:
+            clean_html = self._sanitize(core)
+        else:
+            # Bleach turns a stripped block-level tag into a newline unless it
+            # is the first token, so sanitize the block behind a preceding tag
+            clean_html = self._sanitize(_CONTEXT_PREFIX + core)[len(_CONTEXT_PREFIX):]
+        rendered = (clean_html, html[len(core):])
+        self.block_cache.set(key, rendered)
+        return rendered
+    
+    @staticmethod
+    def _sanitize(html: str) -> str:
+        """Sanitize HTML to prevent XSS."""
+        return bleach.clean(
             html,
             tags=ALLOWED_TAGS,
             attributes=ALLOWED_ATTRIBUTES,
             protocols=ALLOWED_PROTOCOLS,
             strip=True,
         )
+    
+    def _normalize(self, markdown_text: str) -> str:
+        """Apply the same whitespace normalization as the Markdown processor."""
+        text = markdown_text.replace('\x02', '').replace('\x03', '')
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        text = text.expandtabs(self.md.tab_length)
+        return re.sub(r'(?<=\n) +\n', '\n', text + '\n')[:-1]
+    
+    @staticmethod
+    def _starts_block(line: str) -> bool:
+        """Check whether a line after a blank line always starts a new top-level block."""
+        if _HEADING_RE.match(line):
+            return True
+        if line[0] == ' ' or line[0] in _UNSAFE_BLOCK_START_CHARS:
+            return False
+        return not _ORDERED_LIST_RE.match(line)
+    
+    @staticmethod
+    def _strip_fences(block: str) -> str:
+        """Remove fenced code from a block (its content is escaped, not raw HTML)."""
+        return FencedBlockPreprocessor.FENCED_BLOCK_RE.sub('', block)
+    
+    @staticmethod
+    def build_outline(html: str) -> Tuple[List[dict], List[int]]:
+        """
+        Extract the table of contents and section boundaries from rendered HTML.
         
-        # Reset Markdown processor for next use
-        self.md.reset()
+        Each top-level heading of level SECTION_MAX_LEVEL or above starts a
+        new section; nested headings (in quotes or lists) are ignored.
+        
+        Args:
+            html: Rendered HTML of a post
+            
+        Returns:
+            Tuple of (TOC entries with level, title and section index,
+            character offsets where each section starts)
+        """
+        parser = _OutlineParser(html)
+        parser.feed(html)
+        parser.close()
+        
+        toc = []
+        section_offsets = [0]
+        for offset, level, title in parser.headings:
+            if level <= SECTION_MAX_LEVEL and offset > section_offsets[-1]:
+                section_offsets.append(offset)
+            if level <= TOC_MAX_LEVEL:
+                toc.append({
+                    'level': level,
+                    'title': title,
+                    'section': len(section_offsets) - 1,
+                })
         
-        return clean_html
+        return toc, section_offsets
     
     def generate_excerpt(self, markdown_text: str, max_length: int = 200) -> str:
         """
@@ -94,6 +442,23 @@ class MarkdownService:
         # Convert to HTML first
         html = self.md.convert(markdown_text)
         
+        # Reset Markdown processor
+        self.md.reset()
+        
+        return self.excerpt_from_html(html, max_length)
+    
+    @staticmethod
+    def excerpt_from_html(html: str, max_length: int = 200) -> str:
+        """
+        Generate a plain text excerpt from already rendered HTML.
+        
+        Args:
+            html: Rendered HTML
+            max_length: Maximum length of excerpt
+            
+        Returns:
+            Plain text excerpt
+        """
         # Strip all HTML tags
         plain_text = bleach.clean(html, tags=[], strip=True)
         
@@ -101,10 +466,12 @@ class MarkdownService:
         if len(plain_text) > max_length:
             plain_text = plain_text[:max_length].rsplit(' ', 1)[0] + '...'
         
-        # Reset Markdown processor
-        self.md.reset()
-        
         return plain_text.strip()
+    
+    @staticmethod
+    def html_to_text(html: str) -> str:
+        """Strip tags and entities from rendered HTML, leaving its plain text."""
+        return unescape(bleach.clean(html, tags=[], strip=True))
 
 
 # Singleton instance
@@ -0,0 +1,175 @@
+"""Per-client rate limiting with token buckets.
+
+Each rule gives every client a bucket holding up to `limit` tokens, refilled
+at `limit` per `period` seconds; a request spends one token or is refused
+with the time until the next one. Buckets live in one LRU bounded by
+RATE_LIMIT_MAX_CLIENTS, so memory stays fixed however many clients appear.
+Evicting the least recently seen bucket is nearly lossless: a bucket left
+alone for a full period is full again, the same as a new one.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import FrozenSet, Hashable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+# Buckets kept across all rules
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "100000"))
+# Rules as "METHODS PATH LIMIT/SECONDS KEY", separated by ";". KEY is "ip", or
+# "user" for the session's user id with the IP as fallback for anonymous calls.
+# Paths match their sub-paths too, so more specific rules come first.
+DEFAULT_RATE_LIMITS = (
+    "POST /api/auth/login 10/60 ip;"
+    "POST /api/auth/register 5/300 ip;"
+    "GET /api/search/suggest 600/60 user;"
+    "GET /api/search 60/60 user;"
+    "POST /api/reactions 60/60 user;"
+    "POST /api/comments 10/60 user;"
+    "POST,PUT,PATCH,DELETE /api/posts 60/60 user"
+)
+RATE_LIMITS = os.getenv("RATE_LIMITS", DEFAULT_RATE_LIMITS)
+
+KEY_TYPES = ("ip", "user")
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Limit on requests matching a method and path prefix."""
+    methods: FrozenSet[str]
+    path: str
+    limit: int
+    period: float
+    key: str
+    
+    def matches(self, method: str, path: str) -> bool:
+        """Whether a request falls under this rule."""
+        return method in self.methods and (
+            path == self.path or path.startswith(self.path.rstrip("/") + "/")
+        )
+
+
+def parse_rules(spec: str) -> List[RateLimitRule]:
+    """
+    Parse rules from their configuration string.
+    
+    Args:
+        spec: Rules such as "POST /api/auth/login 10/60 ip", separated by ";"
+    
+    Returns:
+        Rules in the given order
+    
+    Raises:
+        ValueError: If a rule is malformed
+    """
+    rules = []
+    for part in spec.split(";"):
+        if not part.strip():
+            continue
+        try:
+            methods, path, rate, key = part.split()
+            limit, period = rate.split("/")
+            rule = RateLimitRule(
+                methods=frozenset(method.upper() for method in methods.split(",")),
+                path=path,
+                limit=int(limit),
+                period=float(period),
+                key=key,
+            )
+        except ValueError:
+            raise ValueError(f"Malformed rate limit rule: {part.strip()!r}")
+        if rule.limit < 1 or rule.period <= 0 or rule.key not in KEY_TYPES:
+            raise ValueError(f"Invalid rate limit rule: {part.strip()!r}")
+        rules.append(rule)
+    return rules
+
+
+class RateLimitService:
+    """Service deciding whether a client may make another request."""
+    
+    def __init__(self, rules: List[RateLimitRule], max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        """
+        Initialize the service.
+        
+        Args:
+            rules: Limits to enforce; the first rule matching a request applies
+            max_clients: Buckets kept across all rules
+        """
+        self.rules = rules
+        self.max_clients = max_clients
+        # {(rule index, client key): [tokens, last refill time]}
+        self._buckets: OrderedDict[Tuple[int, Hashable], list] = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+    
+    def match(self, method: str, path: str) -> Optional[int]:
+        """Get the index of the rule applying to a request, or None."""
+        for index, rule in enumerate(self.rules):
+            if rule.matches(method, path):
+                return index
+        return None
+    
+    def acquire(self, rule_index: int, client: Hashable, now: Optional[float] = None) -> float:
+        """
+        Spend a token from a client's bucket.
+        
+        Args:
+            rule_index: Index of the matching rule
+            client: Client key, e.g. an IP address or user id
+            now: Current monotonic time (defaults to the clock)
+        
+        Returns:
+            0 if the request is allowed, else the seconds until it would be
+        """
+        rule = self.rules[rule_index]
+        rate = rule.limit / rule.period
+        now = time.monotonic() if now is None else now
+        key = (rule_index, client)
+        
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [float(rule.limit), now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(float(rule.limit), bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                self.allowed += 1
+                return 0.0
+            self.limited += 1
+            return (1 - bucket[0]) / rate
+    
+    @staticmethod
+    def retry_after(wait: float) -> str:
+        """Format a wait for the Retry-After header (whole seconds, at least 1)."""
+        return str(max(1, math.ceil(wait)))
+    
+    def stats(self) -> dict:
+        """Get rate limiting statistics (for monitoring)."""
+        return {
+            "rules": len(self.rules),
+            "clients": len(self._buckets),
+            "max_clients": self.max_clients,
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evictions": self.evictions,
+        }
+
+
+# Singleton instance
+rate_limit_service = RateLimitService(parse_rules(RATE_LIMITS) if RATE_LIMIT_ENABLED else [])
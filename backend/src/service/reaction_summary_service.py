@@ -0,0 +1,119 @@
+"""Cache of per-post reaction counts.
+
+Counts are loaded from the database on a miss and replaced with fresh counts
+by every toggle in this process. Toggles handled by other workers are picked
+up when the cached posts are periodically reconciled against the table.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+from src.domain.entities import ReactionType
+from src.service.lru_cache import LRUCache
+
+REACTION_CACHE_SIZE = int(os.getenv("REACTION_CACHE_SIZE", "10000"))
+# Seconds between reconciliations of cached counts against the table
+REACTION_RECONCILE_SECONDS = float(os.getenv("REACTION_RECONCILE_SECONDS", "60"))
+# Posts counted per reconciliation query
+RECONCILE_BATCH_SIZE = 500
+
+
+class ReactionSummaryService:
+    """Service caching reaction counts by post."""
+    
+    def __init__(self, max_entries: int = REACTION_CACHE_SIZE):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of posts whose counts are cached
+        """
+        self.cache = LRUCache(max_entries=max_entries)
+        self._version = 0
+        self._lock = threading.Lock()
+        self.corrections = 0
+    
+    @property
+    def version(self) -> int:
+        """Get the write counter; take it before counting reactions in the database."""
+        return self._version
+    
+    def get(self, post_id: int) -> Optional[Dict[ReactionType, int]]:
+        """Get a copy of a post's cached counts, or None."""
+        counts = self.cache.get(post_id)
+        return dict(counts) if counts is not None else None
+    
+    def get_many(self, post_ids: List[int]) -> Dict[int, Dict[ReactionType, int]]:
+        """Get the cached counts of those posts that are cached."""
+        found = {}
+        for post_id in post_ids:
+            counts = self.get(post_id)
+            if counts is not None:
+                found[post_id] = counts
+        return found
+    
+    def store(self, post_id: int, counts: Dict[ReactionType, int], version: int) -> None:
+        """
+        Cache counts read from the database on a miss.
+        
+        Args:
+            post_id: ID of the post
+            counts: Reaction counts by type
+            version: Value of version taken before counting; the counts are
+                dropped if a toggle happened since, as they may be stale
+        """
+        with self._lock:
+            if version == self._version:
+                self.cache.set(post_id, dict(counts))
+    
+    def update(self, post_id: int, counts: Dict[ReactionType, int]) -> None:
+        """Replace a post's counts with those computed by a toggle."""
+        with self._lock:
+            self._version += 1
+            self.cache.set(post_id, dict(counts))
+    
+    def snapshot(self) -> Dict[int, Dict[ReactionType, int]]:
+        """Get the cached counts of all posts, to be reconciled."""
+        return dict(self.cache.items())
+    
+    def reconcile(
+        self,
+        fresh_counts: Dict[int, Dict[ReactionType, int]],
+        snapshot: Dict[int, Dict[ReactionType, int]],
+    ) -> int:
+        """
+        Correct cached counts that differ from counts recounted from the table.
+        
+        Posts toggled in this process after the snapshot was taken are left
+        alone, as the recount may predate the toggle.
+        
+        Args:
+            fresh_counts: Recounted counts by post ID
+            snapshot: Result of snapshot() taken before recounting
+        
+        Returns:
+            Number of posts whose cached counts were corrected
+        """
+        corrected = 0
+        with self._lock:
+            for post_id, fresh in fresh_counts.items():
+                current = self.cache.peek(post_id)
+                if current is None or current is not snapshot.get(post_id):
+                    continue
+                if current != fresh:
+                    self.cache.set(post_id, dict(fresh))
+                    corrected += 1
+            self.corrections += corrected
+        return corrected
+    
+    def stats(self) -> dict:
+        """Get cache statistics (for monitoring)."""
+        return {
+            **self.cache.stats(),
+            "corrections": self.corrections,
+        }
+
+
+# Singleton instance
+reaction_summary_service = ReactionSummaryService()
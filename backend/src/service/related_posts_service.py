@@ -0,0 +1,96 @@
+"""Related posts: the most similar published posts of each post, precomputed.
+
+Similarity is the cosine of TF-IDF vectors, computed by the search index.
+Lists are stored per post, so reading them costs one query. When a post is
+published or edited, only its own list and the lists it enters or leaves are
+recomputed.
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+from src.service.search_index_service import SearchIndexService, search_index_service
+
+# Related posts stored per post
+RELATED_POSTS_LIMIT = int(os.getenv("RELATED_POSTS_LIMIT", "5"))
+# A changed post is offered to the lists of its this-many-times-limit most
+# similar posts; similarity is symmetric, so those are the lists it can enter
+CANDIDATE_FACTOR = 4
+
+
+class RelatedPostsService:
+    """Service computing related post lists and merging changes into them."""
+    
+    def __init__(self, index: SearchIndexService, limit: int = RELATED_POSTS_LIMIT):
+        """
+        Initialize the service.
+        
+        Args:
+            index: Search index holding the TF-IDF statistics
+            limit: Related posts stored per post
+        """
+        self.index = index
+        self.limit = limit
+        self.computations = 0
+        self.merges = 0
+    
+    @property
+    def available(self) -> bool:
+        """Whether the index holds every published post, so lists can be computed."""
+        return self.index.enabled and self.index.ready
+    
+    def neighbours(self, post_id: int) -> List[Tuple[int, float]]:
+        """Compute a post's related posts as (post_id, similarity), most similar first."""
+        self.computations += 1
+        return self.index.similar(post_id, self.limit)
+    
+    def candidates(self, post_id: int) -> List[Tuple[int, float]]:
+        """Compute the posts whose lists a changed post may enter, most similar first."""
+        self.computations += 1
+        return self.index.similar(post_id, self.limit * CANDIDATE_FACTOR)
+    
+    def merge(
+        self,
+        related: List[Tuple[int, float]],
+        post_id: int,
+        similarity: Optional[float],
+    ) -> Optional[List[Tuple[int, float]]]:
+        """
+        Update another post's list for a changed post.
+        
+        Args:
+            related: The other post's current list
+            post_id: ID of the changed post
+            similarity: Its new similarity to the other post, or None if it is
+                not among the candidates any more
+        
+        Returns:
+            The updated list, or None if it has to be recomputed: the list lost
+            an entry, or one of its entries scored lower in a full list, where
+            a post outside the list may now rank above it
+        """
+        self.merges += 1
+        previous = dict(related).get(post_id)
+        if previous is not None and len(related) >= self.limit:
+            if similarity is None or similarity < previous:
+                return None
+        merged = [(other_id, score) for other_id, score in related if other_id != post_id]
+        if similarity is not None:
+            merged.append((post_id, similarity))
+        merged.sort(key=lambda item: (-item[1], item[0]))
+        if len(merged) < min(len(related), self.limit):
+            return None
+        return merged[:self.limit]
+    
+    def stats(self) -> dict:
+        """Get related posts statistics (for monitoring)."""
+        return {
+            "available": self.available,
+            "limit": self.limit,
+            "computations": self.computations,
+            "merges": self.merges,
+        }
+
+
+# Singleton instance
+related_posts_service = RelatedPostsService(search_index_service)
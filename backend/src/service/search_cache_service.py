@@ -0,0 +1,62 @@
+"""Cache of search results, keyed by the generation of the data they were computed from."""
+
+import os
+from typing import Any, Hashable, Tuple
+
+from src.service.lru_cache import LRUCache
+
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "60"))
+
+
+class SearchCacheService:
+    """Service caching search results per normalised query and data generation."""
+    
+    def __init__(self, max_entries: int = SEARCH_CACHE_SIZE, ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached result sets
+            ttl_seconds: Lifetime of a result set (bounds staleness of counts
+                such as comments and reactions, which do not change the generation)
+        """
+        self.cache = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    
+    def key(self, generation: Hashable, query: str, *params: Hashable) -> Tuple[Hashable, ...]:
+        """
+        Build the cache key for a search.
+        
+        The generation identifies the data searched, e.g. the search index
+        generation or the database search generation shared by all workers;
+        it changes with every committed post write. Read it before running
+        the search, so results computed across a write are stored under the
+        old generation and never served. Entries of older generations can no
+        longer be looked up and age out of the LRU.
+        
+        Args:
+            generation: Generation of the data searched
+            query: Search query (case and whitespace are normalised)
+            params: Other search parameters, e.g. the limit
+            
+        Returns:
+            Cache key
+        """
+        normalized = " ".join(query.lower().split())
+        return (generation, normalized, *params)
+    
+    def get(self, key: Tuple[Hashable, ...]) -> Any:
+        """Get cached results for a key, or None."""
+        return self.cache.get(key)
+    
+    def set(self, key: Tuple[Hashable, ...], results: Any) -> None:
+        """Store results under a key."""
+        self.cache.set(key, results)
+    
+    def stats(self) -> dict:
+        """Get cache statistics (for monitoring)."""
+        return self.cache.stats()
+
+
+# Singleton instance
+search_cache_service = SearchCacheService()
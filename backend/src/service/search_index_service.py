@@ -0,0 +1,1294 @@
+"""In-process inverted index over published posts with BM25 ranking.
+
+The index has two tiers: an optional immutable segment loaded from disk with
+mmap (see search_segment), and an in-memory overlay holding posts written
+since (see search_overlay). Replaced or deleted segment documents are masked out. Writes are
+appended to a delta log that every worker replays, and save() folds the
+overlay into a new segment.
+"""
+
+import heapq
+import logging
+import math
+import os
+import re
+import uuid
+from datetime import datetime, timezone
+from html import escape
+from typing import Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+
+from src.domain.entities import Category, Post, PostStatus, SearchFilters, SearchHit
+from src.service.markdown_service import markdown_service
+from src.service.search_overlay import COMPACTION_MIN_DEAD, Overlay
+from src.service.search_segment import (
+    NO_DATE,
+    POSTINGS_BLOCK_SIZE,
+    DeltaLog,
+    SearchSegment,
+    decode_stored,
+    encode_stored,
+    write_segment,
+)
+
+logger = logging.getLogger(__name__)
+
+# "index" ranks searches with this in-process index; "database" leaves them to
+# the database (MySQL FULLTEXT, LIKE on other dialects)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "index")
+# Segment file shared by workers (empty keeps the index in memory only);
+# the delta log lives next to it
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "")
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+# A title occurrence counts as this many body occurrences
+TITLE_WEIGHT = 3.0
+
+# Snippet length in characters, and how much of it precedes the first match
+SNIPPET_LENGTH = 160
+SNIPPET_CONTEXT = 40
+
+# Shorter query terms are never spell-corrected
+MIN_CORRECTION_LENGTH = 4
+_CORRECTION_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+# Facet values returned per field, most matches first
+MAX_FACETS = 20
+
+# Similar documents are found through this many of a document's highest
+# weighted terms (its full vector still sets the cosine norm)
+MAX_SIMILARITY_TERMS = 50
+# Terms with a lower IDF (in more than about 80% of the documents) barely
+# separate documents but have the longest postings, so similar() skips them
+MIN_SIMILARITY_IDF = 0.2
+# Postings folded into the segment TF-IDF norms per NumPy pass
+_NORM_CHUNK = 1 << 21
+
+# Blocks of postings search() reads as up to this many slices before
+# gathering their postings instead
+MAX_SLICED_RUNS = 8
+
+# Overlay TF-IDF vector lengths are recomputed once the document count drifts this much
+NORM_DRIFT_TOLERANCE = 0.05
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+# Words too common to help ranking; skipping them keeps postings short
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have he i in is it its of on or
+    that the this to was were will with you your we our they their not
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping stop words."""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def build_snippet(text: str, terms: Set[str], length: int = SNIPPET_LENGTH) -> str:
+    """
+    Cut the passage of text with the most query term occurrences.
+    
+    Args:
+        text: Plain text of the post body
+        terms: Lowercase query terms
+        length: Snippet length in characters
+        
+    Returns:
+        HTML-escaped snippet with matched terms wrapped in <mark>
+    """
+    matches = [
+        (match.start(), match.end())
+        for match in _TOKEN_RE.finditer(text)
+        if match.group().lower() in terms
+    ]
+    
+    # Start at the match beginning the window of `length` with the most matches
+    start = 0
+    if matches:
+        best_count = 0
+        right = 0
+        for left, (match_start, _) in enumerate(matches):
+            while right < len(matches) and matches[right][1] <= match_start + length:
+                right += 1
+            if right - left > best_count:
+                best_count = right - left
+                start = match_start
+        start = max(0, start - SNIPPET_CONTEXT)
+    
+    # Cut on whitespace so words are not split
+    if start > 0:
+        space = _SPACE_RE.search(text, start, start + SNIPPET_CONTEXT)
+        start = space.end() if space else start
+    end = min(len(text), start + length)
+    if end < len(text):
+        space = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+        end = space if space > start else end
+    
+    pieces = ["…"] if start > 0 else []
+    position = start
+    for match_start, match_end in matches:
+        if match_start < start or match_end > end:
+            continue
+        pieces.append(escape(text[position:match_start]))
+        pieces.append(f"<mark>{escape(text[match_start:match_end])}</mark>")
+        position = match_end
+    pieces.append(escape(text[position:end]))
+    if end < len(text):
+        pieces.append("…")
+    
+    return _SPACE_RE.sub(" ", "".join(pieces)).strip()
+
+
+def timestamp(value: Optional[datetime]) -> int:
+    """Epoch seconds of a naive UTC or aware datetime (NO_DATE for None)."""
+    if value is None:
+        return NO_DATE
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def top_facets(counts: Dict[int, int]) -> List[Tuple[int, int]]:
+    """The MAX_FACETS (value, count) pairs with the most matches."""
+    return heapq.nsmallest(MAX_FACETS, counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+def edits1(term: str) -> Set[str]:
+    """
+    All strings one deletion, transposition, substitution or insertion away.
+    
+    The count grows with the term length only (about 74 per character), not
+    with the vocabulary, which bounds the cost of a correction.
+    """
+    alphabet = set(_CORRECTION_ALPHABET).union(term)
+    splits = [(term[:i], term[i:]) for i in range(len(term) + 1)]
+    deletes = {left + right[1:] for left, right in splits if right}
+    transposes = {left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1}
+    replaces = {left + char + right[1:] for left, right in splits if right for char in alphabet}
+    inserts = {left + char + right for left, right in splits for char in alphabet}
+    return (deletes | transposes | replaces | inserts) - {term}
+
+
+def suggest_correction(query: str, frequency: Callable[[str], int]) -> Optional[str]:
+    """
+    Correct query terms that are not in the vocabulary.
+    
+    Args:
+        query: Free-text query
+        frequency: Number of documents (or uses) of a term; 0 if unknown
+        
+    Returns:
+        The query with each unknown term replaced by its most frequent
+        neighbour, or None if nothing was corrected
+    """
+    terms = tokenize(query)
+    corrected = []
+    for term in terms:
+        if len(term) < MIN_CORRECTION_LENGTH or frequency(term):
+            corrected.append(term)
+            continue
+        candidates = [(frequency(candidate), candidate) for candidate in edits1(term)]
+        best_frequency, best = max(candidates, key=lambda item: (item[0], item[1]))
+        corrected.append(best if best_frequency else term)
+    
+    if corrected == terms:
+        return None
+    return " ".join(corrected)
+
+
+class _TermPostings(NamedTuple):
+    """Postings of a query term in one tier, whose documents are numbered from offset."""
+    offset: int
+    # BM25 length normalisation of every document of the tier
+    norms: np.ndarray
+    docs: np.ndarray
+    term_frequencies: np.ndarray
+    block_max_tfs: np.ndarray
+    block_min_lengths: np.ndarray
+
+
+class SearchIndexService:
+    """Service maintaining a tokenized inverted index of published posts."""
+    
+    def __init__(
+        self,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        title_weight: float = TITLE_WEIGHT,
+        enabled: bool = True,
+        path: str = "",
+    ):
+        """
+        Initialize an empty index; it is filled at startup and by post writes.
+        
+        Args:
+            k1: BM25 term frequency saturation
+            b: BM25 length normalisation
+            title_weight: Weight of a title occurrence relative to a body occurrence
+            enabled: Whether posts are indexed at all
+            path: Segment file path (empty keeps the index in memory only)
+        """
+        self.enabled = enabled
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self.path = path
+        self._delta_log = DeltaLog(f"{path}.delta") if path else None
+        
+        self._overlay = Overlay()
+        # {post_id: compressed stored fields} of overlay documents, so hits
+        # are served without the database
+        self._stored: Dict[int, bytes] = {}
+        # {category_id: category}, shared by the stored posts
+        self._categories: Dict[int, Category] = {}
+        
+        # Segment: documents still current are flagged in _live
+        self._segment: Optional[SearchSegment] = None
+        self._live: Optional[np.ndarray] = None
+        self._segment_live_count = 0
+        self._segment_live_length = 0.0
+        # Segment terms as a set, built on the first spelling correction
+        self._segment_terms: Optional[FrozenSet[str]] = None
+        # TF-IDF vector lengths for similar(), computed in one pass on first
+        # use: segment ones kept with their segment, overlay ones per slot
+        # with the overlay and document count they were computed for (plus
+        # {slot: length} of documents added since)
+        self._segment_vector_norms: Optional[Tuple[SearchSegment, np.ndarray]] = None
+        self._vector_norms: Optional[Tuple[Overlay, int, np.ndarray, Dict[int, float]]] = None
+        # Postings search() has scored, to monitor how many pruning skips
+        self.postings_scored = 0
+        
+        # Changes replayed from other workers, until sync() hands them out
+        self._remote_changes: List[Tuple[int, Optional[Post]]] = []
+        self._reloaded = False
+        # Documents added or removed in this process, local or replayed
+        self._changes = 0
+        # Set once the index holds every published post
+        self.ready = False
+    
+    @property
+    def generation(self) -> Tuple[str, int, int]:
+        """
+        Identify the indexed content, to key results computed from it.
+        
+        With a shared segment this includes its snapshot and how far the
+        delta log has been applied, so every worker's writes move it once
+        synced; the count of changes applied covers in-memory only indexes.
+        """
+        snapshot_id = self._segment.snapshot_id if self._segment is not None else ""
+        offset = self._delta_log.offset if self._delta_log is not None else 0
+        return snapshot_id, offset, self._changes
+    
+    def index_post(self, post: Post) -> None:
+        """Add or replace a published post in the index."""
+        if not self.enabled:
+            return
+        fields = {
+            "title": post.title,
+            "slug": post.slug,
+            "excerpt": post.excerpt,
+            "author_id": post.author_id,
+            "published_at": post.published_at.isoformat() if post.published_at else None,
+            "category_ids": [category.id for category in post.categories],
+            "text": markdown_service.html_to_text(post.content_html),
+        }
+        categories = [
+            {"id": category.id, "name": category.name, "slug": category.slug}
+            for category in post.categories
+        ]
+        self._apply_index(post.id, fields, categories)
+        self._log({"op": "index", "id": post.id, "fields": fields, "categories": categories})
+    
+    def unindex_post(self, post_id: int) -> None:
+        """Remove a post that was deleted or unpublished."""
+        if not self.enabled:
+            return
+        if self.remove_document(post_id):
+            self._log({"op": "remove", "id": post_id})
+    
+    def _apply_index(self, post_id: int, fields: dict, categories: List[dict]) -> None:
+        """Index a post's fields and keep them for presenting hits."""
+        published_at = fields["published_at"]
+        facets = (
+            fields["author_id"],
+            timestamp(datetime.fromisoformat(published_at) if published_at else None),
+            tuple(fields["category_ids"]),
+        )
+        self.add_document(post_id, fields["title"], fields["text"], facets)
+        for category in categories:
+            self._categories[category["id"]] = Category(**category)
+        self._stored[post_id] = encode_stored(fields)
+    
+    def add_document(
+        self,
+        post_id: int,
+        title: str,
+        body: str,
+        facets: Optional[Tuple[int, int, Tuple[int, ...]]] = None,
+    ) -> None:
+        """
+        Add or replace a document.
+        
+        Args:
+            post_id: ID of the post
+            title: Post title (weighted by title_weight)
+            body: Plain text of the post body
+            facets: (author ID, published epoch seconds, category IDs), for
+                filters and facets; a document without them matches no filter
+        """
+        self.remove_document(post_id)
+        self._changes += 1
+        
+        frequencies, length = self._term_frequencies(title, body)
+        self._overlay.add(post_id, frequencies, length, facets)
+    
+    def _term_frequencies(self, title: str, body: str) -> Tuple[Dict[str, float], float]:
+        """Get a document's weighted term frequencies and weighted length."""
+        frequencies: Dict[str, float] = {}
+        title_tokens = tokenize(title)
+        body_tokens = tokenize(body)
+        for token in title_tokens:
+            frequencies[token] = frequencies.get(token, 0.0) + self.title_weight
+        for token in body_tokens:
+            frequencies[token] = frequencies.get(token, 0.0) + 1.0
+        return frequencies, self.title_weight * len(title_tokens) + len(body_tokens)
+    
+    def remove_document(self, post_id: int) -> bool:
+        """Remove a document. Returns True if it was indexed."""
+        self._changes += 1
+        removed = False
+        if self._segment is not None:
+            index = self._segment.doc_index(post_id)
+            if index is not None and self._live[index]:
+                self._live[index] = False
+                self._segment_live_count -= 1
+                self._segment_live_length -= float(self._segment.doc_lengths[index])
+                removed = True
+        
+        overlay = self._overlay
+        if not overlay.remove(post_id):
+            return removed
+        
+        self._stored.pop(post_id, None)
+        if overlay.size - overlay.count > max(COMPACTION_MIN_DEAD, overlay.count):
+            self._overlay = overlay.compacted()
+        return True
+    
+    def clear(self) -> None:
+        """Remove all documents."""
+        self._changes += 1
+        self._clear_overlay()
+        self._categories.clear()
+        # The mapping is released once no array views it any more
+        self._segment = None
+        self._segment_terms = None
+        self._segment_vector_norms = None
+        self._live = None
+        self._segment_live_count = 0
+        self._segment_live_length = 0.0
+        self.ready = False
+    
+    def _clear_overlay(self) -> None:
+        """Remove the in-memory documents."""
+        self._overlay = Overlay()
+        self._stored.clear()
+        self._vector_norms = None
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filters: Optional[SearchFilters] = None,
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        Rank documents against a query with BM25.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            offset: Number of top results to skip
+            filters: Restrictions on the documents that may match
+            
+        Returns:
+            Tuple of (list of (post_id, score) best first, number of matching documents)
+        """
+        ranked, total, _ = self._search(query, limit, offset, filters, with_facets=False)
+        return ranked, total
+    
+    def faceted_search(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filters: Optional[SearchFilters] = None,
+    ) -> Tuple[List[Tuple[int, float]], int, dict]:
+        """
+        Rank documents like search() and count the matches per category and author.
+        
+        Counts cover every matching document (after filters), not just the
+        returned page.
+        
+        Returns:
+            Tuple of (ranked documents, number of matching documents, facets as
+            {"categories": [(category, count)], "authors": [(author_id, count)]})
+        """
+        ranked, total, (category_counts, author_counts) = self._search(
+            query, limit, offset, filters, with_facets=True
+        )
+        facets = {
+            "categories": [
+                (self._categories[category_id], count)
+                for category_id, count in top_facets(category_counts)
+                if category_id in self._categories
+            ],
+            "authors": top_facets(author_counts),
+        }
+        return ranked, total, facets
+    
+    def _search(
+        self,
+        query: str,
+        limit: int,
+        offset: int,
+        filters: Optional[SearchFilters],
+        with_facets: bool,
+    ) -> Tuple[List[Tuple[int, float]], int, Tuple[Dict[int, int], Dict[int, int]]]:
+        """Rank documents and optionally count matches per category and author."""
+        category_counts: Dict[int, int] = {}
+        author_counts: Dict[int, int] = {}
+        facets = (category_counts, author_counts)
+        segment, live, overlay = self._segment, self._live, self._overlay
+        document_count = overlay.count + self._segment_live_count
+        if not document_count:
+            return [], 0, facets
+        average_length = (overlay.total_length + self._segment_live_length) / document_count or 1.0
+        depth = offset + limit
+        if filters is not None and filters.is_empty():
+            filters = None
+        
+        # Both tiers are scored as one document space: segment document
+        # indexes, then overlay slots from base
+        base = segment.doc_count if segment is not None else 0
+        size = overlay.size
+        allowed = np.empty(base + size, dtype=bool)
+        if segment is not None:
+            allowed[:base] = live if filters is None else live & self._segment_filter(filters)
+        allowed[base:] = overlay.live[:size] if filters is None else self._overlay_filter(overlay, size, filters)
+        segment_norms = overlay_norms = None
+        
+        terms: List[Tuple[float, List[_TermPostings]]] = []
+        for term in set(tokenize(query)):
+            parts = []
+            frequency = 0
+            segment_postings = segment.postings(term) if segment is not None else None
+            if segment_postings is not None:
+                docs, term_frequencies = segment_postings
+                frequency += int(np.count_nonzero(live[docs]))
+                if segment_norms is None:
+                    segment_norms = self._norms(segment.doc_lengths, average_length)
+                parts.append(_TermPostings(
+                    0, segment_norms, docs, term_frequencies,
+                    *segment.block_bounds(term, docs, term_frequencies),
+                ))
+            overlay_postings = overlay.postings.get(term)
+            if overlay_postings is not None:
+                frequency += overlay_postings.count
+                if overlay_norms is None:
+                    overlay_norms = self._norms(overlay.lengths[:size], average_length)
+                parts.append(_TermPostings(base, overlay_norms, *overlay_postings.arrays()))
+            
+            if not frequency:
+                continue
+            # Filters narrow the matches, not the collection statistics
+            idf = math.log(1.0 + (document_count - frequency + 0.5) / (frequency + 0.5))
+            terms.append((idf * (self.k1 + 1.0), parts))
+        
+        docs = scores = is_match = None
+        if terms and depth:
+            docs, scores, is_match = self._top_documents(terms, allowed, average_length, depth)
+        if is_match is None:
+            # Every allowed document containing a query term matches
+            is_match = np.zeros(base + size, dtype=bool)
+            for _, parts in terms:
+                for part in parts:
+                    is_match[part.docs + part.offset if part.offset else part.docs] = True
+            is_match &= allowed
+        total = int(np.count_nonzero(is_match))
+        if with_facets and total:
+            if segment is not None:
+                self._count_segment_facets(is_match[:base], category_counts, author_counts)
+            self._count_overlay_facets(overlay, is_match[base:], category_counts, author_counts)
+        if docs is None or not len(docs):
+            return [], total, facets
+        
+        if len(docs) > depth:
+            # Keep every tie of the last place for the post ID tie-break
+            last = np.partition(scores, len(scores) - depth)[len(scores) - depth]
+            docs, scores = docs[scores >= last], scores[scores >= last]
+        post_ids = np.empty(len(docs), dtype=np.int64)
+        in_segment = docs < base
+        if segment is not None:
+            post_ids[in_segment] = segment.doc_ids[docs[in_segment]]
+        post_ids[~in_segment] = overlay.ids[docs[~in_segment] - base]
+        ranked = heapq.nlargest(
+            depth,
+            zip(post_ids.tolist(), scores.tolist()),
+            key=lambda item: (item[1], item[0]),
+        )
+        return ranked[offset:], total, facets
+    
+    def _top_documents(
+        self,
+        terms: List[Tuple[float, List[_TermPostings]]],
+        allowed: np.ndarray,
+        average_length: float,
+        depth: int,
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        """
+        Find the best scoring documents with block-max pruning.
+        
+        A block of postings cannot score more than its highest term
+        frequency would in its shortest document. Each term's blocks with the
+        highest bounds are scored first, so the depth-th best score so far is
+        a threshold every result reaches. A block is then skipped when its
+        bound plus the other terms' bounds falls short of the threshold.
+        Candidates whose score plus the skipped bounds could still reach the
+        threshold get the postings of skipped blocks added, found by binary
+        search, so the results are those of scoring every posting.
+        
+        Args:
+            terms: (idf * (k1 + 1), postings per tier) per query term
+            allowed: Flags of the documents that may match
+            average_length: Average document length across both tiers
+            depth: Number of top documents needed
+            
+        Returns:
+            Tuple of (documents including the depth best, their exact scores,
+            flags of every matching document if no posting was skipped)
+        """
+        scores = np.zeros(len(allowed), dtype=np.float32)
+        if allowed.all():
+            allowed = None
+        # Per term: (postings, score bound per block, flags of scored blocks) per tier
+        blocks = []
+        for scale, parts in terms:
+            term_blocks = []
+            for part in parts:
+                max_tfs = part.block_max_tfs.astype(np.float64)
+                min_lengths = part.block_min_lengths.astype(np.float64)
+                bounds = scale * max_tfs / (max_tfs + self._norms(min_lengths, average_length))
+                # Slack for the rounding of float32 scores
+                bounds *= 1.0 + 1e-5
+                term_blocks.append((part, bounds, np.zeros(len(bounds), dtype=bool)))
+            blocks.append(term_blocks)
+        term_bounds = [max(float(bounds.max()) for _, bounds, _ in term_blocks) for term_blocks in blocks]
+        
+        # Terms with the highest bounds first, as they raise the threshold most
+        order = sorted(range(len(terms)), key=lambda index: -term_bounds[index])
+        first_blocks = depth // POSTINGS_BLOCK_SIZE + 1
+        for index in order:
+            term_blocks = blocks[index]
+            bounds = np.concatenate([bounds for _, bounds, _ in term_blocks])
+            best = np.argsort(-bounds, kind='stable')[:first_blocks]
+            start = 0
+            for part, part_bounds, scored in term_blocks:
+                chosen = best[(best >= start) & (best < start + len(part_bounds))] - start
+                self._score_blocks(terms[index][0], part, chosen, scored, scores, allowed)
+                start += len(part_bounds)
+        
+        bound_total = sum(term_bounds)
+        threshold = self._threshold(scores, depth)
+        for index in order:
+            others = bound_total - term_bounds[index]
+            for part, bounds, scored in blocks[index]:
+                needed = np.flatnonzero(~scored & (bounds + others >= threshold))
+                self._score_blocks(terms[index][0], part, needed, scored, scores, allowed)
+        
+        # Most that skipped postings can add to any document
+        skipped = sum(
+            max((float(bounds[~scored].max()) for _, bounds, scored in term_blocks if not scored.all()), default=0.0)
+            for term_blocks in blocks
+        )
+        if not skipped:
+            is_match = scores > 0
+            candidates = np.flatnonzero(is_match)
+            return candidates, scores[candidates], is_match
+        
+        candidates = np.flatnonzero(scores)
+        candidates = candidates[scores[candidates] + skipped >= self._threshold(scores, depth)]
+        for (scale, _), term_blocks in zip(terms, blocks):
+            for part, _, scored in term_blocks:
+                if scored.all():
+                    continue
+                in_tier = (candidates >= part.offset) & (candidates < part.offset + len(part.norms))
+                docs = candidates[in_tier] - part.offset
+                positions = np.searchsorted(part.docs, docs)
+                found = np.flatnonzero(positions < len(part.docs))
+                found = found[part.docs[positions[found]] == docs[found]]
+                found = found[~scored[positions[found] // POSTINGS_BLOCK_SIZE]]
+                self._score_postings(scale, part, positions[found], scores, None)
+        return candidates, scores[candidates], None
+    
+    def _score_blocks(
+        self,
+        scale: float,
+        part: _TermPostings,
+        blocks: np.ndarray,
+        scored: np.ndarray,
+        scores: np.ndarray,
+        allowed: Optional[np.ndarray],
+    ) -> None:
+        """Add a term's BM25 scores from the postings of some of its blocks, once each."""
+        blocks = blocks[~scored[blocks]]
+        if not len(blocks):
+            return
+        scored[blocks] = True
+        
+        # Runs of consecutive blocks are read as slices, without gathering
+        breaks = np.flatnonzero(np.diff(blocks) != 1) + 1
+        if len(breaks) < MAX_SLICED_RUNS:
+            firsts = blocks[np.concatenate(([0], breaks))]
+            lasts = blocks[np.concatenate((breaks - 1, [len(blocks) - 1]))]
+            for first, last in zip(firsts.tolist(), lasts.tolist()):
+                positions = slice(first * POSTINGS_BLOCK_SIZE, (last + 1) * POSTINGS_BLOCK_SIZE)
+                self._score_postings(scale, part, positions, scores, allowed)
+            return
+        positions = (blocks[:, None] * POSTINGS_BLOCK_SIZE + np.arange(POSTINGS_BLOCK_SIZE)).ravel()
+        positions = positions[positions < len(part.docs)]
+        self._score_postings(scale, part, positions, scores, allowed)
+    
+    def _score_postings(
+        self,
+        scale: float,
+        part: _TermPostings,
+        positions,
+        scores: np.ndarray,
+        allowed: Optional[np.ndarray],
+    ) -> None:
+        """Add a term's BM25 scores from some of its postings (a slice or indexes) to allowed documents."""
+        # Indexing converts uint32 indexes on every use, so convert them once
+        docs = part.docs[positions].astype(np.intp)
+        term_frequencies = part.term_frequencies[positions]
+        self.postings_scored += len(docs)
+        if allowed is not None:
+            current = allowed[docs + part.offset if part.offset else docs]
+            docs, term_frequencies = docs[current], term_frequencies[current]
+        scores[docs + part.offset if part.offset else docs] += scale * term_frequencies / (
+            term_frequencies + part.norms[docs]
+        )
+    
+    def _norms(self, lengths: np.ndarray, average_length: float) -> np.ndarray:
+        """BM25 length normalisation of documents, in the precision of their lengths."""
+        return self.k1 * (1.0 - self.b + self.b * lengths / average_length)
+    
+    @staticmethod
+    def _threshold(scores: np.ndarray, depth: int) -> float:
+        """The depth-th best score so far (0 while fewer documents have one)."""
+        scored = scores[scores > 0]
+        if len(scored) < depth:
+            return 0.0
+        return float(np.partition(scored, len(scored) - depth)[len(scored) - depth])
+    
+    def _segment_filter(self, filters: SearchFilters) -> np.ndarray:
+        """Flag the segment documents the filters allow."""
+        segment = self._segment
+        allowed = np.ones(segment.doc_count, dtype=bool)
+        if filters.category_id is not None:
+            allowed[:] = False
+            allowed[segment.category_postings(filters.category_id)] = True
+        if filters.author_id is not None:
+            allowed &= segment.doc_authors == filters.author_id
+        if filters.published_from is not None:
+            allowed &= segment.doc_published >= timestamp(filters.published_from)
+        if filters.published_to is not None:
+            allowed &= segment.doc_published != NO_DATE
+            allowed &= segment.doc_published <= timestamp(filters.published_to)
+        return allowed
+    
+    @staticmethod
+    def _overlay_filter(overlay: Overlay, size: int, filters: SearchFilters) -> np.ndarray:
+        """Flag the live overlay slots below size that the filters allow."""
+        # Documents indexed without facets (author -1) match no filter
+        allowed = overlay.live[:size] & (overlay.authors[:size] >= 0)
+        if filters.category_id is not None:
+            in_category = np.zeros(size, dtype=bool)
+            category_slots = overlay.category_slots.get(filters.category_id)
+            if category_slots is not None:
+                slots = category_slots.view()
+                in_category[slots[slots < size]] = True
+            allowed &= in_category
+        if filters.author_id is not None:
+            allowed &= overlay.authors[:size] == filters.author_id
+        if filters.published_from is not None:
+            allowed &= overlay.published[:size] >= timestamp(filters.published_from)
+        if filters.published_to is not None:
+            allowed &= overlay.published[:size] != NO_DATE
+            allowed &= overlay.published[:size] <= timestamp(filters.published_to)
+        return allowed
+    
+    def _count_segment_facets(
+        self,
+        is_match: np.ndarray,
+        category_counts: Dict[int, int],
+        author_counts: Dict[int, int],
+    ) -> None:
+        """Add the categories and authors of matching segment documents to the counts."""
+        segment = self._segment
+        authors, counts = np.unique(segment.doc_authors[is_match], return_counts=True)
+        for author_id, count in zip(authors.tolist(), counts.tolist()):
+            author_counts[author_id] = author_counts.get(author_id, 0) + count
+        
+        # Intersect each category's postings with the bitset of matches
+        for category_id, docs in segment.iter_category_postings():
+            count = int(np.count_nonzero(is_match[docs]))
+            if count:
+                category_counts[category_id] = category_counts.get(category_id, 0) + count
+    
+    @staticmethod
+    def _count_overlay_facets(
+        overlay: Overlay,
+        is_match: np.ndarray,
+        category_counts: Dict[int, int],
+        author_counts: Dict[int, int],
+    ) -> None:
+        """Add the categories and authors of matching overlay documents to the counts."""
+        authors, counts = np.unique(overlay.authors[:len(is_match)][is_match], return_counts=True)
+        for author_id, count in zip(authors.tolist(), counts.tolist()):
+            if author_id >= 0:
+                author_counts[author_id] = author_counts.get(author_id, 0) + count
+        
+        for category_id, category_slots in list(overlay.category_slots.items()):
+            slots = category_slots.view()
+            count = int(np.count_nonzero(is_match[slots[slots < len(is_match)]]))
+            if count:
+                category_counts[category_id] = category_counts.get(category_id, 0) + count
+    
+    def document_frequency(self, term: str) -> int:
+        """Get the number of documents containing a term (0 if unknown)."""
+        overlay_postings = self._overlay.postings.get(term)
+        frequency = overlay_postings.count if overlay_postings is not None else 0
+        segment = self._segment
+        if segment is not None:
+            segment_terms = self._segment_terms
+            if segment_terms is None:
+                segment_terms = self._segment_terms = frozenset(segment.terms[i] for i in range(len(segment.terms)))
+            if term in segment_terms:
+                # Counts replaced or deleted documents too until the next save()
+                frequency += len(segment.postings(term)[0])
+        return frequency
+    
+    def suggest_correction(self, query: str) -> Optional[str]:
+        """Correct query terms missing from the index ("did you mean")."""
+        return suggest_correction(query, self.document_frequency)
+    
+    def similar(self, post_id: int, limit: int = 10) -> List[Tuple[int, float]]:
+        """
+        Rank other documents by cosine similarity of TF-IDF vectors.
+        
+        Term weights are (1 + log tf) * log(N / df). Postings form a sparse
+        term-document matrix, so the similarities are the product of that
+        matrix with the document's vector, restricted to its
+        MAX_SIMILARITY_TERMS strongest terms with an IDF of at least
+        MIN_SIMILARITY_IDF.
+        
+        Safe to call from a worker thread while the event loop writes to the
+        index: the overlay and segment are read through the references taken
+        on entry, and overlay arrays are never shrunk in place.
+        
+        Args:
+            post_id: ID of the document to compare the others with
+            limit: Maximum number of similar documents
+            
+        Returns:
+            List of (post_id, similarity between 0 and 1), most similar first
+        """
+        frequencies = self._document_frequencies(post_id)
+        overlay = self._overlay
+        document_count = overlay.count + self._segment_live_count
+        if not frequencies or document_count < 2:
+            return []
+        segment, live = self._segment, self._live
+        if segment is not None and (live is None or len(live) != segment.doc_count):
+            # The segment was swapped while this call started; try again later
+            return []
+        
+        # (term, idf, weight in this document, current segment postings,
+        # overlay postings), for terms other documents contain too
+        weighted_terms = []
+        squares = 0.0
+        for term, frequency in frequencies.items():
+            postings = overlay.postings.get(term)
+            count = postings.count if postings is not None else 0
+            if postings is not None:
+                postings = postings.arrays()[:2]
+            segment_postings = segment.postings(term) if segment is not None else None
+            if segment_postings is not None:
+                docs, term_frequencies = segment_postings
+                current = live[docs]
+                segment_postings = docs[current], term_frequencies[current]
+                count += len(segment_postings[0])
+            idf = math.log(document_count / max(count, 1))
+            weight = (1.0 + math.log(frequency)) * idf
+            squares += weight * weight
+            if count > 1 and idf >= MIN_SIMILARITY_IDF:
+                weighted_terms.append((term, idf, weight, segment_postings, postings))
+        norm = math.sqrt(squares)
+        if not norm:
+            return []
+        terms = heapq.nlargest(MAX_SIMILARITY_TERMS, weighted_terms, key=lambda item: item[2])
+        
+        ranked: List[Tuple[int, float]] = []
+        # Read after the postings, so it covers every slot they hold
+        overlay_live = overlay.live
+        overlay_scores = np.zeros(len(overlay_live), dtype=np.float64)
+        segment_scores = np.zeros(segment.doc_count, dtype=np.float32) if segment is not None else None
+        for term, idf, weight, segment_postings, postings in terms:
+            if segment_postings is not None and len(segment_postings[0]):
+                docs, term_frequencies = segment_postings
+                segment_scores[docs] += (weight * idf) * (1.0 + np.log(term_frequencies))
+            if postings is not None:
+                slots, term_frequencies = postings
+                overlay_scores[slots] += (weight * idf) * (1.0 + np.log(term_frequencies))
+        
+        overlay_scores[~overlay_live] = 0.0
+        slot = overlay.slots.get(post_id)
+        if slot is not None:
+            overlay_scores[slot] = 0.0
+        matched = np.flatnonzero(overlay_scores)
+        if len(matched):
+            similarities = overlay_scores[matched] / (
+                norm * self._overlay_vector_norms(overlay, matched, document_count)
+            )
+            if len(matched) > limit:
+                top = np.argpartition(-similarities, limit - 1)[:limit]
+                matched, similarities = matched[top], similarities[top]
+            ranked.extend(
+                (int(overlay.ids[slot]), float(similarity))
+                for slot, similarity in zip(matched, similarities)
+            )
+        
+        if segment_scores is not None:
+            index = segment.doc_index(post_id)
+            if index is not None:
+                segment_scores[index] = 0.0
+            matched = np.flatnonzero(segment_scores)
+            if len(matched):
+                similarities = segment_scores[matched] / (norm * self._segment_norms(segment)[matched])
+                if len(matched) > limit:
+                    top = np.argpartition(-similarities, limit - 1)[:limit]
+                    matched, similarities = matched[top], similarities[top]
+                ranked.extend(
+                    (int(segment.doc_ids[index]), float(similarity))
+                    for index, similarity in zip(matched, similarities)
+                )
+        
+        return [
+            (other_id, min(similarity, 1.0))
+            for other_id, similarity in heapq.nlargest(limit, ranked, key=lambda item: (item[1], -item[0]))
+        ]
+    
+    def _document_frequencies(self, post_id: int) -> Dict[str, float]:
+        """Get the weighted term frequencies of an indexed document (empty if unknown)."""
+        frequencies = self._overlay.frequencies.get(post_id)
+        if frequencies is not None:
+            return frequencies
+        fields = self._stored_fields(post_id)
+        if fields is None:
+            return {}
+        return self._term_frequencies(fields["title"], fields["text"])[0]
+    
+    def _overlay_vector_norms(self, overlay: Overlay, slots: np.ndarray, document_count: int) -> np.ndarray:
+        """Get TF-IDF vector lengths of overlay documents, recomputing them all once the document count has drifted."""
+        cached = self._vector_norms
+        if (
+            cached is None
+            or cached[0] is not overlay
+            or abs(document_count - cached[1]) > cached[1] * NORM_DRIFT_TOLERANCE
+        ):
+            size = overlay.size
+            squares = np.zeros(size, dtype=np.float64)
+            for term, postings in list(overlay.postings.items()):
+                term_slots, term_frequencies, _, _ = postings.arrays()
+                current = term_slots < size
+                idf = math.log(document_count / max(self.document_frequency(term), 1))
+                weights = (1.0 + np.log(term_frequencies[current])) * idf
+                squares[term_slots[current]] += weights * weights
+            norms = np.sqrt(squares)
+            norms[norms == 0] = 1.0
+            cached = self._vector_norms = overlay, document_count, norms, {}
+        
+        _, _, norms, added = cached
+        known = slots < len(norms)
+        result = np.empty(len(slots), dtype=np.float64)
+        result[known] = norms[slots[known]]
+        for index in np.flatnonzero(~known):
+            slot = int(slots[index])
+            if slot not in added:
+                added[slot] = self._vector_norm(overlay, slot, document_count)
+            result[index] = added[slot]
+        return result
+    
+    def _vector_norm(self, overlay: Overlay, slot: int, document_count: int) -> float:
+        """TF-IDF vector length of an overlay document added since the last recomputation."""
+        post_id = int(overlay.ids[slot])
+        frequencies = overlay.frequencies.get(post_id)
+        if frequencies is None or overlay.slots.get(post_id) != slot:
+            # Replaced or removed while similar() was scoring it
+            return 1.0
+        squares = 0.0
+        for term, frequency in frequencies.items():
+            idf = math.log(document_count / max(self.document_frequency(term), 1))
+            squares += ((1.0 + math.log(frequency)) * idf) ** 2
+        return math.sqrt(squares) or 1.0
+    
+    def _segment_norms(self, segment: SearchSegment) -> np.ndarray:
+        """TF-IDF vector lengths of a segment's documents, with the segment's own statistics."""
+        cached = self._segment_vector_norms
+        if cached is None or cached[0] is not segment:
+            starts = segment.postings_starts.astype(np.int64)
+            idf = np.log(segment.doc_count / np.maximum(np.diff(starts), 1)).astype(np.float32)
+            squares = np.zeros(segment.doc_count, dtype=np.float64)
+            for begin in range(0, int(starts[-1]), _NORM_CHUNK):
+                end = min(begin + _NORM_CHUNK, int(starts[-1]))
+                terms = np.searchsorted(starts, np.arange(begin, end), side='right') - 1
+                weights = (1.0 + np.log(segment.postings_tfs[begin:end])) * idf[terms]
+                squares += np.bincount(
+                    segment.postings_docs[begin:end], weights=weights * weights, minlength=segment.doc_count
+                )
+            norms = np.sqrt(squares)
+            norms[norms == 0] = 1.0
+            cached = self._segment_vector_norms = segment, norms
+        return cached[1]
+    
+    def hits(self, ranked: List[Tuple[int, float]], query: str) -> List[SearchHit]:
+        """
+        Present ranked documents as search hits from the stored fields.
+        
+        Args:
+            ranked: List of (post_id, score) from search()
+            query: The query, whose terms are highlighted
+            
+        Returns:
+            List of search hits with snippets
+        """
+        terms = set(tokenize(query))
+        hits = []
+        for post_id, score in ranked:
+            fields = self._stored_fields(post_id)
+            if fields is None:
+                continue
+            post = self._to_post(post_id, fields)
+            hits.append(SearchHit(
+                id=post_id,
+                title=post.title,
+                slug=post.slug,
+                excerpt=post.excerpt,
+                snippet=build_snippet(fields["text"], terms),
+                author_id=post.author_id,
+                published_at=post.published_at,
+                categories=post.categories,
+                score=score,
+            ))
+        return hits
+    
+    @staticmethod
+    def hit_from_post(post: Post, query: str) -> SearchHit:
+        """Present a post found by the database as a search hit."""
+        text = markdown_service.html_to_text(post.content_html)
+        return SearchHit(
+            id=post.id,
+            title=post.title,
+            slug=post.slug,
+            excerpt=post.excerpt,
+            snippet=build_snippet(text, set(tokenize(query))),
+            author_id=post.author_id,
+            published_at=post.published_at,
+            categories=post.categories,
+        )
+    
+    def stored_posts(self) -> Iterator[Post]:
+        """Iterate over the indexed posts as entities without content."""
+        if self._segment is not None:
+            for index in np.flatnonzero(self._live):
+                post_id = int(self._segment.doc_ids[index])
+                yield self._to_post(post_id, decode_stored(self._segment.stored(index)))
+        for post_id, data in list(self._stored.items()):
+            yield self._to_post(post_id, decode_stored(data))
+    
+    def _stored_fields(self, post_id: int) -> Optional[dict]:
+        """Get the stored fields of an indexed post."""
+        data = self._stored.get(post_id)
+        segment, live = self._segment, self._live
+        if data is None and segment is not None and live is not None:
+            index = segment.doc_index(post_id)
+            if index is not None and index < len(live) and live[index]:
+                data = segment.stored(index)
+        return decode_stored(data) if data is not None else None
+    
+    def _to_post(self, post_id: int, fields: dict) -> Post:
+        """Build a post entity (without content) from stored fields."""
+        published_at = fields["published_at"]
+        return Post(
+            id=post_id,
+            title=fields["title"],
+            slug=fields["slug"],
+            excerpt=fields["excerpt"],
+            status=PostStatus.PUBLISHED,
+            author_id=fields["author_id"],
+            published_at=datetime.fromisoformat(published_at) if published_at else None,
+            categories=[
+                self._categories[category_id]
+                for category_id in fields["category_ids"]
+                if category_id in self._categories
+            ],
+        )
+    
+    def load(self) -> bool:
+        """
+        Open the segment file and replay the delta log written since it.
+        
+        Returns:
+            True if the index was loaded, False if there is no segment to load
+        """
+        if not (self.enabled and self.path and os.path.exists(self.path)):
+            return False
+        
+        with self._delta_log.locked():
+            try:
+                self._open_segment()
+            except ValueError:
+                # Written by another version; rebuilt from the database instead
+                logger.warning("Ignoring search index segment %s", self.path, exc_info=True)
+                return False
+        return True
+    
+    def _open_segment(self) -> None:
+        """Replace the index with the segment file plus its delta log. Caller must hold the lock."""
+        segment = SearchSegment(self.path)
+        self.clear()
+        self._segment = segment
+        self._live = np.ones(segment.doc_count, dtype=bool)
+        self._segment_live_count = segment.doc_count
+        self._segment_live_length = float(segment.doc_lengths.sum(dtype=np.float64))
+        for category in segment.categories:
+            self._categories[category["id"]] = Category(**category)
+        
+        self._delta_log.offset = 0
+        records = self._delta_log.read_new(segment.snapshot_id)
+        if records is None:
+            # Interrupted save(): the segment already holds the old log
+            self._delta_log.reset(segment.snapshot_id)
+            records = []
+        for record in records:
+            self._replay(record)
+        self.ready = True
+    
+    def save(self, overwrite: bool = True) -> bool:
+        """
+        Write every indexed document to a new segment and start a fresh delta log.
+        
+        The new segment then replaces the in-memory overlay.
+        
+        Args:
+            overwrite: Whether to replace a segment another process saved
+                since this index was built (otherwise that segment is loaded)
+        
+        Returns:
+            True if saved or loaded, False if no segment path is configured
+        """
+        if not (self.enabled and self.path):
+            return False
+        
+        with self._delta_log.locked():
+            if not overwrite and self._segment is None and os.path.exists(self.path):
+                try:
+                    self._open_segment()
+                    return True
+                except ValueError:
+                    logger.warning("Replacing search index segment %s", self.path, exc_info=True)
+                    # Its delta log predates this index too
+                    self._delta_log.reset("")
+            if self._segment is not None:
+                self._replay_new_records()
+            else:
+                # Built from the database: writes logged meanwhile may be missing
+                self._delta_log.offset = 0
+                for record in self._delta_log.read_new(None) or []:
+                    self._replay(record)
+            snapshot_id = uuid.uuid4().hex
+            self._write_segment(snapshot_id)
+            self._delta_log.reset(snapshot_id)
+            # Serve the documents from the shared mapping from now on
+            self._open_segment()
+        return True
+    
+    def _write_segment(self, snapshot_id: str) -> None:
+        """Write all current documents to the segment file."""
+        segment = self._segment
+        segment_ids = (
+            segment.doc_ids[self._live] if segment is not None else np.zeros(0, dtype=np.uint32)
+        )
+        overlay = self._overlay
+        overlay_slots = np.flatnonzero(overlay.live[:overlay.size])
+        overlay_ids = overlay.ids[overlay_slots].astype(np.uint32)
+        doc_ids = np.union1d(segment_ids, overlay_ids)
+        
+        doc_lengths = np.zeros(len(doc_ids), dtype=np.float32)
+        doc_authors = np.zeros(len(doc_ids), dtype=np.uint32)
+        doc_published = np.full(len(doc_ids), NO_DATE, dtype=np.int64)
+        stored: List[bytes] = [b""] * len(doc_ids)
+        category_docs: Dict[int, List[np.ndarray]] = {}
+        postings: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = {}
+        
+        if segment is not None:
+            # Segment document index -> new document index (-1 once removed)
+            remap = np.full(segment.doc_count, -1, dtype=np.int64)
+            remap[self._live] = np.searchsorted(doc_ids, segment_ids)
+            live = np.flatnonzero(self._live)
+            doc_lengths[remap[live]] = segment.doc_lengths[live]
+            doc_authors[remap[live]] = segment.doc_authors[live]
+            doc_published[remap[live]] = segment.doc_published[live]
+            for index in live:
+                stored[remap[index]] = segment.stored(index)
+            for category_id, docs in segment.iter_category_postings():
+                new_docs = remap[docs]
+                category_docs[category_id] = [new_docs[new_docs >= 0]]
+            for term, docs, term_frequencies in segment.iter_postings():
+                new_docs = remap[docs]
+                current = new_docs >= 0
+                if current.any():
+                    postings[term] = [(new_docs[current], term_frequencies[current])]
+        
+        # Overlay slot -> new document index (-1 once removed)
+        slot_docs = np.full(overlay.size, -1, dtype=np.int64)
+        slot_docs[overlay_slots] = np.searchsorted(doc_ids, overlay_ids)
+        indexes = slot_docs[overlay_slots]
+        doc_lengths[indexes] = overlay.lengths[overlay_slots]
+        # Documents indexed without facets get author 0
+        doc_authors[indexes] = np.maximum(overlay.authors[overlay_slots], 0)
+        doc_published[indexes] = overlay.published[overlay_slots]
+        for post_id, index in zip(overlay_ids.tolist(), indexes.tolist()):
+            stored[index] = self._stored[post_id]
+        for category_id, category_slots in overlay.category_slots.items():
+            docs = slot_docs[category_slots.view()]
+            category_docs.setdefault(category_id, []).append(docs[docs >= 0])
+        for term, term_postings in overlay.postings.items():
+            slots, term_frequencies, _, _ = term_postings.arrays()
+            docs = slot_docs[slots]
+            current = docs >= 0
+            postings.setdefault(term, []).append((docs[current], term_frequencies[current]))
+        
+        merged = []
+        for term in sorted(postings):
+            docs = np.concatenate([part[0] for part in postings[term]])
+            term_frequencies = np.concatenate([part[1] for part in postings[term]])
+            order = np.argsort(docs, kind='stable')
+            merged.append((term, docs[order], term_frequencies[order]))
+        
+        categories = [
+            {"id": category.id, "name": category.name, "slug": category.slug}
+            for category in self._categories.values()
+        ]
+        category_postings = []
+        for category_id in sorted(category_docs):
+            docs = np.sort(np.concatenate(category_docs[category_id]))
+            if len(docs):
+                category_postings.append((category_id, docs))
+        
+        write_segment(
+            self.path,
+            snapshot_id,
+            doc_ids,
+            doc_lengths,
+            stored,
+            merged,
+            categories,
+            doc_authors,
+            doc_published,
+            category_postings,
+        )
+    
+    def sync(self) -> Tuple[List[Tuple[int, Optional[Post]]], bool]:
+        """
+        Apply writes other workers made through the shared delta log.
+        
+        Returns:
+            Tuple of (changes as (post_id, post or None if removed), whether
+            the whole index was reloaded from a new segment)
+        """
+        if self._segment is None:
+            return [], False
+        
+        if self._delta_log.changed():
+            self._replay_new_records()
+        
+        changes, reloaded = self._remote_changes, self._reloaded
+        self._remote_changes, self._reloaded = [], False
+        return changes, reloaded
+    
+    def _log(self, record: dict) -> None:
+        """Append a write to the delta log shared with other workers."""
+        if self._segment is None:
+            # Not loaded from a segment; the next save() covers this write
+            return
+        try:
+            with self._delta_log.locked():
+                if not self._replay_new_records():
+                    # The reloaded segment may predate this write
+                    self._replay(record)
+                self._delta_log.append(record)
+        except OSError:
+            logger.warning("Could not append to the search index delta log", exc_info=True)
+    
+    def _replay_new_records(self) -> bool:
+        """
+        Apply delta log records appended by other workers.
+        
+        Returns:
+            False if another worker saved a new segment, which was loaded instead
+        """
+        records = self._delta_log.read_new(self._segment.snapshot_id)
+        if records is None:
+            self._open_segment()
+            self._remote_changes.clear()
+            self._reloaded = True
+            return False
+        for record in records:
+            self._replay(record)
+        return True
+    
+    def _replay(self, record: dict) -> None:
+        """Apply one delta log record."""
+        post_id = record["id"]
+        if record["op"] == "index":
+            self._apply_index(post_id, record["fields"], record["categories"])
+            self._remote_changes.append((post_id, self._to_post(post_id, record["fields"])))
+        else:
+            self.remove_document(post_id)
+            self._remote_changes.append((post_id, None))
+    
+    def stats(self) -> dict:
+        """Get index statistics (for monitoring)."""
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "documents": self._overlay.count + self._segment_live_count,
+            "segment_documents": self._segment_live_count,
+            "overlay_documents": self._overlay.count,
+            "overlay_terms": len(self._overlay.postings),
+            "postings_scored": self.postings_scored,
+            "snapshot_id": self._segment.snapshot_id if self._segment is not None else None,
+        }
+
+
+# Singleton instance
+search_index_service = SearchIndexService(
+    enabled=SEARCH_BACKEND == "index",
+    path=SEARCH_INDEX_PATH,
+)
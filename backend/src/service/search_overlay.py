@@ -0,0 +1,248 @@
+"""In-memory tier of the search index, held in NumPy arrays like the segment.
+
+Documents written since the segment get consecutive slots. Replacing or
+removing a document flags its slot dead instead of reusing it. Per-slot
+columns (post ID, length, author, publication time, live flag) and per-term
+postings (ascending slots with weighted term frequencies) grow by doubling,
+so search scores the overlay with the same vectorised code as the segment.
+Every term also keeps block bounds (see postings_block_bounds), updated as
+postings are appended.
+
+Arrays only grow or are replaced, and sizes are set after the data they
+cover. A reader in another thread that reads a size before its arrays
+therefore only sees initialised entries. compacted() renumbers the slots into
+a new overlay rather than in place.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.service.search_segment import NO_DATE, POSTINGS_BLOCK_SIZE, postings_block_bounds
+
+_INITIAL_CAPACITY = 16
+
+# The index compacts the overlay once dead slots outnumber live documents
+# and this many
+COMPACTION_MIN_DEAD = 1024
+
+
+def _grown(array: np.ndarray, capacity: int, fill=0) -> np.ndarray:
+    """Copy an array into a larger one, padded with fill."""
+    grown = np.full(capacity, fill, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _blocks(size: int) -> int:
+    """Number of blocks covering size postings."""
+    return -(-size // POSTINGS_BLOCK_SIZE)
+
+
+class SlotArray:
+    """Ascending slots that can be appended to, such as a category's members."""
+    
+    __slots__ = ("data", "size")
+    
+    def __init__(self, slots: Optional[np.ndarray] = None):
+        slots = slots if slots is not None else np.zeros(0, dtype=np.int64)
+        self.data = _grown(slots.astype(np.int64), max(_INITIAL_CAPACITY, len(slots)))
+        self.size = len(slots)
+    
+    def append(self, slot: int) -> None:
+        """Append a slot above every slot already held."""
+        size = self.size
+        if size == len(self.data):
+            self.data = _grown(self.data, 2 * size)
+        self.data[size] = slot
+        self.size = size + 1
+    
+    def view(self) -> np.ndarray:
+        """Get the slots held, dead or not."""
+        size = self.size
+        return self.data[:size]
+
+
+class OverlayPostings:
+    """Postings of one term: ascending slots, weighted term frequencies and block bounds."""
+    
+    __slots__ = ("slots", "tfs", "block_max_tfs", "block_min_lengths", "size", "count")
+    
+    def __init__(self, slots: np.ndarray, term_frequencies: np.ndarray, lengths: np.ndarray):
+        """
+        Hold a term's postings.
+        
+        Args:
+            slots: Slots of the documents holding the term, ascending
+            term_frequencies: Weighted term frequency in each document
+            lengths: Weighted length of each document
+        """
+        capacity = max(_INITIAL_CAPACITY, len(slots))
+        block_max_tfs, block_min_lengths = postings_block_bounds(term_frequencies, lengths)
+        self.slots = _grown(slots.astype(np.int64), capacity)
+        self.tfs = _grown(term_frequencies.astype(np.float32), capacity)
+        self.block_max_tfs = _grown(block_max_tfs, _blocks(capacity))
+        self.block_min_lengths = _grown(block_min_lengths, _blocks(capacity))
+        # Postings held, and those of live documents
+        self.size = len(slots)
+        self.count = len(slots)
+    
+    @classmethod
+    def empty(cls) -> "OverlayPostings":
+        """Create postings without any document."""
+        nothing = np.zeros(0, dtype=np.float32)
+        return cls(np.zeros(0, dtype=np.int64), nothing, nothing)
+    
+    def append(self, slot: int, term_frequency: float, length: float) -> None:
+        """Append the posting of a document in a slot above every slot already held."""
+        position = self.size
+        if position == len(self.slots):
+            capacity = 2 * position
+            self.slots = _grown(self.slots, capacity)
+            self.tfs = _grown(self.tfs, capacity)
+            self.block_max_tfs = _grown(self.block_max_tfs, _blocks(capacity))
+            self.block_min_lengths = _grown(self.block_min_lengths, _blocks(capacity))
+        
+        # Bound the block before the posting becomes visible
+        block, index = divmod(position, POSTINGS_BLOCK_SIZE)
+        if index == 0 or term_frequency > self.block_max_tfs[block]:
+            self.block_max_tfs[block] = term_frequency
+        if index == 0 or length < self.block_min_lengths[block]:
+            self.block_min_lengths[block] = length
+        self.slots[position] = slot
+        self.tfs[position] = term_frequency
+        self.size = position + 1
+        self.count += 1
+    
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the postings, dead documents included.
+        
+        Returns:
+            Tuple of (slots, weighted term frequencies, highest term frequency
+            per block, shortest document length per block)
+        """
+        size = self.size
+        blocks = _blocks(size)
+        return self.slots[:size], self.tfs[:size], self.block_max_tfs[:blocks], self.block_min_lengths[:blocks]
+
+
+class Overlay:
+    """Documents of the in-memory tier, addressed by slot."""
+    
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        # Slots used, live or dead, and live documents
+        self.size = 0
+        self.count = 0
+        self.total_length = 0.0
+        
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.lengths = np.zeros(capacity, dtype=np.float32)
+        # -1 for documents indexed without facets
+        self.authors = np.full(capacity, -1, dtype=np.int64)
+        self.published = np.full(capacity, NO_DATE, dtype=np.int64)
+        self.live = np.zeros(capacity, dtype=bool)
+        
+        # {post_id: slot} of live documents
+        self.slots: Dict[int, int] = {}
+        # {post_id: {term: weighted term frequency}} of live documents
+        self.frequencies: Dict[int, Dict[str, float]] = {}
+        self.postings: Dict[str, OverlayPostings] = {}
+        self.category_slots: Dict[int, SlotArray] = {}
+    
+    def add(
+        self,
+        post_id: int,
+        frequencies: Dict[str, float],
+        length: float,
+        facets: Optional[Tuple[int, int, Tuple[int, ...]]] = None,
+    ) -> None:
+        """
+        Add a document that is not in the overlay (remove() it first).
+        
+        Args:
+            post_id: ID of the post
+            frequencies: Weighted frequency of each term of the document
+            length: Weighted document length
+            facets: (author ID, published epoch seconds, category IDs), for
+                filters and facets
+        """
+        slot = self.size
+        if slot == len(self.ids):
+            capacity = 2 * slot
+            self.ids = _grown(self.ids, capacity)
+            self.lengths = _grown(self.lengths, capacity)
+            self.authors = _grown(self.authors, capacity, -1)
+            self.published = _grown(self.published, capacity, NO_DATE)
+            self.live = _grown(self.live, capacity, False)
+        
+        self.ids[slot] = post_id
+        self.lengths[slot] = length
+        if facets is not None:
+            self.authors[slot], self.published[slot] = facets[0], facets[1]
+            for category_id in facets[2]:
+                self.category_slots.setdefault(category_id, SlotArray()).append(slot)
+        self.live[slot] = True
+        for term, frequency in frequencies.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = OverlayPostings.empty()
+            postings.append(slot, frequency, length)
+        
+        self.slots[post_id] = slot
+        self.frequencies[post_id] = frequencies
+        self.count += 1
+        self.total_length += length
+        self.size = slot + 1
+    
+    def remove(self, post_id: int) -> bool:
+        """Remove a document. Returns True if it was in the overlay."""
+        slot = self.slots.pop(post_id, None)
+        if slot is None:
+            return False
+        
+        self.live[slot] = False
+        self.count -= 1
+        self.total_length -= float(self.lengths[slot])
+        for term in self.frequencies.pop(post_id):
+            postings = self.postings[term]
+            postings.count -= 1
+            if not postings.count:
+                del self.postings[term]
+            elif postings.count * 2 < postings.size:
+                # Replaced rather than shrunk, for readers holding the old arrays
+                self.postings[term] = self._live_postings(postings)
+        return True
+    
+    def _live_postings(self, postings: OverlayPostings, remap: Optional[np.ndarray] = None) -> OverlayPostings:
+        """Copy the postings of live documents, with their slots renumbered through remap."""
+        slots, term_frequencies, _, _ = postings.arrays()
+        current = self.live[slots]
+        slots, term_frequencies = slots[current], term_frequencies[current]
+        lengths = self.lengths[slots]
+        return OverlayPostings(remap[slots] if remap is not None else slots, term_frequencies, lengths)
+    
+    def compacted(self) -> "Overlay":
+        """Copy the live documents into a new overlay, in slots numbered from 0."""
+        current = np.flatnonzero(self.live[:self.size])
+        remap = np.full(self.size, -1, dtype=np.int64)
+        remap[current] = np.arange(len(current))
+        
+        overlay = Overlay(max(_INITIAL_CAPACITY, len(current)))
+        for name in ("ids", "lengths", "authors", "published", "live"):
+            getattr(overlay, name)[:len(current)] = getattr(self, name)[current]
+        overlay.slots = {post_id: int(remap[slot]) for post_id, slot in self.slots.items()}
+        overlay.frequencies = dict(self.frequencies)
+        overlay.postings = {
+            term: self._live_postings(postings, remap)
+            for term, postings in self.postings.items()
+        }
+        for category_id, category_slots in self.category_slots.items():
+            slots = remap[category_slots.view()]
+            slots = slots[slots >= 0]
+            if len(slots):
+                overlay.category_slots[category_id] = SlotArray(slots)
+        overlay.count = self.count
+        overlay.total_length = self.total_length
+        overlay.size = len(current)
+        return overlay
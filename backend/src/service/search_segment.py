@@ -0,0 +1,398 @@
+"""On-disk search index segment (opened with mmap) and its write-ahead delta log.
+
+A segment file holds an immutable snapshot of the search index:
+    
+    magic (8 bytes) | header length (uint64) | JSON header | sections
+
+The header records the position of every section. Sections are 8-byte
+aligned arrays that NumPy views directly in the mapped file, so every
+worker process shares the same pages:
+    
+    doc_ids          uint32[doc_count]      post IDs, ascending
+    doc_lengths      float32[doc_count]     weighted document lengths
+    stored_offsets   uint64[doc_count + 1]  offsets into stored
+    stored           bytes                  zlib-compressed JSON per document
+    term_offsets     uint64[term_count + 1] offsets into terms
+    terms            bytes                  UTF-8 terms, sorted
+    postings_starts  uint64[term_count + 1] offsets into postings_docs/_tfs
+    postings_docs    uint32[posting_count]  document indexes, ascending per term
+    postings_tfs     float32[posting_count] weighted term frequencies
+    doc_authors      uint32[doc_count]      author IDs
+    doc_published    int64[doc_count]       publication times in epoch seconds
+                                            (NO_DATE if unknown)
+    category_ids     uint32[category_count] category IDs, ascending
+    category_starts  uint64[category_count + 1] offsets into category_docs
+    category_docs    uint32[membership_count] document indexes, ascending per category
+
+Writes made after the snapshot are appended to a JSON-lines delta log whose
+first line names the snapshot it applies to.
+"""
+
+import bisect
+import fcntl
+import json
+import mmap
+import os
+import struct
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"MBSIDX1\0"
+FORMAT_VERSION = 2
+
+# Publication time of documents without one; excluded by any date filter
+NO_DATE = np.iinfo(np.int64).min
+
+# Postings per block of the score upper bounds that let search skip postings
+POSTINGS_BLOCK_SIZE = 128
+
+_SECTION_DTYPES = {
+    "doc_ids": np.uint32,
+    "doc_lengths": np.float32,
+    "stored_offsets": np.uint64,
+    "term_offsets": np.uint64,
+    "postings_starts": np.uint64,
+    "postings_docs": np.uint32,
+    "postings_tfs": np.float32,
+    "doc_authors": np.uint32,
+    "doc_published": np.int64,
+    "category_ids": np.uint32,
+    "category_starts": np.uint64,
+    "category_docs": np.uint32,
+}
+
+
+class _Terms:
+    """Sorted term dictionary read from the mapped file, indexable for bisect."""
+    
+    def __init__(self, data: mmap.mmap, base: int, offsets: np.ndarray):
+        self._data = data
+        self._base = base
+        self._offsets = offsets
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index: int) -> str:
+        start = self._base + int(self._offsets[index])
+        end = self._base + int(self._offsets[index + 1])
+        return self._data[start:end].decode('utf-8')
+
+
+class SearchSegment:
+    """Read-only view of a segment file."""
+    
+    def __init__(self, path: str):
+        """
+        Map a segment file.
+        
+        Raises:
+            ValueError: If the file is not a segment of this format version
+        """
+        with open(path, 'rb') as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self._data[:8] != MAGIC:
+            raise ValueError(f"{path} is not a search index segment")
+        (header_length,) = struct.unpack_from("<Q", self._data, 8)
+        header = json.loads(self._data[16:16 + header_length])
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported search index format {header['version']}")
+        
+        self.snapshot_id: str = header["snapshot_id"]
+        self.categories: List[dict] = header["categories"]
+        self._sections = header["sections"]
+        
+        self.doc_ids = self._array("doc_ids")
+        self.doc_lengths = self._array("doc_lengths")
+        self._stored_offsets = self._array("stored_offsets")
+        self.postings_starts = self._array("postings_starts")
+        self.postings_docs = self._array("postings_docs")
+        self.postings_tfs = self._array("postings_tfs")
+        self.terms = _Terms(self._data, self._sections["terms"][0], self._array("term_offsets"))
+        self.doc_authors = self._array("doc_authors")
+        self.doc_published = self._array("doc_published")
+        self.category_ids = self._array("category_ids")
+        self._category_starts = self._array("category_starts")
+        self.category_docs = self._array("category_docs")
+        self.doc_count = len(self.doc_ids)
+        # {term: block bounds}, computed as terms are searched
+        self._block_bounds: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+    
+    def _array(self, name: str) -> np.ndarray:
+        """Zero-copy view of a section."""
+        offset, count = self._sections[name]
+        return np.frombuffer(self._data, dtype=_SECTION_DTYPES[name], count=count, offset=offset)
+    
+    def doc_index(self, post_id: int) -> Optional[int]:
+        """Get the document index of a post, or None if the segment lacks it."""
+        index = int(np.searchsorted(self.doc_ids, post_id))
+        if index < self.doc_count and self.doc_ids[index] == post_id:
+            return index
+        return None
+    
+    def postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Get (document indexes, weighted term frequencies) of a term."""
+        index = bisect.bisect_left(self.terms, term)
+        if index == len(self.terms) or self.terms[index] != term:
+            return None
+        start = int(self.postings_starts[index])
+        end = int(self.postings_starts[index + 1])
+        return self.postings_docs[start:end], self.postings_tfs[start:end]
+    
+    def block_bounds(self, term: str, docs: np.ndarray, term_frequencies: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the block bounds of a term's postings (see postings_block_bounds).
+        
+        They are not stored in the file: each process computes a term's on
+        its first search, in one pass over its postings.
+        """
+        bounds = self._block_bounds.get(term)
+        if bounds is None:
+            bounds = postings_block_bounds(term_frequencies, self.doc_lengths[docs])
+            self._block_bounds[term] = bounds
+        return bounds
+    
+    def category_postings(self, category_id: int) -> np.ndarray:
+        """Get the document indexes of a category (empty if the segment lacks it)."""
+        index = int(np.searchsorted(self.category_ids, category_id))
+        if index == len(self.category_ids) or self.category_ids[index] != category_id:
+            return self.category_docs[:0]
+        start = int(self._category_starts[index])
+        end = int(self._category_starts[index + 1])
+        return self.category_docs[start:end]
+    
+    def iter_category_postings(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """Iterate over (category ID, document indexes)."""
+        for index, category_id in enumerate(self.category_ids):
+            start = int(self._category_starts[index])
+            end = int(self._category_starts[index + 1])
+            yield int(category_id), self.category_docs[start:end]
+    
+    def iter_postings(self) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+        """Iterate over (term, document indexes, weighted term frequencies)."""
+        for index in range(len(self.terms)):
+            start = int(self.postings_starts[index])
+            end = int(self.postings_starts[index + 1])
+            yield self.terms[index], self.postings_docs[start:end], self.postings_tfs[start:end]
+    
+    def stored(self, doc_index: int) -> bytes:
+        """Get the compressed stored fields of a document."""
+        base = self._sections["stored"][0]
+        start = base + int(self._stored_offsets[doc_index])
+        end = base + int(self._stored_offsets[doc_index + 1])
+        return self._data[start:end]
+
+
+def postings_block_bounds(term_frequencies: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bound the postings of a term per POSTINGS_BLOCK_SIZE of them.
+    
+    Args:
+        term_frequencies: Weighted term frequency of each posting
+        lengths: Weighted length of each posting's document
+        
+    Returns:
+        Tuple of (highest term frequency, shortest document length) per block
+    """
+    if not len(term_frequencies):
+        return np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+    starts = np.arange(0, len(term_frequencies), POSTINGS_BLOCK_SIZE)
+    return (
+        np.maximum.reduceat(term_frequencies, starts).astype(np.float32),
+        np.minimum.reduceat(lengths, starts).astype(np.float32),
+    )
+
+
+def encode_stored(fields: dict) -> bytes:
+    """Compress a document's stored fields."""
+    return zlib.compress(json.dumps(fields, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_stored(data: bytes) -> dict:
+    """Decompress a document's stored fields."""
+    return json.loads(zlib.decompress(data))
+
+
+def write_segment(
+    path: str,
+    snapshot_id: str,
+    doc_ids: np.ndarray,
+    doc_lengths: np.ndarray,
+    stored: List[bytes],
+    postings: List[Tuple[str, np.ndarray, np.ndarray]],
+    categories: List[dict],
+    doc_authors: np.ndarray,
+    doc_published: np.ndarray,
+    category_postings: List[Tuple[int, np.ndarray]],
+) -> None:
+    """
+    Write a segment file atomically (to a temporary file, then renamed).
+    
+    Args:
+        path: Segment file path
+        snapshot_id: Identifier the delta log refers to
+        doc_ids: Ascending post IDs
+        doc_lengths: Weighted document lengths, by document index
+        stored: Compressed stored fields, by document index
+        postings: (term, document indexes, term frequencies), sorted by term
+        categories: Categories referenced by stored fields
+        doc_authors: Author IDs, by document index
+        doc_published: Publication times in epoch seconds, by document index
+        category_postings: (category ID, document indexes), sorted by category ID
+    """
+    stored_offsets = np.zeros(len(stored) + 1, dtype=np.uint64)
+    np.cumsum([len(blob) for blob in stored], out=stored_offsets[1:])
+    encoded_terms = [term.encode('utf-8') for term, _, _ in postings]
+    term_offsets = np.zeros(len(postings) + 1, dtype=np.uint64)
+    np.cumsum([len(term) for term in encoded_terms], out=term_offsets[1:])
+    postings_starts = np.zeros(len(postings) + 1, dtype=np.uint64)
+    np.cumsum([len(docs) for _, docs, _ in postings], out=postings_starts[1:])
+    category_starts = np.zeros(len(category_postings) + 1, dtype=np.uint64)
+    np.cumsum([len(docs) for _, docs in category_postings], out=category_starts[1:])
+    
+    sections = [
+        ("doc_ids", np.asarray(doc_ids, dtype=np.uint32).tobytes()),
+        ("doc_lengths", np.asarray(doc_lengths, dtype=np.float32).tobytes()),
+        ("stored_offsets", stored_offsets.tobytes()),
+        ("stored", b"".join(stored)),
+        ("term_offsets", term_offsets.tobytes()),
+        ("terms", b"".join(encoded_terms)),
+        ("postings_starts", postings_starts.tobytes()),
+        ("postings_docs", b"".join(np.asarray(docs, dtype=np.uint32).tobytes() for _, docs, _ in postings)),
+        ("postings_tfs", b"".join(np.asarray(tfs, dtype=np.float32).tobytes() for _, _, tfs in postings)),
+        ("doc_authors", np.asarray(doc_authors, dtype=np.uint32).tobytes()),
+        ("doc_published", np.asarray(doc_published, dtype=np.int64).tobytes()),
+        ("category_ids", np.array([category_id for category_id, _ in category_postings], dtype=np.uint32).tobytes()),
+        ("category_starts", category_starts.tobytes()),
+        ("category_docs", b"".join(np.asarray(docs, dtype=np.uint32).tobytes() for _, docs in category_postings)),
+    ]
+    counts = {
+        "doc_ids": len(doc_ids),
+        "doc_lengths": len(doc_ids),
+        "stored_offsets": len(stored_offsets),
+        "term_offsets": len(term_offsets),
+        "postings_starts": len(postings_starts),
+        "postings_docs": int(postings_starts[-1]),
+        "postings_tfs": int(postings_starts[-1]),
+        "doc_authors": len(doc_ids),
+        "doc_published": len(doc_ids),
+        "category_ids": len(category_postings),
+        "category_starts": len(category_starts),
+        "category_docs": int(category_starts[-1]),
+    }
+    
+    # Section offsets depend on the header length, which depends on the
+    # offsets; reserve room for the widest offsets and pad the header
+    header = {
+        "version": FORMAT_VERSION,
+        "snapshot_id": snapshot_id,
+        "categories": categories,
+        "sections": {name: [2 ** 63, counts.get(name, len(data))] for name, data in sections},
+    }
+    header_length = len(json.dumps(header).encode('utf-8'))
+    position = _align(16 + header_length)
+    for name, data in sections:
+        header["sections"][name] = [position, counts.get(name, len(data))]
+        position = _align(position + len(data))
+    header_bytes = json.dumps(header).encode('utf-8').ljust(header_length)
+    
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<Q", header_length))
+        file.write(header_bytes)
+        for name, data in sections:
+            file.write(b"\0" * (header["sections"][name][0] - file.tell()))
+            file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def _align(position: int) -> int:
+    """Round a file position up to the next multiple of 8."""
+    return (position + 7) & ~7
+
+
+class DeltaLog:
+    """Append-only JSON-lines log of index writes made since a snapshot."""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._lock_path = f"{path}.lock"
+        # Position up to which this process has applied the log
+        self.offset = 0
+        self._seen: Optional[Tuple[int, int]] = None
+    
+    @contextmanager
+    def locked(self):
+        """Hold the exclusive lock shared by all processes using the log."""
+        with open(self._lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def reset(self, snapshot_id: str) -> None:
+        """Start an empty log for a new snapshot. Caller must hold the lock."""
+        header = json.dumps({"snapshot": snapshot_id}).encode('utf-8') + b"\n"
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, 'wb') as file:
+            file.write(header)
+        os.replace(temporary_path, self.path)
+        self.offset = len(header)
+        self._seen = None
+    
+    def changed(self) -> bool:
+        """Cheaply check whether the log may hold records not yet read."""
+        try:
+            status = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        seen = (status.st_ino, status.st_size)
+        if seen == self._seen:
+            return False
+        self._seen = seen
+        return True
+    
+    def read_new(self, snapshot_id: Optional[str]) -> Optional[List[dict]]:
+        """
+        Read complete records appended after this process's offset.
+        
+        Args:
+            snapshot_id: Snapshot the caller's index was loaded from (None
+                accepts whichever snapshot the log belongs to)
+            
+        Returns:
+            New records, or None if the log now belongs to another snapshot
+        """
+        try:
+            file = open(self.path, 'rb')
+        except FileNotFoundError:
+            return None
+        with file:
+            header = file.readline()
+            if not header.endswith(b"\n"):
+                return None
+            if snapshot_id is not None and json.loads(header)["snapshot"] != snapshot_id:
+                return None
+            self.offset = max(self.offset, len(header))
+            file.seek(self.offset)
+            data = file.read()
+        
+        # A record still being written has no newline yet
+        complete = data[:data.rfind(b"\n") + 1]
+        self.offset += len(complete)
+        return [json.loads(line) for line in complete.splitlines() if line]
+    
+    def append(self, record: dict) -> None:
+        """Append a record. Caller must hold the lock and have read all records."""
+        line = json.dumps(record, separators=(',', ':')).encode('utf-8') + b"\n"
+        with open(self.path, 'ab') as file:
+            file.write(line)
+            self.offset = file.tell()
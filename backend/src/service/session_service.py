@@ -0,0 +1,188 @@
+"""Signed session tokens.
+
+A session token carries the user id, username and expiry, signed with
+HMAC-SHA256 under SECRET_KEY, so verifying one is a few microseconds of CPU
+and needs no database lookup. Logging out revokes the token by its id in an
+in-process list; entries are dropped once the token would have expired anyway,
+so the list stays as small as the number of sessions ended early.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Key signing session tokens; must be shared by every worker
+SECRET_KEY = os.getenv("SECRET_KEY", "")
+# Session lifetime
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "86400"))
+# Cookie holding the session token
+SESSION_COOKIE_NAME = "session_token"
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    """Verified contents of a session token."""
+    user_id: int
+    username: str
+    expires_at: int
+    token_id: str
+
+
+def _encode(data: bytes) -> str:
+    """URL-safe base64 without padding."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _decode(text: str) -> bytes:
+    """Inverse of _encode; raises ValueError on malformed input."""
+    try:
+        return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed token") from e
+
+
+class SessionService:
+    """Service issuing, verifying and revoking signed session tokens."""
+    
+    def __init__(self, secret_key: str = SECRET_KEY, ttl_seconds: int = SESSION_TTL_SECONDS):
+        """
+        Initialize the service.
+        
+        Args:
+            secret_key: HMAC key; a random per-process key is used if empty,
+                so sessions then end on restart and are not shared by workers
+            ttl_seconds: Lifetime of issued tokens
+        """
+        if not secret_key:
+            logger.warning("SECRET_KEY is not set; sessions will not survive a restart")
+            secret_key = secrets.token_hex(32)
+        self._key = secret_key.encode("utf-8")
+        self.ttl_seconds = ttl_seconds
+        # {token_id: expires_at}
+        self._revoked: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        
+        self.issued = 0
+        self.verified = 0
+        self.rejected = 0
+    
+    def issue(self, user_id: int, username: str, now: Optional[float] = None) -> str:
+        """
+        Issue a token for a user.
+        
+        Args:
+            user_id: ID of the user
+            username: Username of the user
+            now: Current time (defaults to the clock)
+        
+        Returns:
+            Signed session token
+        """
+        now = time.time() if now is None else now
+        payload = json.dumps(
+            {
+                "sub": user_id,
+                "name": username,
+                "exp": int(now) + self.ttl_seconds,
+                "jti": secrets.token_urlsafe(12),
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        body = _encode(payload)
+        self.issued += 1
+        return f"{body}.{self._sign(body)}"
+    
+    def verify(self, token: Optional[str], now: Optional[float] = None) -> Optional[SessionClaims]:
+        """
+        Verify a token.
+        
+        Args:
+            token: Session token (may be None)
+            now: Current time (defaults to the clock)
+        
+        Returns:
+            The token's claims, or None if it is missing, forged, expired or revoked
+        """
+        if not token:
+            return None
+        claims = self._parse(token)
+        now = time.time() if now is None else now
+        if claims is None or claims.expires_at <= now or claims.token_id in self._revoked:
+            self.rejected += 1
+            return None
+        self.verified += 1
+        return claims
+    
+    def revoke(self, token: Optional[str], now: Optional[float] = None) -> bool:
+        """
+        Revoke a token until it expires.
+        
+        Args:
+            token: Session token (may be None)
+            now: Current time (defaults to the clock)
+        
+        Returns:
+            True if a valid token was revoked
+        """
+        claims = self.verify(token, now)
+        if claims is None:
+            return False
+        now = time.time() if now is None else now
+        with self._lock:
+            # Expired tokens fail verification on their own
+            self._revoked = {
+                token_id: expires_at
+                for token_id, expires_at in self._revoked.items()
+                if expires_at > now
+            }
+            self._revoked[claims.token_id] = claims.expires_at
+        return True
+    
+    def _sign(self, body: str) -> str:
+        """Signature of a token body."""
+        return _encode(hmac.new(self._key, body.encode("utf-8"), hashlib.sha256).digest())
+    
+    def _parse(self, token: str) -> Optional[SessionClaims]:
+        """Check a token's signature and decode its claims."""
+        body, _, signature = token.partition(".")
+        try:
+            if not signature or not hmac.compare_digest(
+                signature.encode("ascii"), self._sign(body).encode("ascii")
+            ):
+                return None
+            payload = json.loads(_decode(body))
+            return SessionClaims(
+                user_id=int(payload["sub"]),
+                username=str(payload["name"]),
+                expires_at=int(payload["exp"]),
+                token_id=str(payload["jti"]),
+            )
+        except (ValueError, KeyError, TypeError):
+            return None
+    
+    def stats(self) -> dict:
+        """Get session statistics (for monitoring)."""
+        return {
+            "ttl_seconds": self.ttl_seconds,
+            "issued": self.issued,
+            "verified": self.verified,
+            "rejected": self.rejected,
+            "revoked": len(self._revoked),
+        }
+
+
+# Singleton instance
+session_service = SessionService()
@@ -0,0 +1,136 @@
+"""Prefix suggestions over post title terms and category names."""
+
+import bisect
+import heapq
+import os
+from typing import Dict, List, Set, Tuple
+
+from src.domain.entities import Post
+from src.service.lru_cache import LRUCache
+from src.service.search_index_service import tokenize
+
+SUGGEST_CACHE_SIZE = int(os.getenv("SUGGEST_CACHE_SIZE", "4096"))
+# Suggestions kept per cached prefix (the largest limit served)
+MAX_SUGGESTIONS = 20
+
+# Suggestion kinds
+TERM = "term"
+CATEGORY = "category"
+
+
+class SuggestService:
+    """Service keeping a sorted array of suggestion keys with their popularity."""
+    
+    def __init__(self, cache_size: int = SUGGEST_CACHE_SIZE):
+        """Initialize an empty dictionary; it is filled at startup and by post writes."""
+        # Sorted (lowercase key, kind, display text); bisect finds a prefix range
+        self._entries: List[Tuple[str, str, str]] = []
+        # {(kind, display text): number of published posts using it}
+        self._popularity: Dict[Tuple[str, str], int] = {}
+        # {post_id: suggestions contributed by the post}
+        self._post_entries: Dict[int, Set[Tuple[str, str]]] = {}
+        # {prefix: top MAX_SUGGESTIONS}; a write drops the prefixes of the keys it touched
+        self.cache = LRUCache(max_entries=cache_size)
+        self.ready = False
+    
+    def add_post(self, post: Post) -> None:
+        """Add or replace the title terms and category names of a published post."""
+        self.remove_post(post.id)
+        
+        entries = {(TERM, term) for term in tokenize(post.title)}
+        entries.update((CATEGORY, category.name) for category in post.categories)
+        for entry in entries:
+            count = self._popularity.get(entry, 0)
+            kind, text = entry
+            if not count:
+                bisect.insort(self._entries, (text.lower(), kind, text))
+            self._popularity[entry] = count + 1
+            self._invalidate(text.lower())
+        
+        self._post_entries[post.id] = entries
+    
+    def remove_post(self, post_id: int) -> bool:
+        """Remove a post's contributions. Returns True if it was present."""
+        entries = self._post_entries.pop(post_id, None)
+        if entries is None:
+            return False
+        
+        for entry in entries:
+            count = self._popularity[entry] - 1
+            kind, text = entry
+            self._invalidate(text.lower())
+            if count:
+                self._popularity[entry] = count
+                continue
+            
+            del self._popularity[entry]
+            key = (text.lower(), kind, text)
+            del self._entries[bisect.bisect_left(self._entries, key)]
+        
+        return True
+    
+    def clear(self) -> None:
+        """Remove all suggestions."""
+        self._entries.clear()
+        self._popularity.clear()
+        self._post_entries.clear()
+        self.cache.clear()
+        self.ready = False
+    
+    def suggest(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Get the most popular suggestions starting with a prefix.
+        
+        Args:
+            prefix: Case-insensitive prefix
+            limit: Maximum number of suggestions
+            
+        Returns:
+            List of {text, type, popularity}, most popular first
+        """
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        
+        suggestions = self.cache.get(prefix)
+        if suggestions is not None:
+            return suggestions[:limit]
+        
+        start = bisect.bisect_left(self._entries, (prefix,))
+        end = bisect.bisect_left(self._entries, (prefix + "\U0010ffff",), start)
+        popularity = self._popularity
+        best = heapq.nlargest(
+            MAX_SUGGESTIONS,
+            self._entries[start:end],
+            key=lambda entry: popularity[(entry[1], entry[2])],
+        )
+        suggestions = [
+            {"text": text, "type": kind, "popularity": popularity[(kind, text)]}
+            for _, kind, text in best
+        ]
+        
+        self.cache.set(prefix, suggestions)
+        return suggestions[:limit]
+    
+    def _invalidate(self, key: str) -> None:
+        """Drop cached results of every prefix of a changed key."""
+        if not len(self.cache):
+            return
+        for end in range(1, len(key) + 1):
+            self.cache.delete(key[:end])
+    
+    def term_popularity(self, term: str) -> int:
+        """Get the number of published post titles using a term (0 if unknown)."""
+        return self._popularity.get((TERM, term), 0)
+    
+    def stats(self) -> dict:
+        """Get dictionary and cache statistics (for monitoring)."""
+        return {
+            "ready": self.ready,
+            "entries": len(self._entries),
+            "cache": self.cache.stats(),
+        }
+
+
+# Singleton instance
+suggest_service = SuggestService()
@@ -0,0 +1,67 @@
+"""Cache of user rows by ID, invalidated by user updates."""
+
+import os
+import threading
+from copy import copy
+from typing import Optional
+
+from src.domain.entities import User
+from src.service.lru_cache import LRUCache
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "4096"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+
+
+class UserCacheService:
+    """Service caching users by ID for read-through repositories."""
+    
+    def __init__(self, max_entries: int = USER_CACHE_SIZE, ttl_seconds: float = USER_CACHE_TTL_SECONDS):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached users (0 disables the cache)
+            ttl_seconds: Lifetime of an entry (bounds staleness after updates
+                made by other workers, which cannot invalidate this cache)
+        """
+        self.enabled = max_entries > 0
+        self.cache = LRUCache(max_entries=max(max_entries, 1), ttl_seconds=ttl_seconds)
+        self._version = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def version(self) -> int:
+        """Get the invalidation counter; take it before reading a user from the database."""
+        return self._version
+    
+    def get(self, user_id: int) -> Optional[User]:
+        """Get a copy of a cached user, or None."""
+        user = self.cache.get(user_id)
+        return copy(user) if user is not None else None
+    
+    def set(self, user: User, version: int) -> None:
+        """
+        Store a user read from the database.
+        
+        Args:
+            user: User entity
+            version: Value of version taken before the read; the user is not
+                stored if an invalidation happened since, as it may be stale
+        """
+        with self._lock:
+            if version == self._version:
+                self.cache.set(user.id, copy(user))
+    
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user after it was updated."""
+        with self._lock:
+            self._version += 1
+            self.cache.delete(user_id)
+    
+    def stats(self) -> dict:
+        """Get cache statistics (for monitoring)."""
+        return {"enabled": self.enabled, **self.cache.stats()}
+
+
+# Singleton instance
+user_cache_service = UserCacheService()
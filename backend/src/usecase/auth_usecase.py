@@ -3,7 +3,8 @@
 from typing import Optional
 from src.domain.entities import User
 from src.domain.repositories import UserRepository
-from src.service.auth_service import auth_service
+from src.service.about_service import about_service
+from src.service.auth_service import PasswordHashingBusyError, auth_service
 
 
 class RegisterUserUseCase:
@@ -25,6 +26,7 @@ class RegisterUserUseCase:
         
         Raises:
             ValueError: If username or email already exists
+            PasswordHashingBusyError: If too many passwords are being hashed
         """
         # Check if username exists
         existing_user = await self.user_repository.get_by_username(username)
@@ -37,7 +39,7 @@ class RegisterUserUseCase:
             raise ValueError("Email already exists")
         
         # Hash password
-        hashed_password = auth_service.hash_password(password)
+        hashed_password = await auth_service.hash_password_async(password)
         
         # Create user entity
         user = User(
@@ -62,8 +64,12 @@ class LoginUserUseCase:
         """
         Authenticate a user.
         
+        A password hashed with a cost other than BCRYPT_ROUNDS is rehashed
+        and stored, so changing the cost takes effect as users log in.
+        
         Raises:
             ValueError: If credentials are invalid
+            PasswordHashingBusyError: If too many passwords are being checked
         """
         # Get user by username
         user = await self.user_repository.get_by_username(username)
@@ -71,7 +77,52 @@ class LoginUserUseCase:
             raise ValueError("Invalid username or password")
         
         # Verify password
-        if not auth_service.verify_password(password, user.hashed_password):
+        if not await auth_service.verify_password_async(password, user.hashed_password):
             raise ValueError("Invalid username or password")
         
+        # Bring the hash to the configured cost while the password is at hand
+        if auth_service.needs_rehash(user.hashed_password):
+            try:
+                hashed_password = await auth_service.hash_password_async(password)
+            except PasswordHashingBusyError:
+                # The login stands; the hash is upgraded on a quieter login
+                return user
+            await self.user_repository.update_password(user.id, hashed_password)
+            user.hashed_password = hashed_password
+        
         return user
+
+
+class UpdateProfileUseCase:
+    """Use case for updating a user's profile."""
+    
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+    
+    async def execute(
+        self,
+        user_id: int,
+        full_name: Optional[str] = None,
+        bio: Optional[str] = None,
+    ) -> User:
+        """
+        Update a user's full name and bio; fields left as None are kept.
+        
+        The pre-rendered about page embeds its author's profile and is
+        dropped once the change commits.
+        
+        Raises:
+            ValueError: If user not found
+        """
+        user = await self.user_repository.get_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
+        
+        if full_name is not None:
+            user.full_name = full_name
+        if bio is not None:
+            user.bio = bio
+        
+        updated_user = await self.user_repository.update(user)
+        self.user_repository.after_commit(lambda: about_service.invalidate_author(user_id))
+        return updated_user
@@ -1,10 +1,122 @@
 """Use cases for post operations."""
 
-from typing import Optional, List
+from typing import Dict, Iterable, Optional, List, Tuple
 from datetime import datetime
-from src.domain.entities import Post, PostStatus
-from src.domain.repositories import PostRepository, CategoryRepository
+from fastapi.concurrency import run_in_threadpool
+from src.domain.entities import Post, PostStatus, SearchFilters, SearchResults, User
+from src.domain.repositories import PostRepository, CategoryRepository, UserRepository
+from src.service.compression_service import PrecompressedBody, compression_service
 from src.service.markdown_service import markdown_service
+from src.service.related_posts_service import related_posts_service
+from src.service.search_cache_service import search_cache_service
+from src.service.search_index_service import search_index_service, suggest_correction
+from src.service.suggest_service import suggest_service
+
+
+def _render(content_markdown: str) -> Tuple[str, Tuple[List[dict], List[int]], PrecompressedBody]:
+    """Render Markdown to HTML, its outline and its precompressed encodings."""
+    content_html = markdown_service.render(content_markdown)
+    outline = markdown_service.build_outline(content_html)
+    return content_html, outline, compression_service.compress(content_html.encode('utf-8'))
+
+
+async def _render_content(post: Post, content_markdown: str) -> None:
+    """
+    Render Markdown into the post's HTML, outline, precompressed encodings and ETag.
+    
+    Rendering, highlighting and brotli/gzip at their highest levels take
+    tens of milliseconds for a long post, so they run in the threadpool
+    rather than on the event loop.
+    """
+    content_html, outline, compressed = await run_in_threadpool(_render, content_markdown)
+    post.content_markdown = content_markdown
+    post.content_html = content_html
+    post.toc, post.section_offsets = outline
+    post.content_html_gzip = compressed.variants['gzip']
+    post.content_html_br = compressed.variants.get('br')
+    post.content_html_etag = compressed.etag
+
+
+def _sync_post_indexes(post: Post) -> None:
+    """Bring the in-process search structures in line with a committed post write."""
+    if post.status == PostStatus.PUBLISHED:
+        search_index_service.index_post(post)
+        suggest_service.add_post(post)
+    else:
+        search_index_service.unindex_post(post.id)
+        suggest_service.remove_post(post.id)
+
+
+def _drop_post_indexes(post_id: int) -> None:
+    """Remove a post whose deletion was committed from the in-process search structures."""
+    search_index_service.unindex_post(post_id)
+    suggest_service.remove_post(post_id)
+
+
+def sync_search_indexes() -> None:
+    """Apply post writes that other workers recorded in the shared search index log."""
+    changes, reloaded = search_index_service.sync()
+    if reloaded:
+        suggest_service.clear()
+        for post in search_index_service.stored_posts():
+            suggest_service.add_post(post)
+        suggest_service.ready = True
+    
+    for post_id, post in changes:
+        if post is not None:
+            suggest_service.add_post(post)
+        else:
+            suggest_service.remove_post(post_id)
+
+
+async def _refresh_related_posts(post_repository: PostRepository, post_id: int) -> None:
+    """
+    Store the related posts of a published or edited post, and update the
+    lists of other posts it enters or leaves.
+    
+    Similarities are computed in the threadpool, as scoring a post against a
+    large index would block the event loop.
+    """
+    if not related_posts_service.available:
+        return
+    sync_search_indexes()
+    
+    candidates = await run_in_threadpool(related_posts_service.candidates, post_id)
+    await post_repository.set_related(post_id, candidates[:related_posts_service.limit])
+    
+    similarities = dict(candidates)
+    other_ids = set(similarities) | set(await post_repository.get_referrer_ids(post_id))
+    lists = await post_repository.get_related_lists(sorted(other_ids))
+    for other_id in sorted(other_ids):
+        related = lists.get(other_id, [])
+        merged = related_posts_service.merge(related, post_id, similarities.get(other_id)) if related else None
+        if merged is None:
+            merged = await run_in_threadpool(related_posts_service.neighbours, other_id)
+        if merged != related:
+            await post_repository.set_related(other_id, merged)
+
+
+def _sync_after_commit(post_repository: PostRepository, post: Post, refresh_related: bool = False) -> None:
+    """
+    Update the search structures, and optionally related post lists, once a
+    post write commits, so a rolled back write never reaches them.
+    
+    Related post lists are written in a transaction of their own; if that
+    fails they are corrected by the next edit or rebuild.
+    """
+    post_repository.after_commit(lambda: _sync_post_indexes(post))
+    if refresh_related:
+        post_repository.after_commit(lambda: _refresh_related_posts(post_repository, post.id))
+
+
+async def _drop_related_posts(post_repository: PostRepository, post_id: int, referrer_ids: List[int]) -> None:
+    """Remove a deleted post's list and recompute the lists that included it."""
+    await post_repository.set_related(post_id, [])
+    if not related_posts_service.available:
+        return
+    for other_id in referrer_ids:
+        neighbours = await run_in_threadpool(related_posts_service.neighbours, other_id)
+        await post_repository.set_related(other_id, neighbours)
 
 
 class CreatePostUseCase:
@@ -34,9 +146,6 @@ class CreatePostUseCase:
         if existing_post:
             raise ValueError("Slug already exists")
         
-        # Render Markdown to HTML
-        content_html = markdown_service.render(content_markdown)
-        
         # Generate excerpt if not provided
         if not excerpt:
             excerpt = markdown_service.generate_excerpt(content_markdown)
@@ -45,15 +154,18 @@ class CreatePostUseCase:
         post = Post(
             title=title,
             slug=slug,
-            content_markdown=content_markdown,
-            content_html=content_html,
             excerpt=excerpt,
             status=PostStatus.DRAFT,
             author_id=author_id,
         )
         
+        # Render Markdown to HTML
+        await _render_content(post, content_markdown)
+        
         # Save to database
         created_post = await self.post_repository.create(post)
+        await self.post_repository.bump_search_generation()
+        _sync_after_commit(self.post_repository, created_post)
         
         return created_post
 
@@ -87,8 +199,7 @@ class UpdatePostUseCase:
             post.title = title
         
         if content_markdown:
-            post.content_markdown = content_markdown
-            post.content_html = markdown_service.render(content_markdown)
+            await _render_content(post, content_markdown)
             
             if not excerpt:
                 post.excerpt = markdown_service.generate_excerpt(content_markdown)
@@ -97,7 +208,14 @@ class UpdatePostUseCase:
             post.excerpt = excerpt
         
         # Save changes
-        return await self.post_repository.update(post)
+        updated_post = await self.post_repository.update(post)
+        await self.post_repository.bump_search_generation()
+        _sync_after_commit(
+            self.post_repository,
+            updated_post,
+            refresh_related=updated_post.status == PostStatus.PUBLISHED and bool(title or content_markdown),
+        )
+        return updated_post
 
 
 class PublishPostUseCase:
@@ -125,7 +243,10 @@ class PublishPostUseCase:
         post.status = PostStatus.PUBLISHED
         post.published_at = datetime.utcnow()
         
-        return await self.post_repository.update(post)
+        published_post = await self.post_repository.update(post)
+        await self.post_repository.bump_search_generation()
+        _sync_after_commit(self.post_repository, published_post, refresh_related=True)
+        return published_post
 
 
 class GetPostsUseCase:
@@ -154,15 +275,248 @@ class GetPostsUseCase:
         )
 
 
+class GetPostAuthorsUseCase:
+    """Use case for loading the authors of a page of posts."""
+    
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+    
+    async def execute(self, posts: Iterable) -> Dict[int, User]:
+        """
+        Load the distinct authors of posts (or search hits) in one lookup.
+        
+        Returns:
+            Authors keyed by user ID
+        """
+        author_ids = {post.author_id for post in posts if post.author_id is not None}
+        return await self.user_repository.get_by_ids(list(author_ids))
+
+
 class SearchPostsUseCase:
     """Use case for searching posts."""
     
     def __init__(self, post_repository: PostRepository):
         self.post_repository = post_repository
     
-    async def execute(self, query: str, limit: int = 10) -> List[Post]:
-        """Search posts by title or content."""
-        return await self.post_repository.search(query, limit)
+    async def execute(
+        self,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+        filters: Optional[SearchFilters] = None,
+    ) -> SearchResults:
+        """
+        Search published posts by title or content.
+        
+        Results are ranked by relevance once the index is built. Misspelled
+        terms produce a suggestion, whose results are shown when nothing
+        matched as typed.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of hits
+            offset: Number of hits to skip
+            filters: Category, author and publication date restrictions
+        
+        Returns:
+            Page of hits with snippets, the total number of matches, their
+            category and author facets and any suggestion
+        """
+        sync_search_indexes()
+        filters = filters or SearchFilters()
+        # Index results change with the index, database ones with committed writes
+        if search_index_service.ready:
+            generation = ("index", search_index_service.generation)
+        else:
+            generation = ("database", await self.post_repository.get_search_generation())
+        cache_key = search_cache_service.key(generation, query, limit, offset, *filters.key())
+        results = search_cache_service.get(cache_key)
+        if results is not None:
+            return results
+        
+        if search_index_service.ready:
+            suggestion = search_index_service.suggest_correction(query)
+        else:
+            suggestion = suggest_correction(query, suggest_service.term_popularity)
+        
+        results = await self._search(query, limit, offset, filters)
+        if not results.total and suggestion:
+            results = await self._search(suggestion, limit, offset, filters)
+            results.corrected = True
+        results.suggestion = suggestion
+        
+        search_cache_service.set(cache_key, results)
+        return results
+    
+    async def _search(self, query: str, limit: int, offset: int, filters: SearchFilters) -> SearchResults:
+        """Run a search on the index, or on the database until the index is built."""
+        if search_index_service.ready:
+            ranked, total, facets = search_index_service.faceted_search(query, limit, offset, filters)
+            return SearchResults(
+                hits=search_index_service.hits(ranked, query),
+                total=total,
+                category_facets=facets["categories"],
+                author_facets=facets["authors"],
+            )
+        
+        posts = await self.post_repository.search(query, limit, offset, filters)
+        total = await self.post_repository.count_search(query, filters)
+        category_facets, author_facets = (
+            await self.post_repository.search_facets(query, filters) if total else ([], [])
+        )
+        return SearchResults(
+            hits=[search_index_service.hit_from_post(post, query) for post in posts],
+            total=total,
+            category_facets=category_facets,
+            author_facets=author_facets,
+        )
+
+
+class RebuildSearchIndexUseCase:
+    """Use case for (re)building the in-process search index and suggestions from the database."""
+    
+    def __init__(self, post_repository: PostRepository):
+        self.post_repository = post_repository
+    
+    async def execute(self, batch_size: int = 500) -> int:
+        """
+        Index every published post.
+        
+        Returns:
+            Number of posts indexed
+        """
+        search_index_service.clear()
+        suggest_service.clear()
+        
+        count = 0
+        last_id = 0
+        while True:
+            posts = await self.post_repository.get_published_after(last_id, batch_size)
+            if not posts:
+                break
+            
+            for post in posts:
+                search_index_service.index_post(post)
+                suggest_service.add_post(post)
+                count += 1
+            
+            last_id = posts[-1].id
+        
+        search_index_service.ready = search_index_service.enabled
+        suggest_service.ready = True
+        return count
+
+
+class LoadSearchIndexUseCase:
+    """Use case for loading the search index at startup."""
+    
+    def __init__(self, post_repository: PostRepository):
+        self.post_repository = post_repository
+    
+    async def execute(self) -> int:
+        """
+        Open the saved index segment, or build the index from the database and save it.
+        
+        Returns:
+            Number of posts indexed
+        """
+        if search_index_service.load():
+            suggest_service.clear()
+            count = 0
+            for post in search_index_service.stored_posts():
+                suggest_service.add_post(post)
+                count += 1
+            suggest_service.ready = True
+            return count
+        
+        count = await RebuildSearchIndexUseCase(self.post_repository).execute()
+        # Another worker may have saved the same posts meanwhile
+        search_index_service.save(overwrite=False)
+        return count
+
+
+class GetRelatedPostsUseCase:
+    """Use case for reading a post's related posts."""
+    
+    def __init__(self, post_repository: PostRepository):
+        self.post_repository = post_repository
+    
+    async def execute(self, slug: str, limit: int = 5) -> List[Tuple[Post, float]]:
+        """
+        Get the stored related posts of a post.
+        
+        Returns:
+            List of (post, similarity), most similar first
+        
+        Raises:
+            ValueError: If post not found
+        """
+        related = await self.post_repository.get_related(slug, limit)
+        if related is None:
+            raise ValueError("Post not found")
+        return related
+
+
+class RebuildRelatedPostsUseCase:
+    """Use case for computing every published post's related posts from the search index."""
+    
+    def __init__(self, post_repository: PostRepository):
+        self.post_repository = post_repository
+    
+    async def execute(self) -> int:
+        """
+        Replace the related post list of every indexed post.
+        
+        Returns:
+            Number of lists written
+        
+        Raises:
+            ValueError: If the search index is disabled or not built
+        """
+        if not related_posts_service.available:
+            raise ValueError("Search index is not available")
+        
+        count = 0
+        for post in search_index_service.stored_posts():
+            await self.post_repository.set_related(post.id, related_posts_service.neighbours(post.id))
+            count += 1
+        return count
+
+
+class RerenderPostsUseCase:
+    """Use case for re-rendering stored posts (e.g. after renderer changes)."""
+    
+    def __init__(self, post_repository: PostRepository):
+        self.post_repository = post_repository
+    
+    async def execute(self, batch_size: int = 100) -> int:
+        """
+        Re-render every post's HTML and precompressed encodings.
+        
+        Search structures are refreshed from the new HTML once the
+        re-rendered posts commit, and cached searches are invalidated.
+        
+        Returns:
+            Number of posts re-rendered
+        """
+        count = 0
+        offset = 0
+        while True:
+            posts = await self.post_repository.get_all(limit=batch_size, offset=offset)
+            if not posts:
+                break
+            
+            for post in posts:
+                await _render_content(post, post.content_markdown)
+                updated_post = await self.post_repository.update(post)
+                _sync_after_commit(self.post_repository, updated_post)
+                count += 1
+            
+            offset += batch_size
+        
+        if count:
+            await self.post_repository.bump_search_generation()
+        return count
 
 
 class DeletePostUseCase:
@@ -173,4 +527,12 @@ class DeletePostUseCase:
     
     async def execute(self, post_id: int) -> bool:
         """Delete a post."""
-        return await self.post_repository.delete(post_id)
+        referrer_ids = await self.post_repository.get_referrer_ids(post_id)
+        deleted = await self.post_repository.delete(post_id)
+        if deleted:
+            await self.post_repository.bump_search_generation()
+            self.post_repository.after_commit(lambda: _drop_post_indexes(post_id))
+            self.post_repository.after_commit(
+                lambda: _drop_related_posts(self.post_repository, post_id, referrer_ids)
+            )
+        return deleted
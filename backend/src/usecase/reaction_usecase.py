@@ -0,0 +1,119 @@
+"""Use cases for reaction operations."""
+
+from typing import Dict, List, Optional, Tuple
+from src.domain.entities import ReactionType
+from src.domain.repositories import ReactionRepository
+from src.service.reaction_summary_service import RECONCILE_BATCH_SIZE, reaction_summary_service
+
+
+class ToggleReactionUseCase:
+    """Use case for toggling a user's reaction to a post."""
+    
+    def __init__(self, reaction_repository: ReactionRepository):
+        self.reaction_repository = reaction_repository
+    
+    async def execute(
+        self,
+        user_id: int,
+        post_id: int,
+        reaction_type: ReactionType,
+    ) -> Tuple[Optional[ReactionType], Dict[ReactionType, int]]:
+        """
+        Toggle a reaction and count the post's reactions in the same transaction.
+        
+        The counts are cached once the transaction commits. They include this
+        toggle; a concurrent toggle of the same post on another connection may
+        be missed, and the periodic reconcile corrects the cached counts.
+        
+        Returns:
+            Tuple of (the user's reaction afterwards or None, counts by type)
+        """
+        reaction = await self.reaction_repository.toggle(user_id, post_id, reaction_type)
+        counts = await self.reaction_repository.count_by_type(post_id)
+        self.reaction_repository.after_commit(lambda: reaction_summary_service.update(post_id, counts))
+        return reaction, counts
+
+
+class GetReactionSummaryUseCase:
+    """Use case for getting a post's reaction counts."""
+    
+    def __init__(self, reaction_repository: ReactionRepository):
+        self.reaction_repository = reaction_repository
+    
+    async def execute(self, post_id: int) -> Dict[ReactionType, int]:
+        """Get a post's reaction counts by type, from the cache when possible."""
+        counts = reaction_summary_service.get(post_id)
+        if counts is not None:
+            return counts
+        
+        version = reaction_summary_service.version
+        counts = await self.reaction_repository.count_by_type(post_id)
+        reaction_summary_service.store(post_id, counts, version)
+        return counts
+
+
+class GetReactionSummariesUseCase:
+    """Use case for getting the reaction counts of several posts at once."""
+    
+    def __init__(self, reaction_repository: ReactionRepository):
+        self.reaction_repository = reaction_repository
+    
+    async def execute(self, post_ids: List[int]) -> Dict[int, Dict[ReactionType, int]]:
+        """
+        Get reaction counts by type for each post, counting cache misses in one query.
+        
+        Returns:
+            Counts keyed by post ID, in the order requested (duplicates removed)
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        cached = reaction_summary_service.get_many(post_ids)
+        missing = [post_id for post_id in post_ids if post_id not in cached]
+        if missing:
+            version = reaction_summary_service.version
+            counted = await self.reaction_repository.count_by_type_for_posts(missing)
+            for post_id, counts in counted.items():
+                reaction_summary_service.store(post_id, counts, version)
+            cached.update(counted)
+        return {post_id: cached[post_id] for post_id in post_ids}
+
+
+class GetUserReactionsUseCase:
+    """Use case for getting a user's reactions to several posts at once."""
+    
+    def __init__(self, reaction_repository: ReactionRepository):
+        self.reaction_repository = reaction_repository
+    
+    async def execute(self, user_id: int, post_ids: List[int]) -> Dict[int, Optional[ReactionType]]:
+        """
+        Get the user's reaction type for each post in one query.
+        
+        Returns:
+            Reaction type keyed by post ID, None where the user has not
+            reacted, in the order requested (duplicates removed)
+        """
+        post_ids = list(dict.fromkeys(post_ids))
+        reactions = await self.reaction_repository.get_user_reaction_types(user_id, post_ids)
+        return {post_id: reactions.get(post_id) for post_id in post_ids}
+
+
+class ReconcileReactionSummariesUseCase:
+    """Use case for checking cached reaction counts against the table."""
+    
+    def __init__(self, reaction_repository: ReactionRepository):
+        self.reaction_repository = reaction_repository
+    
+    async def execute(self) -> int:
+        """
+        Recount the reactions of every cached post, in batches.
+        
+        Returns:
+            Number of posts whose cached counts were corrected
+        """
+        snapshot = reaction_summary_service.snapshot()
+        post_ids = list(snapshot)
+        corrected = 0
+        for start in range(0, len(post_ids), RECONCILE_BATCH_SIZE):
+            batch = post_ids[start:start + RECONCILE_BATCH_SIZE]
+            fresh_counts = await self.reaction_repository.count_by_type_for_posts(batch)
+            corrected += reaction_summary_service.reconcile(fresh_counts, snapshot)
+        return corrected
@@ -0,0 +1,23 @@
+"""Unit tests for about page service."""
+
+from datetime import datetime
+from src.service.about_service import AboutPageService
+
+
+def test_body_is_served_for_the_version_it_was_built_from():
+    """Test that the payload is reused while the author's updated_at is unchanged."""
+    service = AboutPageService()
+    version = datetime(2026, 10, 19, 9, 0)
+    
+    body = service.store(b"{}", version)
+    
+    assert service.body_for(version) is body
+
+
+def test_body_is_stale_once_another_worker_changes_the_author():
+    """Test that a newer updated_at from the database makes the payload stale."""
+    service = AboutPageService()
+    service.store(b"{}", datetime(2026, 10, 19, 9, 0))
+    
+    assert service.body_for(datetime(2026, 10, 19, 9, 5)) is None
+    assert AboutPageService().body_for(None) is None
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Unit tests for after-commit callbacks."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from src.driver.database.connection import commit, register_after_commit
+
+
+@pytest.fixture
+async def session():
+    """Create a session on an in-memory database."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_callbacks_run_after_commit_in_order(session):
+    """Test that sync and async callbacks run once the transaction commits."""
+    calls = []
+    
+    async def refresh():
+        await session.execute(text("SELECT 1"))
+        calls.append("async")
+    
+    await session.execute(text("SELECT 1"))
+    register_after_commit(session, lambda: calls.append("sync"))
+    register_after_commit(session, refresh)
+    assert calls == []
+    
+    await commit(session)
+    assert calls == ["sync", "async"]
+    
+    await commit(session)
+    assert calls == ["sync", "async"]
+
+
+@pytest.mark.asyncio
+async def test_callbacks_are_dropped_on_rollback(session):
+    """Test that a rolled back transaction never runs its callbacks."""
+    calls = []
+    
+    await session.execute(text("SELECT 1"))
+    register_after_commit(session, lambda: calls.append("rolled back"))
+    await session.rollback()
+    await commit(session)
+    
+    assert calls == []
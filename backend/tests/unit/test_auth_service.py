@@ -1,7 +1,16 @@
 """Unit tests for authentication service."""
 
+import asyncio
+import threading
 import pytest
-from src.service.auth_service import auth_service
+from src.service.auth_service import (
+    AuthService,
+    BCRYPT_MIN_ROUNDS,
+    BCRYPT_ROUNDS,
+    PasswordHashingBusyError,
+    auth_service,
+    calibrate_rounds,
+)
 
 
 def test_hash_password():
@@ -39,3 +48,66 @@ def test_different_hashes_for_same_password():
     assert hash1 != hash2
     assert auth_service.verify_password(password, hash1)
     assert auth_service.verify_password(password, hash2)
+
+
+@pytest.mark.asyncio
+async def test_async_hashing_runs_on_pool():
+    """Test that pool hashing round-trips and records its timings."""
+    service = AuthService(workers=2)
+    hashed = await service.hash_password_async("testpassword123")
+    
+    assert await service.verify_password_async("testpassword123", hashed) is True
+    assert await service.verify_password_async("wrongpassword", hashed) is False
+    assert service.stats()["completed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_quickly():
+    """Test that a full pool rejects new work and queued work gives up after the timeout."""
+    service = AuthService(workers=1, max_pending=2, queue_timeout=0.05)
+    release = threading.Event()
+    running = asyncio.ensure_future(service._run(release.wait))
+    await asyncio.sleep(0.01)
+    
+    # Queued behind the running job until the timeout
+    with pytest.raises(PasswordHashingBusyError):
+        await service._run(release.wait)
+    
+    # Still running; the stuck job keeps its slot while a second one queues
+    queued = asyncio.ensure_future(service.hash_password_async("testpassword123"))
+    await asyncio.sleep(0.01)
+    with pytest.raises(PasswordHashingBusyError):
+        await service.hash_password_async("testpassword123")
+    
+    release.set()
+    assert await running is True
+    await asyncio.gather(queued, return_exceptions=True)
+    stats = service.stats()
+    assert stats["rejected"] == 1
+    assert stats["timed_out"] >= 1
+    assert stats["pending"] == 0
+
+
+def test_hash_rounds():
+    """Test reading the cost factor of a hash."""
+    hashed = auth_service.hash_password("testpassword123")
+    
+    assert auth_service.hash_rounds(hashed) == BCRYPT_ROUNDS
+    assert auth_service.needs_rehash(hashed) is False
+    assert auth_service.hash_rounds("$2b$04$" + "a" * 53) == 4
+    assert auth_service.hash_rounds("plaintext") is None
+    assert auth_service.needs_rehash("$2b$04$" + "a" * 53) is (BCRYPT_ROUNDS != 4)
+
+
+def test_calibrate_rounds_stops_past_target():
+    """Test that calibration recommends the last cost within the target."""
+    recommended, measurements = calibrate_rounds(target_ms=0.0, samples=1)
+    
+    assert recommended == BCRYPT_MIN_ROUNDS
+    assert [rounds for rounds, _ in measurements] == [BCRYPT_MIN_ROUNDS]
+    
+    recommended, measurements = calibrate_rounds(target_ms=20.0, samples=1)
+    timings = dict(measurements)
+    
+    assert timings[recommended] <= 20.0 or recommended == BCRYPT_MIN_ROUNDS
+    assert measurements[-1][1] > 20.0
@@ -1,9 +1,11 @@
 """Unit tests for authentication use cases."""
 
+import bcrypt
 import pytest
-from src.usecase.auth_usecase import RegisterUserUseCase, LoginUserUseCase
+from src.usecase.auth_usecase import RegisterUserUseCase, LoginUserUseCase, UpdateProfileUseCase
 from src.domain.entities import User
-from src.service.auth_service import auth_service
+from src.service.about_service import ABOUT_AUTHOR_ID, about_service
+from src.service.auth_service import BCRYPT_ROUNDS, auth_service
 
 
 class MockUserRepository:
@@ -12,6 +14,7 @@ class MockUserRepository:
     def __init__(self):
         self.users = {}
         self.next_id = 1
+        self.callbacks = []
     
     async def create(self, user: User) -> User:
         user.id = self.next_id
@@ -30,6 +33,19 @@ class MockUserRepository:
             if user.email == email:
                 return user
         return None
+    
+    async def get_by_id(self, user_id: int):
+        return self.users.get(user_id)
+    
+    async def update(self, user: User) -> User:
+        self.users[user.id] = user
+        return user
+    
+    async def update_password(self, user_id: int, hashed_password: str) -> None:
+        self.users[user_id].hashed_password = hashed_password
+    
+    def after_commit(self, callback) -> None:
+        self.callbacks.append(callback)
 
 
 @pytest.mark.asyncio
@@ -112,3 +128,44 @@ async def test_login_user_invalid_password():
     # Try to login with wrong password
     with pytest.raises(ValueError, match="Invalid username or password"):
         await login_use_case.execute("testuser", "wrongpassword")
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_password_with_other_cost():
+    """Test that logging in upgrades a hash made with another cost factor."""
+    repo = MockUserRepository()
+    rounds = 4 if BCRYPT_ROUNDS != 4 else 5
+    old_hash = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+    await repo.create(User(username="testuser", email="test@example.com", hashed_password=old_hash))
+    
+    user = await LoginUserUseCase(repo).execute("testuser", "password123")
+    
+    stored = repo.users[user.id].hashed_password
+    assert stored != old_hash
+    assert auth_service.hash_rounds(stored) == BCRYPT_ROUNDS
+    assert auth_service.verify_password("password123", stored)
+    
+    # Already at the configured cost: left alone
+    await LoginUserUseCase(repo).execute("testuser", "password123")
+    assert repo.users[user.id].hashed_password == stored
+
+
+@pytest.mark.asyncio
+async def test_update_profile_drops_about_page_after_commit():
+    """Test that the about page is only rebuilt once the author's change commits."""
+    repo = MockUserRepository()
+    user = await repo.create(User(username="author", email="author@example.com", hashed_password="!"))
+    assert user.id == ABOUT_AUTHOR_ID
+    about_service.store(b"{}")
+    
+    updated = await UpdateProfileUseCase(repo).execute(user.id, bio="New bio")
+    
+    assert updated.bio == "New bio"
+    assert about_service.body is not None
+    
+    for callback in repo.callbacks:
+        callback()
+    assert about_service.body is None
+    
+    with pytest.raises(ValueError, match="User not found"):
+        await UpdateProfileUseCase(repo).execute(99, bio="Nobody")
@@ -0,0 +1,72 @@
+"""Unit tests for compression service."""
+
+import gzip
+import pytest
+from starlette.requests import Request
+from src.api.responses import precompressed_response
+from src.service.compression_service import compression_service
+
+
+def test_compress_produces_decodable_variants():
+    """Test that every variant decodes to the original body."""
+    data = b'{"title": "About This Blog"}' * 20
+    body = compression_service.compress(data)
+    
+    assert body.variants["identity"] == data
+    assert gzip.decompress(body.variants["gzip"]) == data
+    assert body.etag.startswith('"') and body.etag.endswith('"')
+
+
+def test_compress_etag_is_stable():
+    """Test that identical bodies get identical ETags."""
+    assert compression_service.compress(b"same").etag == compression_service.compress(b"same").etag
+    assert compression_service.compress(b"one").etag != compression_service.compress(b"two").etag
+
+
+def test_negotiate_prefers_brotli():
+    """Test that brotli wins over gzip when both are accepted."""
+    available = {"identity": b"", "gzip": b"", "br": b""}
+    
+    assert compression_service.negotiate("gzip, deflate, br", available) == "br"
+
+
+def test_negotiate_respects_quality_and_availability():
+    """Test q=0 exclusions and missing variants."""
+    available = {"identity": b"", "gzip": b""}
+    
+    assert compression_service.negotiate("br", available) == "identity"
+    assert compression_service.negotiate("gzip;q=0, br", available) == "identity"
+    assert compression_service.negotiate("*", available) == "gzip"
+    assert compression_service.negotiate(None, available) == "identity"
+
+
+def _request(**headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_each_encoding_has_its_own_etag():
+    """Test that identity and gzip bodies carry distinct validators, each revalidated on its own."""
+    body = compression_service.compress(b"<p>Hello</p>" * 20)
+    
+    plain = precompressed_response(_request(), body, "text/html", "no-cache")
+    gzipped = precompressed_response(_request(accept_encoding="gzip"), body, "text/html", "no-cache")
+    
+    assert plain.headers["etag"] == body.etag
+    assert gzipped.headers["etag"] != plain.headers["etag"]
+    assert gzipped.headers["content-encoding"] == "gzip"
+    
+    revalidated = precompressed_response(
+        _request(accept_encoding="gzip", if_none_match=f"W/{gzipped.headers['etag']}"),
+        body,
+        "text/html",
+        "no-cache",
+    )
+    assert revalidated.status_code == 304
+    
+    mismatched = precompressed_response(
+        _request(if_none_match=gzipped.headers["etag"]), body, "text/html", "no-cache"
+    )
+    assert mismatched.status_code == 200
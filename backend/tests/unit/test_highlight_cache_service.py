@@ -0,0 +1,102 @@
+"""Unit tests for highlight cache service."""
+
+import hashlib
+import inspect
+
+import markdown
+import pytest
+import pygments
+from markdown.extensions import codehilite, fenced_code
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from src.service.highlight_cache_service import HighlightCacheService, highlight_cache_service
+from src.service.markdown_service import markdown_service
+
+# Source hashes of the markdown==3.5.1 code mirrored in markdown_highlight.py
+MIRRORED_UPSTREAM = {
+    codehilite.CodeHilite.hilite: "68b00934c75f34ec",
+    codehilite.HiliteTreeprocessor.run: "b0869640e16d84b2",
+    codehilite.CodeHiliteExtension.extendMarkdown: "27d989f078745e3b",
+    fenced_code.FencedBlockPreprocessor.run: "421225ff4b1839ca",
+    fenced_code.FencedCodeExtension.extendMarkdown: "21a97f68b833cedc",
+}
+
+
+def test_highlight_reuses_cached_html():
+    """Test that identical snippets are highlighted once."""
+    cache = HighlightCacheService(path=None)
+    lexer = get_lexer_by_name("python")
+    
+    first = cache.highlight("x = 1\n", lexer, HtmlFormatter())
+    second = cache.highlight("x = 1\n", lexer, HtmlFormatter())
+    
+    assert first == second
+    assert cache.cache.hits == 1
+    assert cache.cache.misses == 1
+
+
+def test_highlight_key_includes_language_and_options():
+    """Test that language and formatter options are part of the key."""
+    cache = HighlightCacheService(path=None)
+    
+    cache.highlight("x = 1\n", get_lexer_by_name("python"), HtmlFormatter())
+    cache.highlight("x = 1\n", get_lexer_by_name("ruby"), HtmlFormatter())
+    cache.highlight("x = 1\n", get_lexer_by_name("python"), HtmlFormatter(linenos=True))
+    
+    assert len(cache.cache) == 3
+
+
+def test_highlight_cache_persists_to_file(tmp_path):
+    """Test that entries survive a save and reload."""
+    path = str(tmp_path / "highlight.json")
+    cache = HighlightCacheService(path=path)
+    html = cache.highlight("print(1)\n", get_lexer_by_name("python"), HtmlFormatter())
+    cache.save()
+    
+    reloaded = HighlightCacheService(path=path)
+    
+    assert len(reloaded.cache) == 1
+    assert reloaded.highlight("print(1)\n", get_lexer_by_name("python"), HtmlFormatter()) == html
+    assert reloaded.cache.hits == 1
+
+
+def test_markdown_code_blocks_use_highlight_cache():
+    """Test that the Markdown pipeline highlights through the shared cache."""
+    markdown = "```python\nanswer = 42\n```"
+    markdown_service.render_full(markdown)
+    hits = highlight_cache_service.cache.hits
+    
+    markdown_service.render_full(markdown)
+    
+    assert highlight_cache_service.cache.hits == hits + 1
+
+
+def test_markdown_indented_code_uses_highlight_cache():
+    """Test that indented code blocks are highlighted through the shared cache."""
+    markdown = "Intro\n\n    :::python\n    indented = True"
+    markdown_service.render_full(markdown)
+    hits = highlight_cache_service.cache.hits
+    
+    markdown_service.render_full(markdown)
+    
+    assert highlight_cache_service.cache.hits == hits + 1
+
+
+def test_markdown_library_is_not_patched():
+    """Test that the cache is wired in through extensions, not by patching CodeHilite."""
+    markdown_service.render_full("```python\nanswer = 42\n```")
+    
+    assert codehilite.highlight is pygments.highlight
+
+
+
+def test_mirrored_markdown_internals_are_unchanged():
+    """Test that the upstream code markdown_highlight.py mirrors has not changed.
+    
+    On failure, port the upstream changes into markdown_highlight.py, then
+    update the pin in requirements.txt and the hashes above.
+    """
+    assert markdown.__version__ == "3.5.1"
+    for function, expected in MIRRORED_UPSTREAM.items():
+        digest = hashlib.sha256(inspect.getsource(function).encode()).hexdigest()[:16]
+        assert digest == expected, function.__qualname__
@@ -1,6 +1,7 @@
 """Unit tests for Markdown service."""
 
 import pytest
+from hypothesis import example, given, settings, strategies as st
 from src.service.markdown_service import markdown_service
 
 
@@ -52,3 +53,119 @@ def test_generate_excerpt_short_content():
     
     assert excerpt == "Short content"
     assert not excerpt.endswith("...")
+
+
+# Building blocks for generated documents
+_words = st.text(alphabet="abcxyz _*`#-+>|=~!&[]()0123456789.\\", min_size=1, max_size=20)
+_inline = st.lists(_words, min_size=1, max_size=4).map(" ".join)
+_code = st.lists(
+    st.text(alphabet="abc xyz=()<>&\"'{};#-`~", max_size=20), max_size=4
+).map("\n".join)
+_markdown_block = st.one_of(
+    _inline,
+    _inline.map(lambda text: "# " + text),
+    _inline.map(lambda text: "## " + text),
+    st.tuples(st.sampled_from(["", "python", "js"]), _code).map(
+        lambda parts: "```" + parts[0] + "\n" + parts[1] + "\n```"
+    ),
+    _code.map(lambda code: "~~~\n" + code + "\n~~~"),
+    st.lists(_inline, min_size=1, max_size=3).map(lambda items: "\n".join("- " + i for i in items)),
+    st.lists(_inline, min_size=1, max_size=3).map(lambda items: "\n".join("1. " + i for i in items)),
+    _inline.map(lambda text: "> " + text),
+    _inline.map(lambda text: "    " + text),
+    _inline.map(lambda text: "Term\n: " + text),
+    st.just("| a | b |\n|---|---|\n| 1 | 2 |"),
+    st.just("---"),
+    st.just("Title\n====="),
+    st.just("Some <em>raw</em> html"),
+    st.just("   "),
+)
+_separator = st.sampled_from(["\n", "\n\n", "\n\n\n", "\n  \n", "\r\n\r\n", "\n\t\n"])
+
+
+@st.composite
+def _markdown_documents(draw):
+    blocks = draw(st.lists(_markdown_block, max_size=8))
+    document = ""
+    for block in blocks:
+        document += block + draw(_separator)
+    return document
+
+
+@settings(max_examples=300, deadline=None)
+@given(_markdown_documents())
+@example("     \n")
+def test_block_render_matches_full_render(markdown):
+    """Property: block-level rendering is identical to a full render."""
+    assert markdown_service.render(markdown) == markdown_service.render_full(markdown)
+
+
+def test_block_render_reuses_unchanged_blocks():
+    """Test that editing one block only renders that block."""
+    original = "# Intro\n\nFirst paragraph.\n\n```python\nx = 1\n```\n\nLast paragraph."
+    edited = original.replace("Last paragraph.", "Last paragraph, edited.")
+    markdown_service.render(original)
+    misses = markdown_service.block_cache.misses
+    
+    html = markdown_service.render(edited)
+    
+    assert markdown_service.block_cache.misses == misses + 1
+    assert html == markdown_service.render_full(edited)
+
+
+def test_document_scoped_markdown_renders_whole():
+    """Test that reference links disable block splitting."""
+    markdown = "See [docs][1].\n\nMore text.\n\n[1]: https://example.com"
+    
+    assert markdown_service.split_blocks(markdown) is None
+    assert 'href="https://example.com"' in markdown_service.render(markdown)
+
+
+def test_render_revision_reuses_base_revision_blocks():
+    """Test that preview revisions keep their blocks for the next preview."""
+    original = "# Draft\n\nFirst paragraph.\n\nSecond paragraph."
+    html, revision = markdown_service.render_revision(original)
+    markdown_service.block_cache.clear()
+    misses = markdown_service.block_cache.misses
+    
+    edited = original + "\n\nThird paragraph."
+    edited_html, edited_revision = markdown_service.render_revision(edited, base_revision=revision)
+    
+    assert markdown_service.block_cache.misses == misses + 1
+    assert edited_html == markdown_service.render_full(edited)
+    assert edited_revision != revision
+
+
+def test_excerpt_from_html():
+    """Test excerpt generation from rendered HTML."""
+    html = markdown_service.render("**Bold** text with [a link](https://example.com).")
+    
+    assert markdown_service.excerpt_from_html(html) == "Bold text with a link."
+
+
+def test_build_outline_splits_sections_at_top_level_headings():
+    """Test table of contents and section boundaries."""
+    html = markdown_service.render(
+        "# Title\n\nIntro.\n\n## Setup\n\n> ## Quoted\n\n### Details\n\n## Usage\n\nEnd."
+    )
+    
+    toc, offsets = markdown_service.build_outline(html)
+    
+    assert [entry["title"] for entry in toc] == ["Title", "Setup", "Details", "Usage"]
+    assert [entry["section"] for entry in toc] == [0, 1, 1, 2]
+    assert len(offsets) == 3
+    assert html[offsets[1]:].startswith("<h2>Setup</h2>")
+    assert html[offsets[2]:].startswith("<h2>Usage</h2>")
+
+
+def test_render_full_is_thread_safe():
+    """Test that concurrent renders each use their own Markdown processor."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    documents = [f"# Doc {i}\n\n" + "\n\n".join(f"Para {i}.{j} *x*" for j in range(50)) for i in range(8)]
+    expected = [markdown_service.render_full(document) for document in documents]
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        rendered = list(pool.map(markdown_service.render_full, documents * 4))
+    
+    assert rendered == expected * 4
@@ -0,0 +1,69 @@
+"""Unit tests for rate limiting."""
+
+import pytest
+from src.service.rate_limit_service import DEFAULT_RATE_LIMITS, RateLimitService, parse_rules
+
+
+def test_parse_rules():
+    """Test parsing rules from configuration."""
+    rules = parse_rules("POST /api/auth/login 10/60 ip; POST,delete /api/posts 5/1 user;")
+    
+    assert len(rules) == 2
+    assert rules[0].limit == 10 and rules[0].period == 60 and rules[0].key == "ip"
+    assert rules[1].methods == frozenset({"POST", "DELETE"})
+    
+    with pytest.raises(ValueError):
+        parse_rules("POST /api/auth/login 10 ip")
+    with pytest.raises(ValueError):
+        parse_rules("POST /api/auth/login 10/60 cookie")
+
+
+def test_match_uses_method_and_path_prefix():
+    """Test that rules match their method and path segment prefix only."""
+    service = RateLimitService(parse_rules("POST /api/posts 1/1 user; GET /api/search 1/1 ip"))
+    
+    assert service.match("POST", "/api/posts") == 0
+    assert service.match("POST", "/api/posts/3/publish") == 0
+    assert service.match("GET", "/api/posts") is None
+    assert service.match("GET", "/api/search/suggest") == 1
+    assert service.match("GET", "/api/searches") is None
+
+
+def test_suggestions_have_their_own_default_limit():
+    """Test that per-keystroke suggestions do not spend the search limit."""
+    service = RateLimitService(parse_rules(DEFAULT_RATE_LIMITS))
+    search = service.match("GET", "/api/search")
+    suggest = service.match("GET", "/api/search/suggest")
+    
+    assert suggest != search
+    assert service.rules[suggest].limit > service.rules[search].limit
+    assert [service.acquire(suggest, 1, now=0.0) for _ in range(60)] == [0.0] * 60
+    assert service.acquire(search, 1, now=0.0) == 0.0
+
+
+def test_bucket_refuses_burst_and_refills():
+    """Test that a client gets its burst, then waits for tokens to refill."""
+    service = RateLimitService(parse_rules("POST /api/auth/login 3/60 ip"))
+    
+    assert [service.acquire(0, "1.2.3.4", now=0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    wait = service.acquire(0, "1.2.3.4", now=0.0)
+    assert wait == pytest.approx(20.0)
+    assert service.retry_after(wait) == "20"
+    
+    # Other clients have their own buckets
+    assert service.acquire(0, "5.6.7.8", now=0.0) == 0.0
+    
+    assert service.acquire(0, "1.2.3.4", now=19.0) > 0
+    assert service.acquire(0, "1.2.3.4", now=40.0) == 0.0
+
+
+def test_buckets_are_bounded():
+    """Test that the least recently seen clients are evicted past the bound."""
+    service = RateLimitService(parse_rules("POST /api/auth/login 1/60 ip"), max_clients=100)
+    
+    for client in range(1000):
+        service.acquire(0, client, now=0.0)
+    
+    stats = service.stats()
+    assert stats["clients"] == 100
+    assert stats["evictions"] == 900
@@ -0,0 +1,141 @@
+"""Unit tests for the reaction summary cache."""
+
+import pytest
+from src.domain.entities import ReactionType
+from src.service.reaction_summary_service import ReactionSummaryService, reaction_summary_service
+from src.usecase.reaction_usecase import (
+    GetReactionSummariesUseCase,
+    GetUserReactionsUseCase,
+    ToggleReactionUseCase,
+)
+
+
+def _counts(**counts):
+    return {reaction_type: counts.get(reaction_type.value, 0) for reaction_type in ReactionType}
+
+
+def test_store_skips_counts_read_before_a_toggle():
+    """Test that a miss racing a toggle does not overwrite the toggle's counts."""
+    service = ReactionSummaryService(max_entries=16)
+    version = service.version
+    
+    service.update(1, _counts(like=2))
+    service.store(1, _counts(like=1), version)
+    
+    assert service.get(1) == _counts(like=2)
+
+
+def test_get_returns_copies():
+    """Test that callers cannot modify cached counts."""
+    service = ReactionSummaryService(max_entries=16)
+    service.store(1, _counts(love=1), service.version)
+    
+    service.get(1)[ReactionType.LOVE] = 5
+    
+    assert service.get(1) == _counts(love=1)
+
+
+def test_reconcile_corrects_stale_counts():
+    """Test that reconciliation replaces counts changed elsewhere, except posts toggled since."""
+    service = ReactionSummaryService(max_entries=16)
+    service.store(1, _counts(like=1), service.version)
+    service.store(2, _counts(like=1), service.version)
+    service.store(3, _counts(), service.version)
+    snapshot = service.snapshot()
+    
+    # Post 2 is toggled here while the recount runs
+    service.update(2, _counts(like=2))
+    corrected = service.reconcile(
+        {1: _counts(like=3), 2: _counts(like=1), 3: _counts()},
+        snapshot,
+    )
+    
+    assert corrected == 1
+    assert service.get(1) == _counts(like=3)
+    assert service.get(2) == _counts(like=2)
+    assert service.stats()["corrections"] == 1
+
+
+class CountingReactionRepository:
+    """Reaction repository recording batched count queries."""
+    
+    def __init__(self):
+        self.queries = []
+    
+    async def count_by_type_for_posts(self, post_ids):
+        self.queries.append(list(post_ids))
+        return {post_id: _counts(like=post_id) for post_id in post_ids}
+
+
+@pytest.mark.asyncio
+async def test_batch_summaries_count_only_cache_misses():
+    """Test that a batch serves cached posts and counts the rest in one query."""
+    reaction_summary_service.cache.clear()
+    reaction_summary_service.update(1001, _counts(wow=1))
+    repo = CountingReactionRepository()
+    
+    counts = await GetReactionSummariesUseCase(repo).execute([1002, 1001, 1003, 1002])
+    
+    assert list(counts) == [1002, 1001, 1003]
+    assert counts[1001] == _counts(wow=1)
+    assert counts[1003] == _counts(like=1003)
+    assert repo.queries == [[1002, 1003]]
+    
+    await GetReactionSummariesUseCase(repo).execute([1001, 1002, 1003])
+    assert len(repo.queries) == 1
+
+
+class UserReactionsRepository:
+    """Reaction repository holding one user's reactions."""
+    
+    def __init__(self, reactions):
+        self.reactions = reactions
+        self.queries = []
+    
+    async def get_user_reaction_types(self, user_id, post_ids):
+        self.queries.append((user_id, list(post_ids)))
+        return {post_id: self.reactions[post_id] for post_id in post_ids if post_id in self.reactions}
+
+
+@pytest.mark.asyncio
+async def test_user_reactions_fill_unreacted_posts_with_none():
+    """Test that a user's reactions are looked up in one query, None where absent."""
+    repo = UserReactionsRepository({2: ReactionType.WOW})
+    
+    reactions = await GetUserReactionsUseCase(repo).execute(7, [3, 2, 3])
+    
+    assert reactions == {3: None, 2: ReactionType.WOW}
+    assert list(reactions) == [3, 2]
+    assert repo.queries == [(7, [3, 2])]
+
+
+class TogglingReactionRepository:
+    """Reaction repository holding after-commit callbacks until told to commit."""
+    
+    def __init__(self):
+        self.callbacks = []
+    
+    async def toggle(self, user_id, post_id, reaction_type):
+        return reaction_type
+    
+    async def count_by_type(self, post_id):
+        return _counts(like=1)
+    
+    def after_commit(self, callback):
+        self.callbacks.append(callback)
+
+
+@pytest.mark.asyncio
+async def test_toggle_caches_counts_only_after_commit():
+    """Test that a toggle's counts reach the cache once its transaction commits."""
+    reaction_summary_service.cache.clear()
+    repo = TogglingReactionRepository()
+    
+    reaction, counts = await ToggleReactionUseCase(repo).execute(7, 2001, ReactionType.LIKE)
+    
+    assert reaction == ReactionType.LIKE and counts == _counts(like=1)
+    assert reaction_summary_service.get(2001) is None
+    
+    for callback in repo.callbacks:
+        callback()
+    assert reaction_summary_service.get(2001) == _counts(like=1)
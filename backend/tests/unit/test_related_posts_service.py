@@ -0,0 +1,32 @@
+"""Unit tests for related posts service."""
+
+from src.service.related_posts_service import RelatedPostsService
+from src.service.search_index_service import SearchIndexService
+
+
+def test_merge_inserts_and_reorders():
+    """Test that a changed post enters a list at its new score and the list stays bounded."""
+    service = RelatedPostsService(SearchIndexService(), limit=3)
+    related = [(1, 0.9), (2, 0.5), (3, 0.2)]
+    
+    assert service.merge(related, 4, 0.6) == [(1, 0.9), (4, 0.6), (2, 0.5)]
+    assert service.merge(related, 3, 0.7) == [(1, 0.9), (3, 0.7), (2, 0.5)]
+    assert service.merge(related, 4, None) == related
+
+
+def test_merge_requests_recompute_when_an_entry_leaves():
+    """Test that a list losing a post is recomputed rather than left short."""
+    service = RelatedPostsService(SearchIndexService(), limit=3)
+    
+    assert service.merge([(1, 0.9), (2, 0.5)], 2, None) is None
+    assert service.merge([(1, 0.9)], 2, 0.1) == [(1, 0.9), (2, 0.1)]
+
+
+def test_merge_requests_recompute_when_an_entry_of_a_full_list_drops():
+    """Test that a full list is recomputed when one of its posts scores lower, as an outsider may now beat it."""
+    service = RelatedPostsService(SearchIndexService(), limit=3)
+    related = [(1, 0.9), (2, 0.5), (3, 0.2)]
+    
+    assert service.merge(related, 1, 0.3) is None
+    assert service.merge(related, 3, 0.1) is None
+    assert service.merge([(1, 0.9), (2, 0.5)], 1, 0.3) == [(2, 0.5), (1, 0.3)]
@@ -0,0 +1,25 @@
+"""Unit tests for API schemas."""
+
+import pytest
+from pydantic import ValidationError
+from src.api.schemas import MarkdownPreviewRequest, PostCreate, PostUpdate
+from src.service.markdown_service import MARKDOWN_MAX_CHARS
+
+
+def test_post_markdown_is_limited():
+    """Test that saved posts share the Markdown size limit."""
+    PostCreate(title="Title", slug="title", content_markdown="x" * MARKDOWN_MAX_CHARS)
+    PostUpdate(content_markdown="x" * MARKDOWN_MAX_CHARS)
+    
+    with pytest.raises(ValidationError):
+        PostCreate(title="Title", slug="title", content_markdown="x" * (MARKDOWN_MAX_CHARS + 1))
+    with pytest.raises(ValidationError):
+        PostUpdate(content_markdown="x" * (MARKDOWN_MAX_CHARS + 1))
+
+
+def test_preview_markdown_is_limited():
+    """Test that previews share the Markdown size limit."""
+    MarkdownPreviewRequest(content_markdown="x" * MARKDOWN_MAX_CHARS)
+    
+    with pytest.raises(ValidationError):
+        MarkdownPreviewRequest(content_markdown="x" * (MARKDOWN_MAX_CHARS + 1))
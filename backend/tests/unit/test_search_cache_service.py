@@ -0,0 +1,36 @@
+"""Unit tests for search cache service."""
+
+import pytest
+from src.service.search_cache_service import SearchCacheService
+from src.service.search_index_service import SearchIndexService
+
+
+def test_key_normalises_query():
+    """Test that case and whitespace differences share a cache entry."""
+    cache = SearchCacheService()
+    
+    assert cache.key(0, "  Async   Python ", 10) == cache.key(0, "async python", 10)
+    assert cache.key(0, "async python", 10) != cache.key(0, "async python", 20)
+
+
+def test_new_generation_invalidates_results():
+    """Test that results stored before a write are not served after it."""
+    cache = SearchCacheService()
+    key = cache.key(0, "python", 10)
+    cache.set(key, [1, 2])
+    
+    assert cache.get(cache.key(0, "python", 10)) == [1, 2]
+    assert cache.get(cache.key(1, "python", 10)) is None
+
+
+def test_results_computed_across_a_write_are_not_served():
+    """Test that a key taken before a write stores under the old generation."""
+    cache = SearchCacheService()
+    index = SearchIndexService()
+    key = cache.key(index.generation, "python", 10)
+    index.add_document(1, "Python tips", "generators")
+    cache.set(key, [1])
+    
+    assert cache.get(cache.key(index.generation, "python", 10)) is None
+    assert cache.stats()["hit_rate"] == 0.0
+
@@ -0,0 +1,297 @@
+"""Unit tests for search index service."""
+
+import random
+import pytest
+from datetime import datetime
+from src.domain.entities import Post, Category, SearchFilters
+from src.service.search_index_service import SearchIndexService, build_snippet, edits1, tokenize
+
+
+@pytest.fixture
+def index():
+    """Create a small index."""
+    index = SearchIndexService()
+    index.add_document(1, "Python tips", "Short notes about generators and decorators.")
+    index.add_document(2, "Cooking pasta", "Boil water. Python is not an ingredient.")
+    index.add_document(3, "Async Python", "Python coroutines, Python event loops and Python tasks.")
+    return index
+
+
+def test_tokenize_lowercases_words():
+    """Test that tokens are lowercase words without punctuation."""
+    assert tokenize("Hello, World! FastAPI_2") == ["hello", "world", "fastapi_2"]
+
+
+def test_search_ranks_by_relevance(index):
+    """Test that documents about the query term rank first and others are excluded."""
+    results, total = index.search("python")
+    
+    assert [post_id for post_id, _ in results][-1] == 2
+    assert {post_id for post_id, _ in results} == {1, 2, 3}
+    assert total == 3
+    assert index.search("pasta")[0][0][0] == 2
+    assert index.search("missing") == ([], 0)
+
+
+def test_title_matches_outweigh_body_matches():
+    """Test that a title occurrence counts for more than a body occurrence."""
+    index = SearchIndexService()
+    index.add_document(1, "Unrelated", "fastapi routing")
+    index.add_document(2, "FastAPI", "unrelated routing")
+    
+    assert index.search("fastapi")[0][0][0] == 2
+
+
+def test_search_paginates_with_true_total(index):
+    """Test that pages follow the ranking and the total counts every match."""
+    ranked, _ = index.search("python", limit=3)
+    first_page, total = index.search("python", limit=2)
+    second_page, _ = index.search("python", limit=2, offset=2)
+    
+    assert first_page + second_page == ranked
+    assert total == 3
+    assert index.search("python generators")[1] == 3
+
+
+def test_replace_and_remove_document(index):
+    """Test that re-adding replaces a document and removing drops its postings."""
+    index.add_document(2, "Cooking rice", "Rinse first.")
+    assert 2 not in {post_id for post_id, _ in index.search("python")[0]}
+    assert index.search("rice")[0][0][0] == 2
+    
+    assert index.remove_document(2) is True
+    assert index.remove_document(2) is False
+    assert index.search("rice") == ([], 0)
+    assert index.stats()["documents"] == 2
+
+
+def test_hits_come_from_stored_fields():
+    """Test that hits carry post fields and a highlighted snippet."""
+    index = SearchIndexService()
+    index.index_post(Post(
+        id=7,
+        title="Async Python",
+        slug="async-python",
+        content_html="<p>Event loops run <em>Python</em> coroutines &amp; tasks.</p>",
+        author_id=1,
+        categories=[Category(id=2, name="Programming")],
+    ))
+    
+    hits = index.hits(index.search("python")[0], "python")
+    
+    assert len(hits) == 1
+    assert hits[0].slug == "async-python"
+    assert hits[0].categories[0].name == "Programming"
+    assert hits[0].snippet == "Event loops run <mark>Python</mark> coroutines &amp; tasks."
+
+
+def test_build_snippet_centres_on_matches():
+    """Test that long texts are cut around the densest run of matches."""
+    text = "filler " * 100 + "the python asyncio guide for python users " + "filler " * 100
+    snippet = build_snippet(text, {"python", "asyncio"}, length=80)
+    
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert snippet.count("<mark>") == 3
+    assert len(snippet) < 80 + 3 * len("<mark></mark>") + 2
+
+
+def _indexed_post(post_id, title, body, category_ids=(), author_id=1, published_at=None):
+    return Post(
+        id=post_id,
+        title=title,
+        slug=f"post-{post_id}",
+        content_html=f"<p>{body}</p>",
+        author_id=author_id,
+        published_at=published_at,
+        categories=[Category(id=i, name=f"Category {i}", slug=f"category-{i}") for i in category_ids],
+    )
+
+
+def test_saved_segment_ranks_like_memory(tmp_path):
+    """Test that a saved and reloaded index returns the same results."""
+    index = SearchIndexService(path=str(tmp_path / "index"))
+    index.index_post(_indexed_post(1, "Python tips", "generators and decorators", [1]))
+    index.index_post(_indexed_post(2, "Cooking pasta", "python is not food"))
+    index.index_post(_indexed_post(3, "Async Python", "python coroutines and python tasks"))
+    before = index.search("python")
+    
+    index.save()
+    loaded = SearchIndexService(path=str(tmp_path / "index"))
+    
+    assert loaded.load() is True
+    assert loaded.stats()["segment_documents"] == 3
+    after = loaded.search("python")
+    assert [post_id for post_id, _ in after[0]] == [post_id for post_id, _ in before[0]]
+    assert after[1] == before[1]
+    assert loaded.hits(loaded.search("generators")[0], "generators")[0].categories[0].name == "Category 1"
+
+
+def test_search_skips_blocks_that_cannot_reach_the_top(tmp_path):
+    """Test that a common term's postings are mostly skipped for a short top list, in both tiers."""
+    index = SearchIndexService(path=str(tmp_path / "index"))
+    filler = " ".join(f"word{i}" for i in range(100))
+    for post_id in range(1, 2001):
+        index.index_post(_indexed_post(post_id, "Post", f"common {filler}"))
+    for post_id in range(2001, 2006):
+        index.index_post(_indexed_post(post_id, "Post", "common " * 8))
+    
+    for _ in range(2):
+        scored = index.postings_scored
+        ranked, total = index.search("common", limit=5)
+        
+        assert {post_id for post_id, _ in ranked} == set(range(2001, 2006))
+        assert total == 2005
+        assert index.postings_scored - scored <= 2 * 128
+        index.save()
+
+
+def test_pruned_search_matches_scoring_every_posting(tmp_path):
+    """Test that pages of a pruned search equal those of ranking every match."""
+    random.seed(7)
+    words = [f"word{i}" for i in range(30)]
+    index = SearchIndexService(path=str(tmp_path / "index"))
+    for post_id in range(1, 1501):
+        index.index_post(_indexed_post(
+            post_id,
+            " ".join(random.choices(words, k=2)),
+            " ".join(random.choices(words, weights=range(30, 0, -1), k=random.randint(1, 80))),
+            random.sample([1, 2, 3], random.randint(0, 2)),
+            random.randint(1, 3),
+        ))
+        if post_id == 1000:
+            index.save()
+    for post_id in range(1, 1000, 5):
+        index.unindex_post(post_id)
+    
+    for query in ["word0", "word0 word1", "word2 word9 word0", "word29", "word3 word4 word5 word6"]:
+        for filters in [None, SearchFilters(category_id=2), SearchFilters(author_id=3)]:
+            everything, total = index.search(query, limit=2000, filters=filters)
+            for limit, offset in [(10, 0), (5, 15), (1, 0)]:
+                ranked, page_total = index.search(query, limit, offset, filters)
+                expected = everything[offset:offset + limit]
+                assert page_total == total
+                assert [post_id for post_id, _ in ranked] == [post_id for post_id, _ in expected]
+                assert [score for _, score in ranked] == pytest.approx([score for _, score in expected])
+
+
+def test_workers_share_writes_through_delta_log(tmp_path):
+    """Test that writes after a snapshot reach other processes, and saves are picked up."""
+    path = str(tmp_path / "index")
+    first = SearchIndexService(path=path)
+    first.index_post(_indexed_post(1, "Python tips", "generators"))
+    first.index_post(_indexed_post(2, "Cooking pasta", "python food"))
+    first.save()
+    second = SearchIndexService(path=path)
+    second.load()
+    
+    first.index_post(_indexed_post(3, "Rust tips", "ownership"))
+    first.unindex_post(2)
+    changes, reloaded = second.sync()
+    
+    assert [post_id for post_id, _ in changes] == [3, 2]
+    assert reloaded is False
+    assert [post_id for post_id, _ in second.search("python")[0]] == [1]
+    assert second.search("rust")[0][0][0] == 3
+    
+    second.index_post(_indexed_post(1, "Go tips", "goroutines"))
+    second.save()
+    
+    assert first.sync()[1] is True
+    assert first.search("python") == ([], 0)
+    assert sorted(post.id for post in first.stored_posts()) == [1, 3]
+
+
+def test_generation_follows_shared_delta_log(tmp_path):
+    """Test that another worker's write moves the generation once synced."""
+    path = str(tmp_path / "index")
+    first = SearchIndexService(path=path)
+    first.index_post(_indexed_post(1, "Python tips", "generators"))
+    first.save()
+    second = SearchIndexService(path=path)
+    second.load()
+    generation = second.generation
+    
+    second.sync()
+    assert second.generation == generation
+    
+    first.unindex_post(1)
+    second.sync()
+    assert second.generation != generation
+
+
+def test_suggest_correction_fixes_unknown_terms(index):
+    """Test that misspelled terms are replaced by their most frequent neighbour."""
+    assert index.suggest_correction("pyhton") == "python"
+    assert index.suggest_correction("pythn decorators") == "python decorators"
+    assert index.suggest_correction("python") is None
+    assert index.suggest_correction("xyzzyq") is None
+
+
+def test_edits1_is_bounded_by_term_length():
+    """Test that candidate generation depends on the term, not the vocabulary."""
+    candidates = edits1("typo")
+    
+    assert {"tpyo", "typ", "typos", "tyxo"} <= candidates
+    assert "typo" not in candidates
+    assert len(candidates) < 100 * len("typo")
+
+
+def _facet_counts(index, query, filters=None):
+    ranked, total, facets = index.faceted_search(query, filters=filters)
+    return (
+        sorted(post_id for post_id, _ in ranked),
+        total,
+        {category.id: count for category, count in facets["categories"]},
+        dict(facets["authors"]),
+    )
+
+
+def test_filters_and_facets_match_in_memory_and_saved(tmp_path):
+    """Test that filters narrow the matches and facets count all of them, before and after a save."""
+    index = SearchIndexService(path=str(tmp_path / "index"))
+    index.index_post(_indexed_post(1, "Python tips", "python", [1], 1, datetime(2026, 1, 5)))
+    index.index_post(_indexed_post(2, "Python web", "python", [1, 2], 2, datetime(2026, 2, 5)))
+    index.index_post(_indexed_post(3, "Python data", "python", [2], 2, datetime(2026, 3, 5)))
+    index.index_post(_indexed_post(4, "Cooking", "pasta", [3], 1, datetime(2026, 3, 6)))
+    
+    for _ in range(2):
+        assert _facet_counts(index, "python") == ([1, 2, 3], 3, {1: 2, 2: 2}, {1: 1, 2: 2})
+        assert _facet_counts(index, "python", SearchFilters(category_id=2))[:2] == ([2, 3], 2)
+        assert _facet_counts(index, "python", SearchFilters(author_id=1))[:2] == ([1], 1)
+        in_february = SearchFilters(published_from=datetime(2026, 2, 1), published_to=datetime(2026, 2, 28))
+        assert _facet_counts(index, "python", in_february) == ([2], 1, {1: 1, 2: 1}, {2: 1})
+        index.save()
+    
+    # Overlay documents are filtered and counted alongside the segment
+    index.index_post(_indexed_post(5, "Python again", "python", [2], 3, datetime(2026, 2, 10)))
+    assert _facet_counts(index, "python", in_february) == ([2, 5], 2, {1: 1, 2: 2}, {2: 1, 3: 1})
+
+
+def test_similar_documents_share_distinctive_terms(tmp_path):
+    """Test that TF-IDF similarity favours shared rare terms, before and after a save."""
+    index = SearchIndexService(path=str(tmp_path / "index"))
+    index.index_post(_indexed_post(1, "Python decorators", "decorators wrap python functions"))
+    index.index_post(_indexed_post(2, "Python generators", "generators yield python values"))
+    index.index_post(_indexed_post(3, "Cooking pasta", "boil pasta in salted water"))
+    index.index_post(_indexed_post(4, "Class decorators", "decorators for python classes"))
+    
+    before = index.similar(1)
+    index.save()
+    after = index.similar(1)
+    
+    assert [post_id for post_id, _ in before] == [4, 2]
+    assert [post_id for post_id, _ in after] == [4, 2]
+    assert after[0][1] == pytest.approx(before[0][1], rel=1e-5)
+    assert 0 < after[1][1] < after[0][1] <= 1
+    assert index.similar(3) == []
+
+
+def test_similar_skips_terms_in_almost_every_document():
+    """Test that a term nearly every document contains does not make documents similar."""
+    index = SearchIndexService()
+    for post_id in range(1, 11):
+        index.add_document(post_id, f"Post {post_id}", f"common unique{post_id}")
+    index.add_document(11, "Post 11", "unique1")
+    
+    assert [post_id for post_id, _ in index.similar(1)] == [11]
+    assert index.similar(2) == []
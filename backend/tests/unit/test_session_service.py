@@ -0,0 +1,65 @@
+"""Unit tests for signed session tokens."""
+
+from src.service.session_service import SessionService
+
+
+NOW = 1_700_000_000.0
+
+
+def test_issued_token_verifies():
+    """Test that a fresh token carries the user id and username."""
+    service = SessionService("secret", ttl_seconds=60)
+    token = service.issue(7, "alice", now=NOW)
+    
+    claims = service.verify(token, now=NOW + 1)
+    
+    assert claims is not None
+    assert claims.user_id == 7
+    assert claims.username == "alice"
+    assert claims.expires_at == int(NOW) + 60
+
+
+def test_tampered_token_is_rejected():
+    """Test that changing the payload or using another key invalidates the token."""
+    service = SessionService("secret", ttl_seconds=60)
+    token = service.issue(7, "alice", now=NOW)
+    body, signature = token.split(".")
+    forged_body = SessionService("other", ttl_seconds=60).issue(1, "admin", now=NOW).split(".")[0]
+    
+    assert service.verify(f"{forged_body}.{signature}", now=NOW) is None
+    assert SessionService("other").verify(token, now=NOW) is None
+    assert service.verify(body, now=NOW) is None
+    assert service.verify("not a token", now=NOW) is None
+    assert service.verify("ünïcode.ßig", now=NOW) is None
+    assert service.verify(None) is None
+
+
+def test_expired_token_is_rejected():
+    """Test that a token stops verifying at its expiry."""
+    service = SessionService("secret", ttl_seconds=60)
+    token = service.issue(7, "alice", now=NOW)
+    
+    assert service.verify(token, now=NOW + 59) is not None
+    assert service.verify(token, now=NOW + 60) is None
+
+
+def test_revoked_token_is_rejected():
+    """Test that revoking one token leaves the user's other sessions valid."""
+    service = SessionService("secret", ttl_seconds=60)
+    token = service.issue(7, "alice", now=NOW)
+    other = service.issue(7, "alice", now=NOW)
+    
+    assert service.revoke(token, now=NOW) is True
+    
+    assert service.verify(token, now=NOW) is None
+    assert service.verify(other, now=NOW) is not None
+    assert service.revoke(token, now=NOW) is False
+
+
+def test_revocations_are_dropped_after_expiry():
+    """Test that the revocation list forgets tokens once they have expired."""
+    service = SessionService("secret", ttl_seconds=60)
+    service.revoke(service.issue(7, "alice", now=NOW), now=NOW)
+    service.revoke(service.issue(8, "bob", now=NOW + 120), now=NOW + 120)
+    
+    assert service.stats()["revoked"] == 1
@@ -0,0 +1,48 @@
+"""Unit tests for suggest service."""
+
+import pytest
+from src.domain.entities import Post, Category
+from src.service.suggest_service import SuggestService
+
+
+def _post(post_id, title, categories=()):
+    return Post(
+        id=post_id,
+        title=title,
+        categories=[Category(id=i, name=name) for i, name in enumerate(categories)],
+    )
+
+
+@pytest.fixture
+def suggestions():
+    """Create suggestions from a few posts."""
+    service = SuggestService()
+    service.add_post(_post(1, "Python generators", ["Programming"]))
+    service.add_post(_post(2, "Python decorators", ["Programming"]))
+    service.add_post(_post(3, "Pyramid scheme", ["Travel"]))
+    return service
+
+
+def test_suggest_orders_by_popularity(suggestions):
+    """Test that more widely used terms come first."""
+    results = suggestions.suggest("Py")
+    
+    assert [s["text"] for s in results] == ["python", "pyramid"]
+    assert results[0]["popularity"] == 2
+
+
+def test_suggest_includes_categories(suggestions):
+    """Test that category names are suggested with their display case."""
+    assert suggestions.suggest("prog") == [
+        {"text": "Programming", "type": "category", "popularity": 2}
+    ]
+
+
+def test_remove_post_updates_suggestions(suggestions):
+    """Test that removed posts no longer contribute suggestions."""
+    suggestions.suggest("py")
+    suggestions.remove_post(3)
+    
+    assert [s["text"] for s in suggestions.suggest("py")] == ["python"]
+    assert suggestions.suggest("trav") == []
+    assert suggestions.suggest("") == []
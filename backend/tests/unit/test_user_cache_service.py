@@ -0,0 +1,118 @@
+"""Unit tests for the user cache."""
+
+import pytest
+from src.domain.entities import User
+from src.driver.database.repositories import CachedUserRepository
+from src.service.user_cache_service import UserCacheService
+
+
+class CountingUserRepository:
+    """User repository counting lookups by ID."""
+    
+    def __init__(self):
+        self.users = {
+            1: User(id=1, username="alice", email="alice@example.com", full_name="Alice"),
+            2: User(id=2, username="bob", email="bob@example.com"),
+        }
+        self.lookups = 0
+        self.callbacks = []
+    
+    async def get_by_id(self, user_id: int):
+        self.lookups += 1
+        user = self.users.get(user_id)
+        return User(id=user.id, username=user.username, email=user.email, full_name=user.full_name) if user else None
+    
+    async def get_by_ids(self, user_ids):
+        self.lookups += 1
+        self.requested = sorted(user_ids)
+        return {user_id: self.users[user_id] for user_id in user_ids if user_id in self.users}
+    
+    async def update(self, user: User) -> User:
+        self.users[user.id] = user
+        return user
+    
+    def after_commit(self, callback):
+        self.callbacks.append(callback)
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_reads_through():
+    """Test that repeated lookups are served from the cache."""
+    backing = CountingUserRepository()
+    cache = UserCacheService(max_entries=16, ttl_seconds=60)
+    repo = CachedUserRepository(backing, cache)
+    
+    first = await repo.get_by_id(1)
+    second = await repo.get_by_id(1)
+    
+    assert first.username == second.username == "alice"
+    assert backing.lookups == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_users_are_not_cached():
+    """Test that unknown IDs always reach the repository."""
+    backing = CountingUserRepository()
+    repo = CachedUserRepository(backing, UserCacheService(max_entries=16, ttl_seconds=60))
+    
+    assert await repo.get_by_id(3) is None
+    assert await repo.get_by_id(3) is None
+    assert backing.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_get_by_ids_queries_only_missing_users():
+    """Test that a batch lookup fetches uncached users in one call."""
+    backing = CountingUserRepository()
+    repo = CachedUserRepository(backing, UserCacheService(max_entries=16, ttl_seconds=60))
+    await repo.get_by_id(1)
+    
+    users = await repo.get_by_ids([1, 2, 2, 3])
+    
+    assert sorted(users) == [1, 2]
+    assert backing.lookups == 2
+    assert backing.requested == [2, 3]
+    assert (await repo.get_by_ids([1, 2])).keys() == {1, 2}
+    assert backing.lookups == 2
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates():
+    """Test that an update is visible on the next lookup."""
+    backing = CountingUserRepository()
+    repo = CachedUserRepository(backing, UserCacheService(max_entries=16, ttl_seconds=60))
+    user = await repo.get_by_id(1)
+    
+    user.full_name = "Alice Liddell"
+    await repo.update(user)
+    
+    assert (await repo.get_by_id(1)).full_name == "Alice Liddell"
+    assert backing.lookups == 2
+    
+    # Copies read before the write committed are dropped once it does
+    for callback in backing.callbacks:
+        callback()
+    await repo.get_by_id(1)
+    assert backing.lookups == 3
+
+
+@pytest.mark.asyncio
+async def test_cached_users_are_copies():
+    """Test that callers mutating a returned user do not change the cache."""
+    repo = CachedUserRepository(CountingUserRepository(), UserCacheService(max_entries=16, ttl_seconds=60))
+    (await repo.get_by_id(1)).full_name = "changed"
+    
+    assert (await repo.get_by_id(1)).full_name == "Alice"
+
+
+def test_reads_racing_an_update_are_not_stored():
+    """Test that a user read before an invalidation is not cached."""
+    cache = UserCacheService(max_entries=16, ttl_seconds=60)
+    version = cache.version
+    
+    cache.invalidate(1)
+    cache.set(User(id=1, username="stale"), version)
+    
+    assert cache.get(1) is None
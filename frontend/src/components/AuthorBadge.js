@@ -0,0 +1,26 @@
+import React from 'react';
+
+function AuthorBadge({ author }) {
+  if (!author) return null;
+
+  const name = author.full_name || author.username;
+  const initials = name
+    .split(/\s+/)
+    .filter(Boolean)
+    .slice(0, 2)
+    .map(part => part[0].toUpperCase())
+    .join('');
+
+  return (
+    <span className="post-author">
+      {author.avatar_url ? (
+        <img className="author-avatar" src={author.avatar_url} alt="" />
+      ) : (
+        <span className="author-avatar" aria-hidden="true">{initials}</span>
+      )}
+      <span className="author-name">{name}</span>
+    </span>
+  );
+}
+
+export default AuthorBadge;
@@ -2,6 +2,7 @@ import React from 'react';
 import { Link } from 'react-router-dom';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
+import AuthorBadge from './AuthorBadge';
 
 function PostCard({ post }) {
   // Create excerpt from HTML content if excerpt is not available
@@ -41,6 +42,7 @@ function PostCard({ post }) {
       </h2>
       
       <div className="post-meta">
+        <AuthorBadge author={post.author} />
         <span className="post-date">
           {new Date(post.published_at || post.created_at).toLocaleDateString()}
         </span>
@@ -56,12 +58,16 @@ function PostCard({ post }) {
       <div 
         className="post-excerpt"
         dangerouslySetInnerHTML={{ 
-          __html: post.excerpt 
+          // Search results carry a highlighted snippet instead of the body
+          __html: post.snippet
+            ? post.snippet
+            : post.excerpt 
             ? post.excerpt 
             : (post.content_html.substring(0, 200) + (post.content_html.length > 200 ? '...' : ''))
         }}
       />
       
+      {post.snippet === undefined && (
       <div className="post-stats">
         <span className="stat-item comments">
           <span role="img" aria-label="comments">💬</span>
@@ -84,6 +90,7 @@ function PostCard({ post }) {
           <span>{formatViews(post.view_count)} views</span>
         </span>
       </div>
+      )}
       
       <Link to={`/posts/${encodeURIComponent(post.slug)}`} className="read-more">
         Read more →
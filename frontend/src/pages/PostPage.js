@@ -3,12 +3,14 @@ import { useParams, Link } from 'react-router-dom';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
 import api from '../services/api';
+import AuthorBadge from '../components/AuthorBadge';
 
 function PostPage() {
   const { slug } = useParams();
   const [post, setPost] = useState(null);
   const [comments, setComments] = useState([]);
   const [reactions, setReactions] = useState(null);
+  const [relatedPosts, setRelatedPosts] = useState([]);
   const [user, setUser] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -53,6 +55,16 @@ function PostPage() {
         });
         setReactions(reactionsResponse.data);
         
+        // Fetch related posts (optional, the page works without them)
+        try {
+          const relatedResponse = await api.get(`/posts/${slug}/related`, {
+            signal: abortController.signal
+          });
+          setRelatedPosts(relatedResponse.data);
+        } catch (err) {
+          setRelatedPosts([]);
+        }
+        
       } catch (err) {
         if (err.name !== 'AbortError' && err.name !== 'CanceledError') {
           setError('Post not found');
@@ -80,14 +92,12 @@ function PostPage() {
     }
 
     try {
-      await api.post('/reactions', {
+      // The toggle answers with the post's updated counts
+      const response = await api.post('/reactions', {
         type: type,
         post_id: post.id,
       });
-      
-      // Refresh reactions
-      const reactionsResponse = await api.get(`/reactions/post/${post.id}/summary`);
-      setReactions(reactionsResponse.data);
+      setReactions(response.data.summary);
     } catch (err) {
       console.error('Failed to toggle reaction', err);
     }
@@ -147,6 +157,7 @@ function PostPage() {
         <h1 className="post-title">{post.title}</h1>
         
         <div className="post-meta">
+          <AuthorBadge author={post.author} />
           <span className="post-date">
             {new Date(post.published_at || post.created_at).toLocaleDateString('en-US', {
               year: 'numeric',
@@ -236,6 +247,21 @@ function PostPage() {
           )}
         </div>
         
+        {/* Related Posts */}
+        {relatedPosts.length > 0 && (
+          <div className="related-posts">
+            <h3>Related posts</h3>
+            <ul>
+              {relatedPosts.map(related => (
+                <li key={related.id}>
+                  <Link to={`/posts/${encodeURIComponent(related.slug)}`}>{related.title}</Link>
+                  {related.excerpt && <p>{related.excerpt}</p>}
+                </li>
+              ))}
+            </ul>
+          </div>
+        )}
+        
         {/* Comments Section */}
         <div className="comments-section">
           <h3>Comments ({comments.length})</h3>
@@ -1,28 +1,58 @@
 import React, { useEffect, useState } from 'react';
-import { useSearchParams } from 'react-router-dom';
+import { Link, useSearchParams } from 'react-router-dom';
 import PostCard from '../components/PostCard';
 import api from '../services/api';
 
+const PAGE_SIZE = 20;
+
 function SearchResultsPage() {
   const [searchParams] = useSearchParams();
   const query = searchParams.get('q') || '';
+  const categoryId = searchParams.get('category_id');
+  
+  const searchUrl = (offset = 0) => {
+    const params = new URLSearchParams({ q: query, limit: PAGE_SIZE, offset });
+    if (categoryId) {
+      params.set('category_id', categoryId);
+    }
+    return `/search?${params}`;
+  };
+  
+  const categoryLink = (id) => {
+    const params = new URLSearchParams({ q: query });
+    if (id) {
+      params.set('category_id', id);
+    }
+    return `/search?${params}`;
+  };
   
   const [results, setResults] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [suggestion, setSuggestion] = useState(null);
+  const [corrected, setCorrected] = useState(false);
+  const [categoryFacets, setCategoryFacets] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState(null);
 
   useEffect(() => {
     const fetchResults = async () => {
       if (!query.trim()) {
         setResults([]);
+        setTotal(0);
+        setSuggestion(null);
         setLoading(false);
         return;
       }
 
       try {
         setLoading(true);
-        const response = await api.get(`/search?q=${encodeURIComponent(query)}&limit=20`);
+        const response = await api.get(searchUrl());
         setResults(response.data.posts || []);
+        setTotal(response.data.total || 0);
+        setSuggestion(response.data.suggestion || null);
+        setCorrected(Boolean(response.data.corrected));
+        setCategoryFacets(response.data.facets?.categories || []);
       } catch (err) {
         setError('Search failed');
         console.error(err);
@@ -32,7 +62,21 @@ function SearchResultsPage() {
     };
 
     fetchResults();
-  }, [query]);
+  }, [query, categoryId]);
+
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await api.get(searchUrl(results.length));
+      setResults([...results, ...(response.data.posts || [])]);
+      setTotal(response.data.total || 0);
+    } catch (err) {
+      setError('Search failed');
+      console.error(err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
 
   return (
     <div className="container">
@@ -47,10 +91,42 @@ function SearchResultsPage() {
           <div className="error">{error}</div>
         ) : (
           <>
+            {suggestion && (
+              <p className="search-suggestion">
+                {corrected ? (
+                  <>Showing results for <strong>{suggestion}</strong></>
+                ) : (
+                  <>
+                    Did you mean{' '}
+                    <Link to={`/search?q=${encodeURIComponent(suggestion)}`}>{suggestion}</Link>?
+                  </>
+                )}
+              </p>
+            )}
+            
             <p className="results-count">
-              Found {results.length} {results.length === 1 ? 'result' : 'results'}
+              Found {total} {total === 1 ? 'result' : 'results'}
             </p>
             
+            {(categoryFacets.length > 0 || categoryId) && (
+              <div className="search-facets">
+                {categoryId && (
+                  <Link to={categoryLink(null)} className="facet facet-clear">
+                    All categories
+                  </Link>
+                )}
+                {categoryFacets.map(facet => (
+                  <Link
+                    key={facet.id}
+                    to={categoryLink(facet.id)}
+                    className={`facet ${String(facet.id) === categoryId ? 'active' : ''}`}
+                  >
+                    {facet.name} <span className="facet-count">{facet.count}</span>
+                  </Link>
+                ))}
+              </div>
+            )}
+            
             <div className="posts-list">
               {results.length > 0 ? (
                 results.map(post => (
@@ -63,6 +139,12 @@ function SearchResultsPage() {
                 </p>
               )}
             </div>
+            
+            {results.length < total && (
+              <button className="btn-secondary" onClick={loadMore} disabled={loadingMore}>
+                {loadingMore ? 'Loading...' : 'Load more results'}
+              </button>
+            )}
           </>
         )}
       </div>